@@ -0,0 +1,161 @@
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import sample_paths  # noqa: F401
+from employee_db import EmployeeDatabase, COPY_BATCH_SIZE, iter_sample_batches
+import ecom_db
+
+EMPLOYEE_TABLES = ['employee', 'contact_info', 'employment_info', 'employee_details']
+SHOP_TABLES = ['users', 'products', 'orders', 'order_products']
+
+RESULT_FIELDS = ['engine', 'schema', 'rows', 'seconds', 'rows_per_sec', 'error']
+
+
+def tenant_schemas(prefix, tenants, first=1):
+    """prefix_0001 .. prefix_NNNN"""
+    return [f"{prefix}_{i:04d}" for i in range(first, first + tenants)]
+
+
+def load_employee_tenant(schema, employees, batch_size, seed):
+    """Recreate the employee tables in one PostgreSQL schema, returns the source row count"""
+    db = EmployeeDatabase(schema)
+    try:
+        db.connect()
+        db.drop_tables()
+        db.create_tables()
+        db.load_batches(iter_sample_batches(employees, batch_size, seed, 'numpy'))
+    finally:
+        db.disconnect()
+    return employees * len(EMPLOYEE_TABLES)
+
+
+def load_shop_tenant(schema, scale_factor, seed):
+    """Recreate sample_shop as one MySQL schema, returns the source row count"""
+    conn = ecom_db.get_connection()
+    cursor = conn.cursor()
+    try:
+        ecom_db.seed_schema(conn, cursor, scale_factor, seed=seed, schema=schema)
+        rows = 0
+        for table in SHOP_TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
+            rows += cursor.fetchone()[0]
+    finally:
+        cursor.close()
+        conn.close()
+    return rows
+
+
+def timed(engine, schema, load, *args):
+    """Run one tenant load, returns its result row (errors are recorded, not raised)"""
+    started = time.perf_counter()
+    rows, error = 0, ''
+    try:
+        rows = load(schema, *args)
+    except Exception as e:
+        error = str(e)
+    seconds = time.perf_counter() - started
+    return {
+        'engine': engine,
+        'schema': schema,
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'rows_per_sec': round(rows / seconds, 1) if seconds else 0.0,
+        'error': error,
+    }
+
+
+def fan_out(jobs, concurrency):
+    """Run (engine, schema, load, *args) jobs on a bounded thread pool, printing each as it finishes"""
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(timed, *job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            status = f"FAILED: {result['error']}" if result['error'] else \
+                f"{result['rows']} rows in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/sec)"
+            print(f"[{done}/{len(futures)}] {result['engine']} {result['schema']}: {status}")
+    return sorted(results, key=lambda result: (result['engine'], result['schema']))
+
+
+def rdi_tables_fragment(source, schemas, tables, schema_key):
+    """YAML for the sources.<source> section of RDI's config.yaml listing every tenant table"""
+    lines = [f"  {source}:", f"    {schema_key}:"]
+    lines += [f"      - {schema}" for schema in schemas]
+    lines.append("    tables:")
+    lines += [f"      {schema}.{table}: {{}}" for schema in schemas for table in tables]
+    return '\n'.join(lines)
+
+
+def write_rdi_config(path, employee_schemas, shop_schemas):
+    """Write the table lists to merge into the RDI pipeline's config.yaml"""
+    sections = ["sources:"]
+    if employee_schemas:
+        sections.append(rdi_tables_fragment('postgresql', employee_schemas, EMPLOYEE_TABLES, 'schemas'))
+    if shop_schemas:
+        sections.append(rdi_tables_fragment('mysql', shop_schemas, SHOP_TABLES, 'databases'))
+    with open(path, 'w') as f:
+        f.write('\n'.join(sections) + '\n')
+    print(f"Wrote RDI table lists for {len(employee_schemas) + len(shop_schemas)} schemas to {path}")
+
+
+def print_summary(results, wall_seconds):
+    """Totals and the slowest tenants"""
+    loaded = [result for result in results if not result['error']]
+    rows = sum(result['rows'] for result in loaded)
+    print(f"\n--- Fan-out: {len(loaded)}/{len(results)} schemas, {rows:,} rows in {wall_seconds:.1f}s "
+          f"({rows / wall_seconds if wall_seconds else 0:,.0f} rows/sec) ---")
+    for result in sorted(loaded, key=lambda result: result['seconds'], reverse=True)[:5]:
+        print(f"  slowest: {result['engine']} {result['schema']} {result['seconds']:.1f}s")
+
+
+def write_results(results, output):
+    """Per-schema timings as JSON and CSV (output without extension)"""
+    with open(f"{output}.json", 'w') as f:
+        json.dump(results, f, indent=2)
+    with open(f"{output}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Wrote {output}.json and {output}.csv")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create and load N copies of the sample schemas for RDI scaling tests")
+    parser.add_argument('--schema', choices=['employee', 'shop', 'both'], default='shop')
+    parser.add_argument('--tenants', type=int, default=10, help="number of schema copies per sample database")
+    parser.add_argument('--first', type=int, default=1, help="number of the first tenant schema")
+    parser.add_argument('--employee-prefix', default='employee', help="PostgreSQL schema name prefix")
+    parser.add_argument('--shop-prefix', default=ecom_db.SCHEMA, help="MySQL schema name prefix")
+    parser.add_argument('--employees', type=int, default=1000, help="employees per PostgreSQL schema")
+    parser.add_argument('--batch-size', type=int, default=COPY_BATCH_SIZE, help="employees per COPY batch")
+    parser.add_argument('--scale-factor', type=float, default=None,
+                        help="sample_shop scale factor per MySQL schema (default: the fixed sample rows)")
+    parser.add_argument('--concurrency', type=int, default=8, help="schemas loaded at the same time")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated data, shared by all tenants")
+    parser.add_argument('--rdi-config', default='rdi_tables.yaml', help="file for the RDI source table lists")
+    parser.add_argument('--output', default='fanout_results', help="results file name without extension")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    employee_schemas = tenant_schemas(args.employee_prefix, args.tenants, args.first) \
+        if args.schema in ('employee', 'both') else []
+    shop_schemas = tenant_schemas(args.shop_prefix, args.tenants, args.first) if args.schema in ('shop', 'both') else []
+
+    jobs = [('postgresql', schema, load_employee_tenant, args.employees, args.batch_size, args.seed)
+            for schema in employee_schemas]
+    jobs += [('mysql', schema, load_shop_tenant, args.scale_factor, args.seed) for schema in shop_schemas]
+
+    print(f"Loading {len(jobs)} schemas, {args.concurrency} at a time")
+    started = time.perf_counter()
+    results = fan_out(jobs, args.concurrency)
+    print_summary(results, time.perf_counter() - started)
+    write_results(results, args.output)
+    write_rdi_config(args.rdi_config, employee_schemas, shop_schemas)
+    if any(result['error'] for result in results):
+        raise SystemExit(1)
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import sample_paths  # noqa: F401
+from redis_target import connect_redis, delete_table_keys, rdi_key
+from verify_target import SCHEMAS, MySQLSource, PostgresSource, canonical
+
+# Each table is split into disjoint physical ranges (ctid blocks in PostgreSQL, primary key ranges
+# in MySQL), so every process reads only its own slice through its own cursor and Redis connection
+
+
+def split(lo, hi, parts):
+    """[lo, hi) cut into at most parts contiguous (start, end) ranges; the last end is None (open)"""
+    step = max(1, -(-(hi - lo) // parts))
+    bounds = [(start, start + step) for start in range(lo, hi, step)] or [(lo, None)]
+    return bounds[:-1] + [(bounds[-1][0], None)]
+
+
+def table_partitions(schema, table, parts):
+    """Ranges that cover a table: block numbers for PostgreSQL, first pk column values for MySQL"""
+    if schema == 'employee':
+        source = PostgresSource()
+        try:
+            with source.query.conn.cursor() as cursor:
+                cursor.execute("SELECT pg_relation_size(%s::regclass) / current_setting('block_size')::int", (table,))
+                return split(0, cursor.fetchone()[0], parts)
+        finally:
+            source.close()
+    source = MySQLSource()
+    cursor = source.conn.cursor()
+    try:
+        column = SCHEMAS[schema][table][0]
+        cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+        lo, hi = cursor.fetchone()
+        return split(lo or 0, (hi or 0) + 1, parts)
+    finally:
+        cursor.close()
+        source.close()
+
+
+def partition_rows(source, schema, table, bounds):
+    """Yield the rows of one partition as dicts, read by ctid range scan or primary key range"""
+    start, end = bounds
+    if schema == 'employee':
+        query = f"SELECT * FROM {table} WHERE ctid >= '({start},0)'::tid"
+        if end is not None:
+            query += f" AND ctid < '({end},0)'::tid"
+        with source.query.conn.cursor(name=f"preload_{table}") as cursor:
+            cursor.itersize = 10000
+            cursor.execute(query)
+            columns = None
+            for row in cursor:
+                columns = columns or [column.name for column in cursor.description]
+                yield dict(zip(columns, row))
+        source.query.conn.rollback()
+        return
+    column = SCHEMAS[schema][table][0]
+    query = f"SELECT * FROM {table} WHERE {column} >= %s" + (f" AND {column} < %s" if end is not None else "")
+    cursor = source.conn.cursor()
+    try:
+        cursor.execute(query, (start,) if end is None else (start, end))
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def encode(row, data_type, temporal):
+    """A source row in the form RDI writes it: canonical text fields without NULLs, or a JSON document"""
+    fields = {column: canonical(value, temporal) for column, value in row.items() if value is not None}
+    return json.dumps(fields) if data_type == 'json' else fields
+
+
+def load_partition(schema, table, bounds, data_type='hash', batch_size=1000, temporal='epoch'):
+    """Stream one partition of a table into Redis with pipelined HSET/JSON.SET, returns (keys, seconds)"""
+    pk_columns = SCHEMAS[schema][table]
+    source = PostgresSource() if schema == 'employee' else MySQLSource()
+    redis_client = connect_redis()
+    started = time.perf_counter()
+    keys = 0
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for row in partition_rows(source, schema, table, bounds):
+            key = rdi_key(table, *((column, row[column]) for column in pk_columns))
+            if data_type == 'json':
+                pipe.execute_command('JSON.SET', key, '$', encode(row, data_type, temporal))
+            else:
+                pipe.hset(key, mapping=encode(row, data_type, temporal))
+            keys += 1
+            if len(pipe) >= batch_size:
+                pipe.execute()
+        pipe.execute()
+    finally:
+        source.close()
+        redis_client.close()
+    return keys, time.perf_counter() - started
+
+
+def preload(schema, tables, workers, data_type='hash', batch_size=1000, temporal='epoch'):
+    """Load every partition of the tables on a process pool, returns per-table results and wall seconds"""
+    jobs = [(table, bounds) for table in tables for bounds in table_partitions(schema, table, workers)]
+    totals = {table: {'table': table, 'keys': 0, 'busy_seconds': 0.0} for table in tables}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(load_partition, schema, table, bounds, data_type, batch_size, temporal): table
+                   for table, bounds in jobs}
+        for future in as_completed(futures):
+            keys, seconds = future.result()
+            totals[futures[future]]['keys'] += keys
+            totals[futures[future]]['busy_seconds'] += seconds
+    wall_seconds = time.perf_counter() - started
+    results = list(totals.values())
+    for result in results:
+        # Partitions run in parallel, so per-table rates are per worker-second
+        result['busy_seconds'] = round(result['busy_seconds'], 3)
+        result['keys_per_worker_sec'] = round(result['keys'] / result['busy_seconds'], 1) \
+            if result['busy_seconds'] else 0.0
+    return results, wall_seconds
+
+
+def snapshot_rate(path, schema, keys):
+    """snapshot_rows_per_sec of the snapshot_benchmark case closest in size to this load"""
+    with open(path) as f:
+        cases = [case for case in json.load(f) if case['schema'] == schema and case['complete']]
+    if not cases:
+        return None
+    return min(cases, key=lambda case: abs(case['source_rows'] - keys))['snapshot_rows_per_sec']
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load the source tables straight into Redis in RDI's key layout, "
+                                                 "as a baseline for RDI's snapshot throughput")
+    parser.add_argument('--schema', choices=list(SCHEMAS), default='employee')
+    parser.add_argument('--tables', help="comma separated subset of the schema's tables")
+    parser.add_argument('--data-type', choices=['hash', 'json'], default='hash', help="how RDI stores rows")
+    parser.add_argument('--temporal', choices=['epoch', 'iso'], default='epoch',
+                        help="how to encode dates/timestamps: epoch days/ms or ISO-8601 text, as RDI is configured")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="processes, each with its own source cursor and Redis connection")
+    parser.add_argument('--batch-size', type=int, default=1000, help="commands per Redis pipeline")
+    parser.add_argument('--flush-target', action='store_true', help="UNLINK the tables' keys before loading")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="snapshot_benchmark JSON results to report RDI's overhead against")
+    parser.add_argument('--output', help="optional JSON file for the results")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    tables = list(SCHEMAS[args.schema])
+    if args.tables:
+        tables = [table for table in args.tables.split(',') if table]
+
+    if args.flush_target:
+        print(f"Removed {delete_table_keys(connect_redis(), tables, args.batch_size)} existing keys")
+
+    print(f"Preloading {', '.join(tables)} on {args.workers} workers, {args.batch_size} commands per pipeline")
+    results, wall_seconds = preload(args.schema, tables, args.workers, args.data_type, args.batch_size,
+                                    args.temporal)
+    keys = sum(result['keys'] for result in results)
+    rate = keys / wall_seconds if wall_seconds else 0.0
+    for result in results:
+        print(f"  {result['table']}: {result['keys']} keys, {result['keys_per_worker_sec']:,.0f} keys/sec per worker")
+    print(f"\n--- Preload: {keys:,} keys in {wall_seconds:.1f}s ({rate:,.0f} keys/sec) ---")
+
+    summary = {'schema': args.schema, 'workers': args.workers, 'batch_size': args.batch_size, 'keys': keys,
+               'seconds': round(wall_seconds, 3), 'keys_per_sec': round(rate, 1), 'tables': results}
+    if args.compare:
+        snapshot = snapshot_rate(args.compare, args.schema, keys)
+        if snapshot and rate:
+            summary['rdi_snapshot_rows_per_sec'] = snapshot
+            print(f"RDI snapshot: {snapshot:,.0f} rows/sec, {snapshot / rate:.0%} of the direct preload rate")
+        elif not rate:
+            print("No keys were preloaded, nothing to compare")
+        else:
+            print(f"No complete {args.schema} case in {args.compare} to compare with")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Wrote {args.output}")
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The benchmarks drive both sample databases, so make their modules importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for sample_dir in ('sample_db_pg', 'sample_db_mysql'):
+    path = os.path.join(ROOT, sample_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
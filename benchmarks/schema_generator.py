@@ -0,0 +1,386 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from faker import Faker
+
+import sample_paths  # noqa: F401
+
+# Generic, spec-driven generator: a JSON file under schemas/ declares tables, columns, types,
+# distributions and foreign keys, and one engine creates the DDL, generates every table in
+# seeded NumPy column batches and bulk loads them with COPY (PostgreSQL) or executemany (MySQL).
+SCHEMAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schemas')
+
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', '10000'))
+# Date and timestamp columns count back from this instant, not the wall clock, so a seed
+# reproduces the same rows on every run
+DEFAULT_NOW = datetime(2025, 1, 1)
+
+# Portable type name -> (PostgreSQL, MySQL); varchar(n) and decimal(p,s) are the same in both
+TYPES = {
+    'bigint': ('BIGINT', 'BIGINT'),
+    'int': ('INTEGER', 'INT'),
+    'double': ('DOUBLE PRECISION', 'DOUBLE'),
+    'text': ('TEXT', 'TEXT'),
+    'date': ('DATE', 'DATE'),
+    'timestamp': ('TIMESTAMP', 'DATETIME'),
+    'boolean': ('BOOLEAN', 'BOOLEAN'),
+}
+DIALECTS = ('postgres', 'mysql')
+TYPE_PATTERN = re.compile(r'^(varchar|decimal)\((\d+)(?:,\s*(\d+))?\)$')
+
+GENERATORS = ('sequence', 'uniform', 'normal', 'lognormal', 'choice', 'faker', 'template', 'date', 'timestamp',
+              'boolean', 'reference')
+
+# Faker values pre-generated per (provider, pool size), with their own fixed seed
+POOL_SEED = 0
+
+
+def sql_type(column_type, dialect):
+    """DDL type of a portable column type"""
+    match = TYPE_PATTERN.match(column_type)
+    if match:
+        return column_type.upper()
+    if column_type not in TYPES:
+        raise ValueError(f"Unknown column type {column_type!r}")
+    return TYPES[column_type][DIALECTS.index(dialect)]
+
+
+def numbered(name, copies, width=2):
+    return [name] if not copies else [f"{name}_{i:0{width}d}" for i in range(1, copies + 1)]
+
+
+def expand(spec):
+    """Apply "copies" (many small tables / wide tables) and fill in defaults, returns the table list"""
+    tables = []
+    for table in spec['tables']:
+        columns = []
+        for column in table['columns']:
+            for name in numbered(column['name'], column.get('copies')):
+                column_spec = dict(column, name=name)
+                column_spec.pop('copies', None)
+                if 'references' in column_spec:
+                    column_spec.setdefault('generator', 'reference')
+                elif column_spec.get('primary_key'):
+                    column_spec.setdefault('generator', 'sequence')
+                columns.append(column_spec)
+        width = len(str(table.get('copies') or 0))
+        for name in numbered(table['name'], table.get('copies'), max(2, width)):
+            tables.append({'name': name, 'rows': table['rows'], 'columns': columns})
+    return tables
+
+
+def validate(tables):
+    """Raise ValueError on specs the engine cannot generate"""
+    seen = {}
+    for table in tables:
+        names = [column['name'] for column in table['columns']]
+        if len(set(names)) != len(names):
+            raise ValueError(f"{table['name']}: duplicate column names")
+        primary = [column['name'] for column in table['columns'] if column.get('primary_key')]
+        if len(primary) != 1:
+            raise ValueError(f"{table['name']}: exactly one primary_key column is required")
+        for column in table['columns']:
+            sql_type(column['type'], 'postgres')
+            generator = column.get('generator')
+            if generator not in GENERATORS:
+                raise ValueError(f"{table['name']}.{column['name']}: unknown generator {generator!r}")
+            if generator == 'reference':
+                parent, _, parent_column = column['references'].partition('.')
+                if seen.get(parent) != parent_column:
+                    raise ValueError(f"{table['name']}.{column['name']}: references must name the sequence "
+                                     f"primary key of an earlier table, got {column['references']!r}")
+            if generator == 'choice' and 'weights' in column and len(column['weights']) != len(column['values']):
+                raise ValueError(f"{table['name']}.{column['name']}: weights and values differ in length")
+        sequence = [column['name'] for column in table['columns']
+                    if column.get('primary_key') and column['generator'] == 'sequence']
+        seen[table['name']] = sequence[0] if sequence else None
+
+
+def load_spec(path):
+    """Read a spec (a path, or a name under schemas/), returns (name, expanded tables)"""
+    if not os.path.exists(path):
+        path = os.path.join(SCHEMAS_DIR, path if path.endswith('.json') else f"{path}.json")
+    with open(path) as f:
+        spec = json.load(f)
+    tables = expand(spec)
+    validate(tables)
+    return spec['name'], tables
+
+
+def create_statements(tables, dialect):
+    """CREATE TABLE statements in spec order, so referenced tables come first"""
+    statements = []
+    for table in tables:
+        lines = []
+        for column in table['columns']:
+            line = f"    {column['name']} {sql_type(column['type'], dialect)}"
+            if column.get('primary_key'):
+                line += " PRIMARY KEY"
+            elif not column.get('null_fraction'):
+                line += " NOT NULL"
+            if column.get('unique'):
+                line += " UNIQUE"
+            lines.append(line)
+        for column in table['columns']:
+            if 'references' in column:
+                parent, _, parent_column = column['references'].partition('.')
+                lines.append(f"    FOREIGN KEY ({column['name']}) REFERENCES {parent}({parent_column})")
+        suffix = " ENGINE=InnoDB" if dialect == 'mysql' else ""
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table['name']} (\n" + ",\n".join(lines) + f"\n){suffix}")
+    return statements
+
+
+@lru_cache(maxsize=None)
+def faker_pool(provider, size, max_length=None):
+    """size values of a Faker provider, e.g. 'city' or 'company'"""
+    faker = Faker()
+    faker.seed_instance(POOL_SEED)
+    generate = getattr(faker, provider)
+    return np.array([str(generate())[:max_length] for _ in range(size)], dtype=object)
+
+
+def varchar_length(column_type):
+    match = TYPE_PATTERN.match(column_type)
+    return int(match.group(2)) if match and match.group(1) == 'varchar' else None
+
+
+def decimal_scale(column_type):
+    match = TYPE_PATTERN.match(column_type)
+    return int(match.group(3) or 0) if match and match.group(1) == 'decimal' else None
+
+
+def numeric(values, column_type):
+    """Round generated numbers to what the column stores"""
+    if column_type in ('int', 'bigint'):
+        return np.rint(values).astype(np.int64)
+    scale = decimal_scale(column_type)
+    return np.round(values, scale) if scale is not None else values
+
+
+def reference_weights(rows, skew, seed):
+    """Zipf-like popularity over a seeded random ranking of the parent rows (None = uniform)"""
+    if not skew:
+        return None
+    weights = 1.0 / np.arange(1, rows + 1) ** skew
+    return (weights / weights.sum())[np.random.default_rng([seed, rows]).permutation(rows)]
+
+
+class SchemaGenerator:
+    """Generates the tables of an expanded spec in seeded column batches
+
+    Every batch has its own generator seeded by (seed, table, batch), so batches are
+    independent of each other and the same for any batch order or resume point.
+    """
+
+    def __init__(self, tables, scale_factor=1.0, seed=0, now=DEFAULT_NOW):
+        self.tables = tables
+        self.seed = seed
+        self.now = np.datetime64(now.replace(microsecond=0), 's')
+        self.rows = {table['name']: max(1, int(table['rows'] * scale_factor)) for table in tables}
+        self.weights = {}
+
+    def weights_for(self, column):
+        key = (column['references'], column.get('skew', 0))
+        if key not in self.weights:
+            parent = column['references'].partition('.')[0]
+            self.weights[key] = reference_weights(self.rows[parent], column.get('skew', 0), self.seed)
+        return self.weights[key]
+
+    def column(self, column, ids, rng):
+        n = len(ids)
+        generator = column['generator']
+        column_type = column['type']
+        if generator == 'sequence':
+            values = ids
+        elif generator == 'reference':
+            parent_rows = self.rows[column['references'].partition('.')[0]]
+            values = rng.choice(parent_rows, n, p=self.weights_for(column)) + 1
+        elif generator == 'uniform':
+            values = numeric(rng.uniform(column.get('low', 0), column.get('high', 1), n), column_type)
+        elif generator == 'normal':
+            values = rng.normal(column.get('mean', 0), column.get('std', 1), n)
+            values = numeric(np.clip(values, column.get('min', -np.inf), column.get('max', np.inf)), column_type)
+        elif generator == 'lognormal':
+            values = rng.lognormal(column.get('mean', 0), column.get('sigma', 1), n)
+            values = numeric(np.minimum(values, column.get('max', np.inf)), column_type)
+        elif generator == 'choice':
+            choices = np.array(column['values'], dtype=object)
+            weights = column.get('weights')
+            p = np.asarray(weights, dtype=float) / sum(weights) if weights else None
+            values = choices[rng.choice(len(choices), n, p=p)]
+        elif generator == 'faker':
+            pool = faker_pool(column['provider'], column.get('pool', 1000), varchar_length(column_type))
+            values = pool[rng.integers(0, len(pool), n)]
+        elif generator == 'template':
+            template = column['template']
+            values = np.array([template.format(id=i) for i in ids.tolist()], dtype=object)
+        elif generator == 'boolean':
+            values = rng.random(n) < column.get('p', 0.5)
+        else:
+            # date / timestamp: uniform over the last "days" days
+            seconds = rng.integers(0, column.get('days', 365) * 86400, n).astype('timedelta64[s]')
+            values = self.now - seconds
+            if generator == 'date':
+                values = values.astype('datetime64[D]')
+        null_fraction = column.get('null_fraction')
+        if null_fraction:
+            values = values.astype(object)
+            values[rng.random(n) < null_fraction] = None
+        return values
+
+    def batches(self, table, batch_size=BATCH_SIZE):
+        """Yield one table's rows as lists of tuples in column order"""
+        table_id = self.tables.index(table)
+        rows = self.rows[table['name']]
+        for batch_id, start in enumerate(range(0, rows, batch_size)):
+            rng = np.random.default_rng([self.seed, table_id, batch_id])
+            ids = np.arange(start + 1, min(start + batch_size, rows) + 1)
+            columns = [self.column(column, ids, rng).tolist() for column in table['columns']]
+            yield list(zip(*columns))
+
+
+class PostgresLoader:
+    """COPY into a schema of the employee_db database"""
+
+    dialect = 'postgres'
+
+    def __init__(self, schema):
+        from employee_db import EmployeeDatabase
+        self.schema = schema
+        self.db = EmployeeDatabase(schema)
+        self.db.connect()
+
+    def create(self, statements, drop=False):
+        cursor = self.db.cursor
+        if drop:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {self.schema} CASCADE")
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
+        for statement in statements:
+            cursor.execute(statement)
+        self.db.conn.commit()
+
+    def load(self, table, columns, rows):
+        from employee_db import copy_rows
+        copy_rows(self.db.cursor, table, columns, rows)
+
+    def commit(self):
+        self.db.conn.commit()
+
+    def rollback(self):
+        self.db.conn.rollback()
+
+    def close(self):
+        self.db.disconnect()
+
+
+class MySQLLoader:
+    """executemany into a MySQL schema, with per-row FK and unique checks off during the load"""
+
+    dialect = 'mysql'
+
+    def __init__(self, schema):
+        import ecom_db
+        self.schema = schema
+        self.conn = ecom_db.get_connection()
+        self.cursor = self.conn.cursor()
+
+    def create(self, statements, drop=False):
+        if drop:
+            self.cursor.execute(f"DROP SCHEMA IF EXISTS {self.schema}")
+        self.cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
+        self.cursor.execute(f"USE {self.schema}")
+        for statement in statements:
+            self.cursor.execute(statement)
+        self.cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        self.conn.commit()
+
+    def load(self, table, columns, rows):
+        placeholders = ', '.join(['%s'] * len(columns))
+        self.cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.cursor.close()
+        self.conn.close()
+
+
+def load_schema(loader, generator, batch_size=BATCH_SIZE, drop=False):
+    """Create and fill every table of the spec, committing per batch; returns per-table results"""
+    loader.create(create_statements(generator.tables, loader.dialect), drop)
+    results = []
+    for table in generator.tables:
+        columns = [column['name'] for column in table['columns']]
+        started = time.perf_counter()
+        rows = 0
+        try:
+            for batch in generator.batches(table, batch_size):
+                loader.load(table['name'], columns, batch)
+                loader.commit()
+                rows += len(batch)
+        except Exception as e:
+            loader.rollback()
+            print(f"Error loading {table['name']} ({rows} rows already committed): {e}")
+            raise
+        seconds = time.perf_counter() - started
+        results.append({'table': table['name'], 'rows': rows, 'seconds': round(seconds, 3),
+                        'rows_per_sec': round(rows / seconds, 1) if seconds else 0.0})
+        print(f"Loaded {rows} rows into {table['name']} in {seconds:.1f}s ({rows / seconds if seconds else 0:,.0f} rows/sec)")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate and bulk load a benchmark schema from a JSON spec")
+    parser.add_argument('spec', help=f"spec file, or the name of one in {SCHEMAS_DIR}")
+    parser.add_argument('--target', choices=DIALECTS, default='postgres')
+    parser.add_argument('--schema', help="schema to create the tables in (default: the spec's name)")
+    parser.add_argument('--scale-factor', type=float, default=1.0, help="multiplier for every table's row count")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="rows per generated batch and commit")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated data")
+    parser.add_argument('--now', type=datetime.fromisoformat, default=DEFAULT_NOW,
+                        help=f"instant date and timestamp columns count back from (default: {DEFAULT_NOW.isoformat()})")
+    parser.add_argument('--drop', action='store_true', help="drop the schema before creating it")
+    parser.add_argument('--print-ddl', action='store_true', help="print the CREATE TABLE statements and exit")
+    parser.add_argument('--output', help="optional JSON file for the per-table results")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    name, tables = load_spec(args.spec)
+    if args.print_ddl:
+        print(';\n\n'.join(create_statements(tables, args.target)) + ';')
+        sys.exit(0)
+
+    schema = args.schema or name
+    generator = SchemaGenerator(tables, args.scale_factor, args.seed, args.now)
+    print(f"Loading {len(tables)} tables of {name} into {args.target} schema {schema}")
+    loader = PostgresLoader(schema) if args.target == 'postgres' else MySQLLoader(schema)
+    started = time.perf_counter()
+    try:
+        results = load_schema(loader, generator, args.batch_size, args.drop)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        sys.exit(1)
+    finally:
+        loader.close()
+
+    rows = sum(result['rows'] for result in results)
+    seconds = time.perf_counter() - started
+    print(f"\n--- {name}: {rows:,} rows in {len(results)} tables in {seconds:.1f}s "
+          f"({rows / seconds if seconds else 0:,.0f} rows/sec) ---")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
@@ -0,0 +1,176 @@
+import argparse
+import csv
+import json
+import os
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import sample_paths  # noqa: F401
+from employee_db import EmployeeDatabase, COPY_BATCH_SIZE, generate_shards
+import ecom_db
+from redis_target import connect_redis, delete_table_keys, key_pattern
+
+EMPLOYEE_TABLES = ['employee', 'contact_info', 'employment_info', 'employee_details']
+SHOP_TABLES = ['users', 'products', 'orders', 'order_products']
+
+RESULT_FIELDS = ['schema', 'size', 'source_rows', 'load_seconds', 'load_rows_per_sec', 'snapshot_seconds',
+                 'snapshot_rows_per_sec', 'target_keys', 'complete', 'rdi_version', 'started_at']
+
+
+def seed_employees(size, workers, seed):
+    """Recreate employee_db with size employees, returns the number of source rows"""
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        db.drop_tables()
+        db.create_tables()
+        db.load_batches(generate_shards(size, COPY_BATCH_SIZE, workers, seed, 'numpy'))
+    finally:
+        db.disconnect()
+    return size * len(EMPLOYEE_TABLES)
+
+
+def seed_shop(scale_factor, seed):
+    """Recreate sample_shop at a scale factor, returns the number of source rows"""
+    conn = ecom_db.get_connection()
+    cursor = conn.cursor()
+    try:
+        ecom_db.seed_schema(conn, cursor, scale_factor, seed=seed)
+        rows = 0
+        for table in SHOP_TABLES:
+            cursor.execute(f"SELECT COUNT(*) FROM sample_shop.{table}")
+            rows += cursor.fetchone()[0]
+    finally:
+        cursor.close()
+        conn.close()
+    return rows
+
+
+class TargetCounter:
+    """Count the keys RDI has written, by DBSIZE delta or by SCAN over the table key patterns"""
+
+    def __init__(self, redis_client, tables, mode='dbsize'):
+        self.redis = redis_client
+        self.tables = tables
+        self.mode = mode
+        self.baseline = redis_client.dbsize() if mode == 'dbsize' else 0
+
+    def count(self):
+        if self.mode == 'dbsize':
+            return self.redis.dbsize() - self.baseline
+        return sum(sum(1 for _ in self.redis.scan_iter(match=key_pattern(table), count=10000))
+                   for table in self.tables)
+
+
+def wait_for_target(counter, expected, timeout, poll_interval):
+    """Poll until expected keys exist in Redis, returns (seconds waited, keys seen)"""
+    started = time.perf_counter()
+    keys = counter.count()
+    while keys < expected and time.perf_counter() - started < timeout:
+        time.sleep(poll_interval)
+        keys = counter.count()
+    return time.perf_counter() - started, keys
+
+
+def run_case(schema, size, args, redis_client):
+    """Seed one schema at one size and time the load and the RDI snapshot"""
+    tables = EMPLOYEE_TABLES if schema == 'employee' else SHOP_TABLES
+    # Keys are deterministic, so a previous case's keys would count towards (or mask) this one
+    if args.flush_target:
+        redis_client.flushdb()
+    elif not args.keep_target:
+        print(f"Removed {delete_table_keys(redis_client, tables)} keys left by earlier runs")
+    counter = TargetCounter(redis_client, tables, args.count_mode)
+    started_at = datetime.now(timezone.utc).isoformat()
+
+    print(f"\n=== {schema} size {size} ===")
+    started = time.perf_counter()
+    if schema == 'employee':
+        source_rows = seed_employees(int(size), args.workers, args.seed)
+    else:
+        source_rows = seed_shop(size, args.seed)
+    load_seconds = time.perf_counter() - started
+    print(f"Loaded {source_rows} source rows in {load_seconds:.1f}s")
+
+    if args.reset_command:
+        # RDI only snapshots on (re)deploy/reset, so trigger it once the source is ready
+        subprocess.run(args.reset_command, shell=True, check=True)
+
+    snapshot_seconds, target_keys = wait_for_target(counter, source_rows, args.timeout, args.poll_interval)
+    complete = target_keys >= source_rows
+    print(f"Target has {target_keys}/{source_rows} keys after {snapshot_seconds:.1f}s"
+          f"{'' if complete else ' (timed out)'}")
+
+    return {
+        'schema': schema,
+        'size': size,
+        'source_rows': source_rows,
+        'load_seconds': round(load_seconds, 3),
+        'load_rows_per_sec': round(source_rows / load_seconds, 1) if load_seconds else 0.0,
+        'snapshot_seconds': round(snapshot_seconds, 3),
+        'snapshot_rows_per_sec': round(target_keys / snapshot_seconds, 1) if snapshot_seconds else 0.0,
+        'target_keys': target_keys,
+        'complete': complete,
+        'rdi_version': args.rdi_version,
+        'started_at': started_at,
+    }
+
+
+def write_results(results, output):
+    """Write results as JSON and CSV next to each other (output without extension)"""
+    with open(f"{output}.json", 'w') as f:
+        json.dump(results, f, indent=2)
+    with open(f"{output}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nWrote {output}.json and {output}.csv")
+
+
+def parse_sizes(value):
+    return [float(size) for size in value.split(',') if size]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time seeding and RDI's initial snapshot at several data sizes")
+    parser.add_argument('--schema', choices=['employee', 'shop', 'both'], default='employee')
+    parser.add_argument('--employee-sizes', type=parse_sizes, default=[10000, 1000000, 10000000],
+                        help="comma separated employee counts")
+    parser.add_argument('--shop-scale-factors', type=parse_sizes, default=[1, 10, 100],
+                        help="comma separated sample_shop scale factors")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="generator processes for employee_db")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated data")
+    parser.add_argument('--reset-command', help="shell command that makes RDI re-snapshot, run after each load")
+    parser.add_argument('--flush-target', action='store_true',
+                        help="FLUSHDB the target Redis before each case (default: UNLINK only the schema's table keys)")
+    parser.add_argument('--keep-target', action='store_true',
+                        help="keep existing table keys between cases (only valid if every case writes new keys)")
+    parser.add_argument('--count-mode', choices=['dbsize', 'scan'], default='dbsize',
+                        help="count target keys by DBSIZE delta (dedicated target DB) or SCAN per table")
+    parser.add_argument('--timeout', type=float, default=3600, help="seconds to wait for the snapshot")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="seconds between target key counts")
+    parser.add_argument('--rdi-version', default=os.getenv('RDI_VERSION', 'unknown'),
+                        help="RDI version recorded with the results")
+    parser.add_argument('--output', default='snapshot_results', help="results file name without extension")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    redis_client = connect_redis()
+    cases = []
+    if args.schema in ('employee', 'both'):
+        cases += [('employee', int(size)) for size in args.employee_sizes]
+    if args.schema in ('shop', 'both'):
+        cases += [('shop', scale_factor) for scale_factor in args.shop_scale_factors]
+
+    results = []
+    try:
+        for schema, size in cases:
+            results.append(run_case(schema, size, args, redis_client))
+    except KeyboardInterrupt:
+        print("Benchmark interrupted, writing partial results")
+    finally:
+        if results:
+            write_results(results, args.output)
@@ -0,0 +1,492 @@
+import argparse
+import hashlib
+import json
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+import sample_paths  # noqa: F401
+import ecom_db
+from query import Query
+from redis_target import connect_redis, key_pattern
+
+# Primary key columns per table, in the order RDI puts them in the key
+SCHEMAS = {
+    'employee': {
+        'employee': ('employee_id',),
+        'contact_info': ('contact_id',),
+        'employment_info': ('employment_id',),
+        'employee_details': ('detail_id',),
+    },
+    'shop': {
+        'users': ('user_id',),
+        'products': ('product_id',),
+        'orders': ('order_id',),
+        'order_products': ('order_id', 'product_id'),
+    },
+}
+
+HASH_BITS = 32
+EPOCH = date(1970, 1, 1)
+
+
+def pk_hash(pk_text):
+    """First 32 bits of md5(pk) as an int; the same expression is evaluated in SQL"""
+    return int(hashlib.md5(pk_text.encode()).hexdigest()[:8], 16)
+
+
+def canonical(value, temporal='epoch'):
+    """Render a source value as the text RDI writes for it (the preloader's encoding)"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if temporal == 'iso':
+            return value.isoformat()
+        return str(int(value.replace(tzinfo=value.tzinfo or timezone.utc).timestamp() * 1000))
+    if isinstance(value, date):
+        return value.isoformat() if temporal == 'iso' else str((value - EPOCH).days)
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value), separators=(',', ':'), ensure_ascii=False, default=str)
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        number = Decimal(str(value))
+        if number.is_finite():
+            return format(number.normalize(), 'f')
+    return str(value)
+
+
+def canonical_text(value, kind, temporal='epoch'):
+    """Render a value read from Redis in the text form the source SQL digests produce for its column kind"""
+    if value is None:
+        return ''
+    if kind == 'array':
+        items = json.loads(value) if isinstance(value, str) and value[:1] == '[' else value
+        if isinstance(items, (list, tuple)):
+            return json.dumps(list(items), separators=(',', ':'), ensure_ascii=False)
+        return str(value)
+    text = value if isinstance(value, str) else str(value)
+    if kind == 'number' or (kind in ('date', 'timestamp') and temporal == 'epoch'):
+        try:
+            number = Decimal(text)
+            if number.is_finite():
+                return format(number.normalize(), 'f')
+        except InvalidOperation:
+            pass
+    return text
+
+
+def postgres_kind(type_name):
+    """Column kind of a format_type() name"""
+    if type_name.endswith('[]'):
+        return 'array'
+    if type_name.startswith('timestamp'):
+        return 'timestamp'
+    if type_name == 'date':
+        return 'date'
+    if type_name.split('(')[0] in ('smallint', 'integer', 'bigint', 'numeric', 'real', 'double precision'):
+        return 'number'
+    return 'text'
+
+
+def postgres_expr(column, kind, temporal):
+    """SQL rendering of a column matching canonical_text of the value RDI wrote"""
+    if kind == 'number':
+        return f"trim_scale({column}::numeric)::text"
+    if kind == 'date':
+        return f"({column} - DATE '1970-01-01')::text" if temporal == 'epoch' else f"{column}::text"
+    if kind == 'timestamp':
+        return (f"floor(extract(epoch FROM {column}) * 1000)::bigint::text" if temporal == 'epoch'
+                else f"replace({column}::text, ' ', 'T')")
+    if kind == 'array':
+        return f"array_to_json({column})::text"
+    return f"{column}::text"
+
+
+def mysql_kind(data_type):
+    """Column kind of an information_schema DATA_TYPE"""
+    if data_type in ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal', 'float', 'double'):
+        return 'number'
+    if data_type == 'date':
+        return 'date'
+    if data_type in ('datetime', 'timestamp'):
+        return 'timestamp'
+    return 'text'
+
+
+def mysql_expr(column, kind, temporal):
+    """SQL rendering of a column matching canonical_text; no parameters are bound next to these"""
+    if kind == 'number':
+        text = f"CAST({column} AS CHAR)"
+        return f"IF(LOCATE('.', {text}) > 0, TRIM(TRAILING '.' FROM TRIM(TRAILING '0' FROM {text})), {text})"
+    if kind == 'date':
+        return (f"CAST(DATEDIFF({column}, '1970-01-01') AS CHAR)" if temporal == 'epoch'
+                else f"DATE_FORMAT({column}, '%Y-%m-%d')")
+    if kind == 'timestamp':
+        return (f"CAST(TIMESTAMPDIFF(SECOND, '1970-01-01 00:00:00', {column}) * 1000 AS CHAR)"
+                if temporal == 'epoch' else f"DATE_FORMAT({column}, '%Y-%m-%dT%H:%i:%s')")
+    return f"CAST({column} AS CHAR)"
+
+
+def row_digest(fields):
+    """64-bit digest of a canonical {column: text} row"""
+    payload = '\x1f'.join(f"{column}\x1e{fields[column]}" for column in sorted(fields))
+    return int(hashlib.md5(payload.encode()).hexdigest()[:16], 16)
+
+
+class LeafDigests:
+    """Per-leaf (count, digest sum) over the pk hash space, with range sums for the diff recursion"""
+
+    def __init__(self, leaf_bits):
+        self.leaf_bits = leaf_bits
+        self.counts = [0] * (1 << leaf_bits)
+        self.sums = [0] * (1 << leaf_bits)
+
+    def leaf(self, pk_text):
+        return pk_hash(pk_text) >> (HASH_BITS - self.leaf_bits)
+
+    def add(self, pk_text, digest):
+        leaf = self.leaf(pk_text)
+        self.counts[leaf] += 1
+        self.sums[leaf] = (self.sums[leaf] + digest) & 0xFFFFFFFFFFFFFFFF
+
+    def add_leaf(self, leaf, count, digest_sum):
+        """Aggregates of a whole leaf, as computed by the source database"""
+        self.counts[leaf] += count
+        self.sums[leaf] = (self.sums[leaf] + int(digest_sum)) & 0xFFFFFFFFFFFFFFFF
+
+    def range_digest(self, lo, hi):
+        return sum(self.counts[lo:hi]), sum(self.sums[lo:hi]) & 0xFFFFFFFFFFFFFFFF
+
+
+def differing_leaves(source, target, lo, hi, fanout, visited):
+    """Recurse into [lo, hi) leaf ranges whose digests differ, returns the differing leaves"""
+    visited[0] += 1
+    if source.range_digest(lo, hi) == target.range_digest(lo, hi):
+        return []
+    if hi - lo == 1:
+        return [lo]
+    step = max(1, (hi - lo) // fanout)
+    leaves = []
+    for start in range(lo, hi, step):
+        leaves += differing_leaves(source, target, start, min(start + step, hi), fanout, visited)
+    return leaves
+
+
+class PostgresSource:
+    """Streams employee_db tables through the Query connection with named cursors"""
+
+    def __init__(self):
+        self.query = Query()
+        self.query.connect()
+
+    def column_kinds(self, table):
+        """[(column, kind)] in table order"""
+        with self.query.conn.cursor() as cursor:
+            cursor.execute("SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+                           "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum",
+                           (table,))
+            kinds = [(name, postgres_kind(type_name)) for name, type_name in cursor.fetchall()]
+        self.query.conn.rollback()
+        return kinds
+
+    def canonical_sql(self, table, pk_columns, kinds, temporal, leaf_bits):
+        """(pk text, leaf, canonical columns, row digest) expressions over one table"""
+        pk_expr = "concat_ws(':', " + ', '.join(f"{column}::text" for column in pk_columns) + ")"
+        leaf_expr = f"(('x' || substr(md5({pk_expr}), 1, 8))::bit(32)::bigint >> {HASH_BITS - leaf_bits})"
+        columns = {column: f"coalesce({postgres_expr(column, kind, temporal)}, '')" for column, kind in kinds.items()}
+        payload = ', '.join(f"'{column}' || chr(30) || {columns[column]}" for column in sorted(columns))
+        digest_expr = f"('x' || substr(md5(concat_ws(chr(31), {payload})), 1, 16))::bit(64)::bigint::numeric"
+        return pk_expr, leaf_expr, columns, digest_expr
+
+    def leaf_digests(self, table, pk_columns, kinds, leaf_bits, temporal='epoch'):
+        """Per-leaf row count and digest sum computed by Postgres, only 2^leaf_bits rows come back"""
+        _, leaf_expr, _, digest_expr = self.canonical_sql(table, pk_columns, kinds, temporal, leaf_bits)
+        digests = LeafDigests(leaf_bits)
+        with self.query.conn.cursor() as cursor:
+            cursor.execute(f"SELECT {leaf_expr} AS leaf, count(*), sum({digest_expr}) FROM {table} GROUP BY leaf")
+            for leaf, count, digest_sum in cursor:
+                digests.add_leaf(leaf, count, digest_sum)
+        self.query.conn.rollback()
+        return digests
+
+    def canonical_rows(self, table, pk_columns, kinds, leaf_bits, leaves, temporal='epoch'):
+        """Yield (pk_text, canonical row) for the rows in the given leaves"""
+        pk_expr, leaf_expr, columns, _ = self.canonical_sql(table, pk_columns, kinds, temporal, leaf_bits)
+        names = list(columns)
+        with self.query.conn.cursor(name=f"verify_{table}") as cursor:
+            cursor.itersize = 10000
+            cursor.execute(f"SELECT {pk_expr}, {', '.join(columns[name] for name in names)} FROM {table} "
+                           f"WHERE {leaf_expr} = ANY(%s)", (list(leaves),))
+            for row in cursor:
+                yield row[0], dict(zip(names, row[1:]))
+        self.query.conn.rollback()
+
+    def close(self):
+        self.query.disconnect()
+
+
+class MySQLSource:
+    """Streams sample_shop tables through the ecom_db connection settings"""
+
+    def __init__(self):
+        self.conn = ecom_db.get_connection("sample_shop")
+
+    def column_kinds(self, table):
+        """[(column, kind)] in table order"""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS "
+                           "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION", (table,))
+            return [(name, mysql_kind(data_type)) for name, data_type in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def canonical_sql(self, table, pk_columns, kinds, temporal, leaf_bits):
+        """(pk text, leaf, canonical columns, row digest) expressions over one table"""
+        pk_expr = "CONCAT_WS(':', " + ", ".join(pk_columns) + ")"
+        leaf_expr = f"(CAST(CONV(SUBSTRING(MD5({pk_expr}), 1, 8), 16, 10) AS UNSIGNED) >> {HASH_BITS - leaf_bits})"
+        columns = {column: f"COALESCE({mysql_expr(column, kind, temporal)}, '')" for column, kind in kinds.items()}
+        payload = ', '.join(f"CONCAT('{column}', CHAR(30), {columns[column]})" for column in sorted(columns))
+        digest_expr = f"CAST(CONV(SUBSTRING(MD5(CONCAT_WS(CHAR(31), {payload})), 1, 16), 16, 10) AS UNSIGNED)"
+        return pk_expr, leaf_expr, columns, digest_expr
+
+    def leaf_digests(self, table, pk_columns, kinds, leaf_bits, temporal='epoch'):
+        """Per-leaf row count and digest sum computed by MySQL, only 2^leaf_bits rows come back"""
+        _, leaf_expr, _, digest_expr = self.canonical_sql(table, pk_columns, kinds, temporal, leaf_bits)
+        digests = LeafDigests(leaf_bits)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT {leaf_expr} AS leaf, COUNT(*), SUM({digest_expr}) FROM {table} GROUP BY leaf")
+            for leaf, count, digest_sum in cursor:
+                digests.add_leaf(leaf, count, digest_sum)
+        finally:
+            cursor.close()
+        return digests
+
+    def canonical_rows(self, table, pk_columns, kinds, leaf_bits, leaves, temporal='epoch'):
+        """Yield (pk_text, canonical row) for the rows in the given leaves"""
+        pk_expr, leaf_expr, columns, _ = self.canonical_sql(table, pk_columns, kinds, temporal, leaf_bits)
+        names = list(columns)
+        # Leaves are ints and inlined: the DATE_FORMAT patterns must not meet parameter substitution
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT {pk_expr}, {', '.join(columns[name] for name in names)} FROM {table} "
+                           f"WHERE {leaf_expr} IN ({', '.join(str(int(leaf)) for leaf in leaves)})")
+            for row in cursor:
+                yield str(row[0]), dict(zip(names, row[1:]))
+        finally:
+            cursor.close()
+
+    def close(self):
+        self.conn.close()
+
+
+class RedisTarget:
+    """Reads the rows RDI wrote, as hashes (HGETALL) or JSON documents (JSON.GET), with pipelining"""
+
+    def __init__(self, redis_client, data_type='hash', batch_size=1000):
+        self.redis = redis_client
+        self.data_type = data_type
+        self.batch_size = batch_size
+
+    def fetch(self, keys):
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            if self.data_type == 'json':
+                pipe.execute_command('JSON.GET', key)
+            else:
+                pipe.hgetall(key)
+        values = pipe.execute()
+        if self.data_type == 'json':
+            values = [json.loads(value) if value else {} for value in values]
+        return values
+
+    def keys(self, table, pk_columns, leaf_bits=None, leaves=None):
+        """Yield (key, pk_text) for every key of a table, optionally restricted to hash leaves"""
+        # Assumes the pk part ends the key template, as in the RDI default layout
+        prefix_length = len(key_pattern(table)) - 1
+        for key in self.redis.scan_iter(match=key_pattern(table), count=10000):
+            parts = key[prefix_length:].split(':')
+            pk_text = ':'.join(parts[1::2][:len(pk_columns)])
+            if leaves is not None and pk_hash(pk_text) >> (HASH_BITS - leaf_bits) not in leaves:
+                continue
+            yield key, pk_text
+
+    def rows(self, table, pk_columns, leaf_bits=None, leaves=None):
+        """Yield (pk_text, row dict) for every key of a table, optionally restricted to hash leaves"""
+        return self.fetch_rows(self.keys(table, pk_columns, leaf_bits, leaves))
+
+    def fetch_rows(self, keys):
+        """Yield (pk_text, row dict) for (key, pk_text) pairs, one pipeline per batch_size keys"""
+        batch = []
+        for item in keys:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield from self.fetch_batch(batch)
+                batch = []
+        if batch:
+            yield from self.fetch_batch(batch)
+
+    def fetch_batch(self, batch):
+        for (_, pk_text), fields in zip(batch, self.fetch([key for key, _ in batch])):
+            yield pk_text, fields
+
+
+class Verifier:
+    """Hash-range diff of one source table against its RDI target keys
+
+    The source database aggregates (count, digest sum) per pk-hash leaf itself, so no
+    source rows leave it unless their leaf differs. Redis has no server-side digest, so
+    its keys are read once to build the same aggregates; the second pass over differing
+    leaves only fetches the keys whose pk hashes into them. Differing leaves are compared
+    in groups of about group_rows source rows, so a far-behind target never pulls the
+    whole table into memory, and at most max_mismatches pks of each kind are kept.
+    """
+
+    def __init__(self, source, target, leaf_bits=16, fanout=16, temporal='epoch',
+                 ignore_columns=('created_at', 'updated_at'), max_report=20, group_rows=100000,
+                 max_mismatches=10000):
+        self.source = source
+        self.target = target
+        self.leaf_bits = leaf_bits
+        self.fanout = fanout
+        self.temporal = temporal
+        self.ignore_columns = set(ignore_columns)
+        self.max_report = max_report
+        self.group_rows = group_rows
+        self.max_mismatches = max_mismatches
+
+    def canonical_row(self, row, kinds):
+        return {column: canonical_text(row.get(column), kind, self.temporal) for column, kind in kinds.items()}
+
+    def digests(self, rows, kinds):
+        """One streaming pass over (pk_text, row) pairs, returns (LeafDigests, row count)"""
+        leaf_digests = LeafDigests(self.leaf_bits)
+        count = 0
+        for pk_text, row in rows:
+            leaf_digests.add(pk_text, row_digest(self.canonical_row(row, kinds)))
+            count += 1
+        return leaf_digests, count
+
+    def leaf_groups(self, leaves, source_digests):
+        """Split the differing leaves into groups of about group_rows source rows"""
+        group, rows = [], 0
+        for leaf in leaves:
+            group.append(leaf)
+            rows += source_digests.counts[leaf]
+            if rows >= self.group_rows:
+                yield group
+                group, rows = [], 0
+        if group:
+            yield group
+
+    def verify(self, table, pk_columns):
+        """Compare one table, returns a result dict with missing/extra/different rows"""
+        started = time.perf_counter()
+        # The source schema decides which columns are compared and how; Redis may omit NULL fields
+        kinds = {column: kind for column, kind in self.source.column_kinds(table) if column not in self.ignore_columns}
+        source_digests = self.source.leaf_digests(table, pk_columns, kinds, self.leaf_bits, self.temporal)
+        source_rows = sum(source_digests.counts)
+        target_digests, target_rows = self.digests(self.target.rows(table, pk_columns), kinds)
+        visited = [0]
+        leaves = differing_leaves(source_digests, target_digests, 0, 1 << self.leaf_bits, self.fanout, visited)
+
+        mismatches = {'missing': [], 'extra': [], 'different': []}
+        counts = dict.fromkeys(mismatches, 0)
+
+        def record(kind, item):
+            counts[kind] += 1
+            if len(mismatches[kind]) < self.max_mismatches:
+                mismatches[kind].append(item)
+
+        if leaves:
+            # Only the target keys of the differing leaves are held for the whole pass
+            target_keys = {}
+            for key, pk_text in self.target.keys(table, pk_columns, self.leaf_bits, set(leaves)):
+                target_keys.setdefault(target_digests.leaf(pk_text), []).append((key, pk_text))
+            for group in self.leaf_groups(leaves, source_digests):
+                expected_rows = dict(self.source.canonical_rows(table, pk_columns, kinds, self.leaf_bits, group,
+                                                                self.temporal))
+                keys = [item for leaf in group for item in target_keys.pop(leaf, ())]
+                for pk, row in self.target.fetch_rows(keys):
+                    expected = expected_rows.pop(pk, None)
+                    if expected is None:
+                        record('extra', pk)
+                        continue
+                    actual = self.canonical_row(row, kinds)
+                    changed = {column: {'source': expected[column], 'target': actual[column]}
+                               for column in expected if expected[column] != actual[column]}
+                    if changed:
+                        record('different', {'pk': pk, 'columns': changed})
+                for pk in expected_rows:
+                    record('missing', pk)
+        missing, extra, different = mismatches['missing'], mismatches['extra'], mismatches['different']
+
+        result = {
+            'table': table,
+            'source_rows': source_rows,
+            'target_rows': target_rows,
+            'ranges_compared': visited[0],
+            'differing_leaves': len(leaves),
+            'missing': missing,
+            'extra': extra,
+            'different': different,
+            'missing_count': counts['missing'],
+            'extra_count': counts['extra'],
+            'different_count': counts['different'],
+            'seconds': round(time.perf_counter() - started, 2),
+        }
+        status = 'OK' if not any(counts.values()) else 'MISMATCH'
+        print(f"{table}: {status} source={source_rows} target={target_rows} ranges={visited[0]} "
+              f"leaves={len(leaves)} missing={counts['missing']} extra={counts['extra']} "
+              f"different={counts['different']} "
+              f"({result['seconds']}s)")
+        for pk in missing[:self.max_report]:
+            print(f"  missing in Redis: {pk}")
+        for pk in extra[:self.max_report]:
+            print(f"  only in Redis: {pk}")
+        for row in different[:self.max_report]:
+            print(f"  different: {row['pk']} {row['columns']}")
+        return result
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verify that the RDI target in Redis matches the source database")
+    parser.add_argument('--schema', choices=list(SCHEMAS), default='employee')
+    parser.add_argument('--tables', help="comma separated subset of the schema's tables")
+    parser.add_argument('--data-type', choices=['hash', 'json'], default='hash', help="how RDI stores rows")
+    parser.add_argument('--leaf-bits', type=int, default=16, help="log2 of the number of pk hash leaves")
+    parser.add_argument('--fanout', type=int, default=16, help="sub-ranges per level when recursing into a diff")
+    parser.add_argument('--temporal', choices=['epoch', 'iso'], default='epoch',
+                        help="how RDI encoded dates/timestamps: epoch days/ms or ISO-8601 text")
+    parser.add_argument('--ignore-columns', default='created_at,updated_at', help="columns left out of the checksum")
+    parser.add_argument('--batch-size', type=int, default=1000, help="keys per Redis pipeline")
+    parser.add_argument('--group-rows', type=int, default=100000,
+                        help="source rows held in memory per group of differing leaves")
+    parser.add_argument('--max-mismatches', type=int, default=10000,
+                        help="mismatching pks of each kind kept for the report, the rest are only counted")
+    parser.add_argument('--output', help="optional JSON report with up to --max-mismatches rows of each kind")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    tables = SCHEMAS[args.schema]
+    if args.tables:
+        tables = {table: tables[table] for table in args.tables.split(',')}
+
+    source = PostgresSource() if args.schema == 'employee' else MySQLSource()
+    target = RedisTarget(connect_redis(), args.data_type, args.batch_size)
+    verifier = Verifier(source, target, args.leaf_bits, args.fanout, args.temporal,
+                        [column for column in args.ignore_columns.split(',') if column],
+                        group_rows=args.group_rows, max_mismatches=args.max_mismatches)
+    try:
+        results = [verifier.verify(table, pk_columns) for table, pk_columns in tables.items()]
+    finally:
+        source.close()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+    if any(result['missing_count'] or result['extra_count'] or result['different_count'] for result in results):
+        raise SystemExit(1)
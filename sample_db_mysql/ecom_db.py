@@ -1,17 +1,29 @@
+import argparse
 import os
 import sys
 import time
 import mysql.connector
 
+from shop_generator import USERS_PER_SF, PRODUCTS_PER_SF, generate_users, generate_products, generate_orders
+
+# Shared instrumentation lives with the PostgreSQL scripts; it only needs the standard library
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_db_pg"))
+from metrics import METRICS, SIZE_BUCKETS, configure as configure_metrics  # noqa: E402
+
 MYSQL_HOST = os.getenv("MYSQL_HOST", "127.0.0.1")
 MYSQL_PORT = int(os.getenv("MYSQL_PORT", "3306"))
 MYSQL_USER = os.getenv("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "admin")
 
+# Rows per executemany batch when generating data for a scale factor
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5000"))
+
+SCHEMA = "sample_shop"
+
 parts = []
-parts.append(f"drop schema if exists sample_shop;")
-parts.append(f"CREATE schema IF NOT EXISTS sample_shop;")
-parts.append(f"USE sample_shop;")
+parts.append(f"drop schema if exists {SCHEMA};")
+parts.append(f"CREATE schema IF NOT EXISTS {SCHEMA};")
+parts.append(f"USE {SCHEMA};")
 
 parts.append("""
 CREATE TABLE IF NOT EXISTS users (
@@ -58,6 +70,9 @@ CREATE TABLE IF NOT EXISTS order_products (
 ) ENGINE=InnoDB;
 """)
 
+# Statements up to here create the schema; the fixed sample rows follow
+SCHEMA_PART_COUNT = len(parts)
+
 # Users insert
 parts.append("""
 INSERT INTO users (full_name, email, phone)
@@ -114,29 +129,30 @@ VALUES
 parts.append("""
 INSERT INTO orders (user_id, order_date, status, total_amount, shipping_address)
 VALUES
-(1, NOW(), 'COMPLETED', 85999.00, 'Mumbai, India'),
+(1, NOW(), 'COMPLETED', 125998.00, 'Mumbai, India'),
 (2, NOW(), 'PENDING', 124999.00, 'Pune, India'),
 (3, NOW(), 'COMPLETED', 29999.00, 'Bangalore, India'),
-(4, NOW(), 'COMPLETED', 9999.00, 'Delhi, India'),
-(5, NOW(), 'PENDING', 4999.00, 'Hyderabad, India'),
+(4, NOW(), 'COMPLETED', 17998.00, 'Delhi, India'),
+(5, NOW(), 'PENDING', 1497.00, 'Hyderabad, India'),
 (6, NOW(), 'CANCELLED', 109999.00, 'Kolkata, India'),
 (7, NOW(), 'COMPLETED', 45999.00, 'Chennai, India'),
 (8, NOW(), 'COMPLETED', 14999.00, 'Noida, India'),
-(9, NOW(), 'COMPLETED', 89999.00, 'Gurugram, India'),
+(9, NOW(), 'COMPLETED', 89998.00, 'Gurugram, India'),
 (10, NOW(), 'PENDING', 1999.00, 'Ahmedabad, India'),
 (11, NOW(), 'COMPLETED', 119999.00, 'Indore, India'),
-(12, NOW(), 'PENDING', 999.00, 'Surat, India'),
-(13, NOW(), 'COMPLETED', 3999.00, 'Chandigarh, India'),
+(12, NOW(), 'PENDING', 998.00, 'Surat, India'),
+(13, NOW(), 'COMPLETED', 3998.00, 'Chandigarh, India'),
 (14, NOW(), 'COMPLETED', 8999.00, 'Jaipur, India'),
-(15, NOW(), 'COMPLETED', 179999.00, 'Nagpur, India'),
-(16, NOW(), 'PENDING', 1599.00, 'Bhopal, India'),
+(15, NOW(), 'COMPLETED', 174998.00, 'Nagpur, India'),
+(16, NOW(), 'PENDING', 1499.00, 'Bhopal, India'),
 (17, NOW(), 'COMPLETED', 29999.00, 'Lucknow, India'),
-(18, NOW(), 'PENDING', 3999.00, 'Kanpur, India'),
+(18, NOW(), 'PENDING', 2999.00, 'Kanpur, India'),
 (19, NOW(), 'COMPLETED', 74999.00, 'Patna, India'),
-(20, NOW(), 'COMPLETED', 5999.00, 'Ranchi, India');
+(20, NOW(), 'COMPLETED', 5998.00, 'Ranchi, India');
 """)
 
-# Order products insert
+# Order products insert; price_at_purchase is the unit price and each order's total_amount
+# is the sum of quantity * price_at_purchase over its lines
 parts.append("""
 INSERT INTO order_products (order_id, product_id, quantity, price_at_purchase)
 VALUES
@@ -144,26 +160,194 @@ VALUES
 (1, 16, 1, 45999.00),
 (2, 4, 1, 124999.00),
 (3, 3, 1, 29999.00),
-(4, 8, 2, 17998.00),
-(5, 15, 3, 1497.00);
+(4, 8, 2, 8999.00),
+(5, 15, 3, 499.00),
+(6, 6, 1, 109999.00),
+(7, 16, 1, 45999.00),
+(8, 11, 1, 14999.00),
+(9, 2, 1, 74999.00),
+(9, 11, 1, 14999.00),
+(10, 10, 1, 1999.00),
+(11, 5, 1, 119999.00),
+(12, 15, 2, 499.00),
+(13, 10, 2, 1999.00),
+(14, 8, 1, 8999.00),
+(15, 4, 1, 124999.00),
+(15, 7, 1, 49999.00),
+(16, 13, 1, 1499.00),
+(17, 3, 1, 29999.00),
+(18, 14, 1, 2999.00),
+(19, 2, 1, 74999.00),
+(20, 14, 2, 2999.00);
 """)
 
 SQL_SCRIPT = "\n".join(parts)
 
-def execute_script():
-    print(f"Connecting to MySQL at {MYSQL_HOST}:{MYSQL_PORT} as '{MYSQL_USER}'")
+# Last committed batch per table of a --scale-factor load, written in the same transaction as the batch
+PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS seed_progress (
+    run_key VARCHAR(100) NOT NULL,
+    table_name VARCHAR(64) NOT NULL,
+    last_batch INT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_key, table_name)
+) ENGINE=InnoDB
+"""
+
+
+def chunked(rows, batch_size=BATCH_SIZE):
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def timed_generation(batches, table):
+    # Generation is lazy, so time each step of the generator separately from the inserts
+    batches = iter(batches)
+    while True:
+        with METRICS.timer("stage", script="ecom_db", stage="generate", table=table):
+            batch = next(batches, None)
+        if batch is None:
+            return
+        yield batch
+
+
+def execute_batch(cursor, query, batch, table):
+    with METRICS.timer("stage", script="ecom_db", stage="insert", table=table):
+        cursor.executemany(query, batch)
+    METRICS.observe("batch_rows", len(batch), SIZE_BUCKETS, script="ecom_db", table=table)
+    METRICS.inc("rows_total", len(batch), script="ecom_db", table=table)
+
+
+def commit(conn):
+    with METRICS.timer("stage", script="ecom_db", stage="commit"):
+        conn.commit()
+
+
+def load_progress(cursor, run_key):
+    """Last committed batch per table recorded for a load, e.g. {"users": 41}"""
+    cursor.execute("SELECT table_name, last_batch FROM seed_progress WHERE run_key = %s", (run_key,))
+    return dict(cursor.fetchall())
+
+
+def save_progress(cursor, run_key, table, batch_id):
+    cursor.execute("INSERT INTO seed_progress (run_key, table_name, last_batch) VALUES (%s, %s, %s) "
+                   "ON DUPLICATE KEY UPDATE last_batch = VALUES(last_batch)", (run_key, table, batch_id))
+
+
+def insert_batches(conn, cursor, query, batches, table=None, progress=None):
+    # progress is (run_key, last batch per table); batches up to the recorded one are generated but not sent
+    rows = 0
+    for batch_id, batch in enumerate(timed_generation(batches, table)):
+        if progress and batch_id <= progress[1].get(table, -1):
+            continue
+        execute_batch(cursor, query, batch, table)
+        if progress:
+            save_progress(cursor, progress[0], table, batch_id)
+        commit(conn)
+        rows += len(batch)
+    return rows
+
+
+def report_rate(table, rows, started, print_rate=True):
+    seconds = time.perf_counter() - started
+    METRICS.set("rows_per_second", round(rows / seconds, 1) if seconds else 0.0, script="ecom_db", table=table)
+    if print_rate:
+        print(f"Loaded {rows} {table} in {seconds:.1f}s")
+
+
+def load_scale_factor(conn, cursor, scale_factor, batch_size=BATCH_SIZE, seed=None, resume=False):
+    # Keys are generated consistently, so skip per-row FK and unique checks during the load
+    cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+
     try:
-        conn = mysql.connector.connect(
+        # Every batch commits with its progress row. Keys are positional, so a resumed load regenerates
+        # the same ids, skips the recorded batches and inserts with IGNORE in case one is half present.
+        run_key = f"{scale_factor}:{batch_size}:{seed}"
+        cursor.execute(PROGRESS_TABLE)
+        progress = (run_key, load_progress(cursor, run_key) if resume else {})
+        if resume:
+            print(f"Resuming after batches {progress[1] or 'none'}")
+        insert = "INSERT IGNORE" if resume else "INSERT"
+
+        started = time.perf_counter()
+        users = insert_batches(conn, cursor, f"{insert} INTO users (user_id, full_name, email, phone) "
+                                             "VALUES (%s, %s, %s, %s)",
+                               generate_users(scale_factor, batch_size, seed), "users", progress)
+        report_rate("users", users, started)
+
+        started = time.perf_counter()
+        products, prices = generate_products(scale_factor, seed)
+        rows = insert_batches(conn, cursor, f"{insert} INTO products (product_id, product_name, category, price, "
+                                            "stock_quantity) VALUES (%s, %s, %s, %s, %s)",
+                              chunked(products, batch_size), "products", progress)
+        report_rate("products", rows, started)
+
+        started = time.perf_counter()
+        orders = lines = 0
+        batches = timed_generation(generate_orders(scale_factor, prices, batch_size, seed), "orders")
+        for batch_id, (order_batch, line_batch) in enumerate(batches):
+            if batch_id <= progress[1].get("orders", -1):
+                continue
+            execute_batch(cursor, f"{insert} INTO orders (order_id, user_id, order_date, status, total_amount, "
+                                  "shipping_address) VALUES (%s, %s, %s, %s, %s, %s)", order_batch, "orders")
+            execute_batch(cursor, f"{insert} INTO order_products (order_id, product_id, quantity, price_at_purchase) "
+                                  "VALUES (%s, %s, %s, %s)", line_batch, "order_products")
+            save_progress(cursor, run_key, "orders", batch_id)
+            commit(conn)
+            orders += len(order_batch)
+            lines += len(line_batch)
+        print(f"Loaded {orders} orders with {lines} line items in {time.perf_counter() - started:.1f}s")
+        report_rate("orders", orders, started, print_rate=False)
+        report_rate("order_products", lines, started, print_rate=False)
+    finally:
+        # Session settings outlive the load on a reused connection, so restore them even on errors
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+
+def get_connection(database=None):
+    """Open a MySQL connection from the MYSQL_* environment settings"""
+    with METRICS.timer("connect_wait", script="ecom_db"):
+        return mysql.connector.connect(
             host=MYSQL_HOST,
             port=MYSQL_PORT,
             user=MYSQL_USER,
-            password=MYSQL_PASSWORD
+            password=MYSQL_PASSWORD,
+            database=database
         )
-        cursor = conn.cursor()
-        statements = [stmt.strip() for stmt in SQL_SCRIPT.split(';') if stmt.strip()]
+
+
+def schema_parts(schema=SCHEMA):
+    """The script parts with the first three (drop, create, use) retargeted at another schema"""
+    return [f"drop schema if exists {schema};", f"CREATE schema IF NOT EXISTS {schema};", f"USE {schema};"] + parts[3:]
+
+
+def seed_schema(conn, cursor, scale_factor=None, batch_size=BATCH_SIZE, seed=None, schema=SCHEMA, resume=False):
+    # Each part is exactly one statement, so data containing ';' is safe
+    statements = schema_parts(schema)
+    statements = statements if scale_factor is None else statements[:SCHEMA_PART_COUNT]
+    if resume and scale_factor is not None:
+        if seed is None:
+            # An unseeded rerun would pair the positional ids with different rows
+            raise ValueError("--resume needs the --seed of the interrupted load")
+        # Keep the interrupted load: every table is created IF NOT EXISTS
+        statements = statements[1:]
+    elif resume:
+        print("--resume only applies to --scale-factor loads, recreating the fixed sample rows")
+        resume = False
+    with METRICS.timer("stage", script="ecom_db", stage="schema"):
         for statement in statements:
-            cursor.execute(statement)
+            cursor.execute(statement.strip().rstrip(';'))
         conn.commit()
+    if scale_factor is not None:
+        load_scale_factor(conn, cursor, scale_factor, batch_size, seed, resume)
+
+
+def execute_script(scale_factor=None, batch_size=BATCH_SIZE, seed=None, resume=False):
+    print(f"Connecting to MySQL at {MYSQL_HOST}:{MYSQL_PORT} as '{MYSQL_USER}'")
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        seed_schema(conn, cursor, scale_factor, batch_size, seed, resume=resume)
         print("SQL script executed successfully.")
         cursor.close()
         conn.close()
@@ -173,8 +357,21 @@ def execute_script():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and populate the sample_shop MySQL schema")
+    parser.add_argument("--scale-factor", type=float, default=None,
+                        help=f"generate {USERS_PER_SF} users and {PRODUCTS_PER_SF} products per unit, "
+                             "with orders and line items, instead of the fixed sample rows")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per multi-row INSERT batch")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible generated data")
+    parser.add_argument("--resume", action="store_true",
+                        help="keep the schema and continue an interrupted --scale-factor load with the same "
+                             "options (including --seed) after its last committed batches")
+    args = parser.parse_args()
+    if args.resume and args.scale_factor is not None and args.seed is None:
+        parser.error("--resume needs the --seed of the interrupted load")
+    configure_metrics()
     try:
-        execute_script()
+        execute_script(args.scale_factor, args.batch_size, args.seed, args.resume)
     except Exception as e:
         print("Failed to create sample_shop schema and populate data. See errors above.", e)
         sys.exit(1)
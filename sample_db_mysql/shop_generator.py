@@ -0,0 +1,145 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from faker import Faker
+
+# Seeded, vectorized generator for sample_shop. Rows are drawn with NumPy from pools of Faker
+# values, and order totals are summed from their line items in integer cents, so aggregates
+# over order_products always match orders.total_amount.
+
+# Cardinalities per unit of --scale-factor
+USERS_PER_SF = 10000
+PRODUCTS_PER_SF = 1000
+MAX_ORDERS_PER_USER = 10
+MAX_LINES_PER_ORDER = 5
+MAX_QUANTITY = 3
+
+CATEGORIES = np.array(["Electronics", "Computers", "Home Appliances", "Fashion", "Sports", "Groceries"],
+                      dtype=object)
+STATUSES = np.array(["COMPLETED", "PENDING", "CANCELLED"], dtype=object)
+STATUS_WEIGHTS = [0.6, 0.2, 0.2]
+
+# Zipf-like popularity of products in order lines (0 = uniform)
+PRODUCT_SKEW = float(os.getenv("PRODUCT_SKEW", "0.8"))
+ORDER_HISTORY_DAYS = 730
+# Order dates fall in the ORDER_HISTORY_DAYS before this fixed instant, so a seed (and a resumed
+# load) always reproduces the same dates
+ORDER_DATE_ANCHOR = os.getenv("ORDER_DATE_ANCHOR", "2025-01-01T00:00:00")
+
+# Distinct values pre-generated per free-text field, with their own fixed seed
+TEXT_POOL_SIZE = int(os.getenv("TEXT_POOL_SIZE", "5000"))
+TEXT_POOL_SEED = 0
+
+
+@lru_cache(maxsize=None)
+def text_pools(seed=TEXT_POOL_SEED, size=TEXT_POOL_SIZE):
+    faker = Faker()
+    faker.seed_instance(seed)
+
+    def pool(provider, limit):
+        return np.array([provider()[:limit] for _ in range(size)], dtype=object)
+
+    return {
+        "first_name": pool(faker.first_name, 40),
+        "last_name": pool(faker.last_name, 40),
+        "phone": pool(faker.phone_number, 20),
+        "address": pool(lambda: f"{faker.street_address()}, {faker.city()}", 255),
+        "brand": pool(lambda: faker.company().split()[0].strip(","), 40),
+        "model": pool(lambda: faker.bothify("??-####").upper(), 20),
+    }
+
+
+def user_count(scale_factor):
+    return int(USERS_PER_SF * scale_factor)
+
+
+def generate_users(scale_factor, batch_size, seed=None):
+    """Yield batches of (user_id, full_name, email, phone) rows"""
+    rng = np.random.default_rng(None if seed is None else [seed, 1])
+    pools = text_pools()
+    count = user_count(scale_factor)
+    for start in range(1, count + 1, batch_size):
+        user_ids = np.arange(start, min(start + batch_size, count + 1))
+        n = len(user_ids)
+        first = pools["first_name"][rng.integers(0, TEXT_POOL_SIZE, n)]
+        last = pools["last_name"][rng.integers(0, TEXT_POOL_SIZE, n)]
+        phones = pools["phone"][rng.integers(0, TEXT_POOL_SIZE, n)]
+        # The id suffix keeps the UNIQUE email constraint satisfied whatever names are drawn
+        yield [(user_id, f"{f} {l}", f"{f.lower()}.{l.lower()}.{user_id}@example.com", phone)
+               for user_id, f, l, phone in zip(user_ids.tolist(), first.tolist(), last.tolist(), phones.tolist())]
+
+
+def generate_products(scale_factor, seed=None):
+    """Return (rows, prices in cents indexed by product_id) for the whole catalogue
+
+    The catalogue is small relative to orders and stays in memory to price line items.
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, 2])
+    pools = text_pools()
+    count = int(PRODUCTS_PER_SF * scale_factor)
+    categories = CATEGORIES[rng.integers(0, len(CATEGORIES), count)]
+    brands = pools["brand"][rng.integers(0, TEXT_POOL_SIZE, count)]
+    models = pools["model"][rng.integers(0, TEXT_POOL_SIZE, count)]
+    cents = np.round(np.minimum(rng.lognormal(8.5, 1.2, count), 999999) * 100).astype(np.int64)
+    stock = rng.integers(0, 501, count)
+    rows = [(product_id, f"{brand} {category} {model}", category, price / 100, quantity)
+            for product_id, brand, category, model, price, quantity in
+            zip(range(1, count + 1), brands.tolist(), categories.tolist(), models.tolist(), cents.tolist(),
+                stock.tolist())]
+    # Index 0 is unused so product_id indexes the array directly
+    return rows, np.concatenate(([0], cents))
+
+
+def product_weights(count, rng):
+    """Popularity per product: a Zipf-like curve over a random ranking of the catalogue"""
+    if PRODUCT_SKEW <= 0:
+        return None
+    weights = 1.0 / np.arange(1, count + 1) ** PRODUCT_SKEW
+    return (weights / weights.sum())[rng.permutation(count)]
+
+
+def generate_orders(scale_factor, prices, batch_size, seed=None, anchor=ORDER_DATE_ANCHOR):
+    """Yield (orders, order_products) row batches of about batch_size orders each
+
+    Orders are generated for a slice of users at a time, so memory is bounded by the
+    batch size whatever the scale factor. Each order has 1..MAX_LINES_PER_ORDER lines
+    over distinct products; price_at_purchase is the unit price and total_amount is
+    the sum of quantity * price_at_purchase.
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, 3])
+    pools = text_pools()
+    users = user_count(scale_factor)
+    products = len(prices) - 1
+    weights = product_weights(products, rng)
+    users_per_batch = max(1, batch_size * 2 // MAX_ORDERS_PER_USER)
+    anchor = np.datetime64(anchor, "s")
+    next_order_id = 1
+
+    for first_user in range(1, users + 1, users_per_batch):
+        user_ids = np.arange(first_user, min(first_user + users_per_batch, users + 1))
+        order_user = np.repeat(user_ids, rng.integers(0, MAX_ORDERS_PER_USER + 1, len(user_ids)))
+        n = len(order_user)
+        if not n:
+            continue
+        order_ids = np.arange(next_order_id, next_order_id + n)
+        next_order_id += n
+
+        # Line items: draw products per line, then keep one line per (order, product) for the primary key
+        line_order = np.repeat(np.arange(n), rng.integers(1, MAX_LINES_PER_ORDER + 1, n))
+        line_product = rng.choice(products, len(line_order), p=weights) + 1
+        _, first = np.unique(line_order * (products + 1) + line_product, return_index=True)
+        line_order, line_product = line_order[first], line_product[first]
+        quantity = rng.integers(1, MAX_QUANTITY + 1, len(line_order))
+        unit_cents = prices[line_product]
+        total_cents = np.bincount(line_order, weights=quantity * unit_cents, minlength=n).astype(np.int64)
+
+        status = STATUSES[rng.choice(len(STATUSES), n, p=STATUS_WEIGHTS)]
+        address = pools["address"][rng.integers(0, TEXT_POOL_SIZE, n)]
+        order_date = (anchor - rng.integers(0, ORDER_HISTORY_DAYS * 86400, n).astype("timedelta64[s]")).astype(object)
+
+        orders = list(zip(order_ids.tolist(), order_user.tolist(), order_date.tolist(), status.tolist(),
+                          (total_cents / 100).tolist(), address.tolist()))
+        lines = list(zip(order_ids[line_order].tolist(), line_product.tolist(), quantity.tolist(),
+                         (unit_cents / 100).tolist()))
+        yield orders, lines
@@ -0,0 +1,168 @@
+import argparse
+import random
+import sys
+import threading
+import time
+
+from ecom_db import MYSQL_HOST, MYSQL_PORT, get_connection
+
+SCHEMA = "sample_shop"
+DEFAULT_MIX = "order=50,status=35,price=15"
+CITIES = ["Mumbai", "Pune", "Bangalore", "Delhi", "Hyderabad", "Kolkata", "Chennai", "Noida", "Jaipur", "Indore"]
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        operation, _, weight = part.partition("=")
+        if operation.strip() not in ("order", "status", "price"):
+            raise ValueError(f"Unknown operation in mix: {operation}")
+        weights[operation.strip()] = float(weight)
+    return weights
+
+
+class ShopWorker(threading.Thread):
+    """One connection applying a paced share of the e-commerce write workload"""
+
+    def __init__(self, worker_id, ops_per_sec, weights, max_user_id, max_product_id, stop, seed=None):
+        super().__init__(name=f"shop-worker-{worker_id}", daemon=True)
+        self.ops_per_sec = ops_per_sec
+        self.weights = weights
+        self.max_user_id = max_user_id
+        self.max_product_id = max_product_id
+        self.stop = stop
+        self.rng = random.Random(None if seed is None else seed + worker_id)
+        self.counts = dict.fromkeys(weights, 0)
+        self.errors = 0
+
+    def new_order(self, cursor):
+        # Order header, line items and stock decrements commit as one transaction
+        user_id = self.rng.randint(1, self.max_user_id)
+        lines = {self.rng.randint(1, self.max_product_id): self.rng.randint(1, 3)
+                 for _ in range(self.rng.randint(1, 5))}
+        placeholders = ", ".join(["%s"] * len(lines))
+        cursor.execute(f"SELECT product_id, price FROM products WHERE product_id IN ({placeholders}) FOR UPDATE",
+                       tuple(lines))
+        prices = dict(cursor.fetchall())
+        if not prices:
+            return
+        total = sum(prices[product_id] * quantity for product_id, quantity in lines.items() if product_id in prices)
+        cursor.execute("INSERT INTO orders (user_id, status, total_amount, shipping_address) "
+                       "VALUES (%s, 'PENDING', %s, %s)", (user_id, total, f"{self.rng.choice(CITIES)}, India"))
+        order_id = cursor.lastrowid
+        cursor.executemany("INSERT INTO order_products (order_id, product_id, quantity, price_at_purchase) "
+                           "VALUES (%s, %s, %s, %s)",
+                           [(order_id, product_id, quantity, prices[product_id])
+                            for product_id, quantity in lines.items() if product_id in prices])
+        cursor.executemany("UPDATE products SET stock_quantity = GREATEST(stock_quantity - %s, 0) "
+                           "WHERE product_id = %s",
+                           [(quantity, product_id) for product_id, quantity in lines.items() if product_id in prices])
+
+    def status_transition(self, cursor):
+        # PENDING -> COMPLETED or CANCELLED; cancelled orders give their stock back
+        cursor.execute("SELECT order_id FROM orders WHERE status = 'PENDING' ORDER BY order_id LIMIT 1 "
+                       "FOR UPDATE SKIP LOCKED")
+        row = cursor.fetchone()
+        if row is None:
+            return
+        status = "COMPLETED" if self.rng.random() < 0.8 else "CANCELLED"
+        cursor.execute("UPDATE orders SET status = %s WHERE order_id = %s", (status, row[0]))
+        if status == "CANCELLED":
+            cursor.execute("UPDATE products p JOIN order_products op ON p.product_id = op.product_id "
+                           "SET p.stock_quantity = p.stock_quantity + op.quantity WHERE op.order_id = %s", (row[0],))
+
+    def price_update(self, cursor):
+        cursor.execute("UPDATE products SET price = ROUND(price * %s, 2) WHERE product_id = %s",
+                       (round(self.rng.uniform(0.9, 1.1), 4), self.rng.randint(1, self.max_product_id)))
+
+    def run(self):
+        operations = {"order": self.new_order, "status": self.status_transition, "price": self.price_update}
+        conn = get_connection(SCHEMA)
+        cursor = conn.cursor()
+        # A rate of 0 runs unpaced
+        interval = 1.0 / self.ops_per_sec if self.ops_per_sec else 0
+        next_op = time.perf_counter()
+        try:
+            while not self.stop.is_set():
+                operation = self.rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+                try:
+                    operations[operation](cursor)
+                    conn.commit()
+                    self.counts[operation] += 1
+                except Exception as e:
+                    conn.rollback()
+                    self.errors += 1
+                    print(f"{self.name}: {operation} rolled back: {e}")
+                next_op += interval
+                now = time.perf_counter()
+                if next_op > now:
+                    time.sleep(next_op - now)
+                elif now - next_op > 1.0:
+                    next_op = now
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def run_workload(ops_per_sec, connections, mix, duration=0, seed=None, report_every=10):
+    conn = get_connection(SCHEMA)
+    cursor = conn.cursor()
+    cursor.execute("SELECT (SELECT MAX(user_id) FROM users), (SELECT MAX(product_id) FROM products)")
+    max_user_id, max_product_id = cursor.fetchone()
+    cursor.close()
+    conn.close()
+    if not max_user_id or not max_product_id:
+        raise RuntimeError("sample_shop has no users or products, run ecom_db.py first")
+
+    stop = threading.Event()
+    weights = parse_mix(mix)
+    workers = [ShopWorker(i, ops_per_sec / connections, weights, max_user_id, max_product_id, stop, seed)
+               for i in range(connections)]
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    last_report, last_ops = started, 0
+    try:
+        while not duration or time.perf_counter() - started < duration:
+            remaining = duration - (time.perf_counter() - started) if duration else report_every
+            time.sleep(max(0.0, min(report_every, remaining)))
+            now = time.perf_counter()
+            ops = sum(sum(worker.counts.values()) for worker in workers)
+            print(f"{ops - last_ops} ops in {now - last_report:.1f}s "
+                  f"({(ops - last_ops) / (now - last_report):,.0f} ops/sec) on {connections} connections")
+            last_report, last_ops = now, ops
+    except KeyboardInterrupt:
+        print("Workload interrupted")
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    elapsed = time.perf_counter() - started
+    totals = {operation: sum(worker.counts[operation] for worker in workers) for operation in weights}
+    errors = sum(worker.errors for worker in workers)
+    print(f"Applied {sum(totals.values())} operations in {elapsed:.1f}s "
+          f"({sum(totals.values()) / elapsed:,.0f} ops/sec), {errors} errors: {totals}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Continuous e-commerce write workload against sample_shop")
+    parser.add_argument("--ops-per-sec", type=float, default=200,
+                        help="target operations per second, all connections (0 runs unpaced)")
+    parser.add_argument("--connections", type=int, default=4, help="parallel MySQL connections")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, e.g. order=50,status=35,price=15")
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run, 0 runs until interrupted")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible operation sequences")
+    args = parser.parse_args()
+    if args.ops_per_sec < 0:
+        parser.error("--ops-per-sec must be 0 (unpaced) or positive")
+    if args.connections < 1:
+        parser.error("--connections must be at least 1")
+
+    print(f"Connecting to MySQL at {MYSQL_HOST}:{MYSQL_PORT}")
+    try:
+        run_workload(args.ops_per_sec, args.connections, args.mix, args.duration, args.seed)
+    except Exception as e:
+        print("Shop workload failed.", e)
+        sys.exit(1)
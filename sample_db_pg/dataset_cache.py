@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+
+from employee_db import COPY_BATCH_SIZE, shard_seed
+from employee_columns import TEXT_POOL_SIZE, columns_to_batch, generate_columns
+
+# Bump whenever generate_columns or the table layout changes, so stale snapshots are not reused
+SCHEMA_VERSION = 1
+
+DATASET_CACHE_DIR = os.getenv('DATASET_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'employee_db'))
+
+
+def dataset_path(cache_dir, num_employees, batch_size, seed):
+    """Directory of the snapshot for one (schema version, seed, rows, batch size) combination"""
+    name = f"employees-v{SCHEMA_VERSION}-seed{seed}-rows{num_employees}-batch{batch_size}-pool{TEXT_POOL_SIZE}"
+    return os.path.join(cache_dir, name)
+
+
+def save_columns(path, columns):
+    """Write one batch as a .npy file per column
+
+    Object columns become fixed-width unicode arrays (strings) or datetime64 (dates,
+    None as NaT); string columns holding None get a boolean <name>.nulls.npy mask.
+    """
+    os.makedirs(path)
+    for name, column in columns.items():
+        if column.dtype.kind == 'O':
+            nulls = np.array([value is None for value in column], dtype=bool)
+            sample = next((value for value in column if value is not None), '')
+            if isinstance(sample, date):
+                column = column.astype('datetime64[D]')
+            else:
+                column = np.where(nulls, '', column).astype(str)
+                if nulls.any():
+                    np.save(os.path.join(path, f"{name}.nulls.npy"), nulls)
+        np.save(os.path.join(path, f"{name}.npy"), column)
+
+
+def load_columns(path):
+    """Memory-map one cached batch back into the dict generate_columns returns"""
+    columns = {}
+    for filename in sorted(os.listdir(path)):
+        if not filename.endswith('.npy') or filename.endswith('.nulls.npy'):
+            continue
+        name = filename[:-len('.npy')]
+        column = np.load(os.path.join(path, filename), mmap_mode='r')
+        if column.dtype.kind == 'U':
+            column = column.astype(object)
+            nulls_path = os.path.join(path, f"{name}.nulls.npy")
+            if os.path.exists(nulls_path):
+                column[np.load(nulls_path)] = None
+        elif column.dtype.kind == 'M' and np.isnat(column).any():
+            column = column.astype(object)
+        columns[name] = column
+    return columns
+
+
+def cached_column_batches(num_employees, batch_size=COPY_BATCH_SIZE, seed=0, cache_dir=DATASET_CACHE_DIR,
+                          first_batch=0):
+    """Yield column batches from the snapshot cache, generating and saving them on a miss
+
+    Batches are seeded exactly like iter_sample_batches, so a cached run loads the
+    same rows as a fresh seeded numpy run from the day the snapshot was written.
+    Batches before first_batch are skipped (on a miss they are still generated and saved).
+    """
+    path = dataset_path(cache_dir, num_employees, batch_size, seed)
+    manifest_path = os.path.join(path, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        print(f"Loading cached dataset {path} (generated {manifest['generated_on']})")
+        for batch_id in range(first_batch, manifest['batches']):
+            yield load_columns(os.path.join(path, f"batch_{batch_id:05d}"))
+        return
+
+    # Written under a temporary name and renamed once complete, so an interrupted run is never reused
+    partial = f"{path}.partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    print(f"Dataset cache miss, generating into {path}")
+    batches = 0
+    for batch_id, start in enumerate(range(0, num_employees, batch_size)):
+        columns = generate_columns(min(batch_size, num_employees - start), start, shard_seed(seed, batch_id))
+        save_columns(os.path.join(partial, f"batch_{batch_id:05d}"), columns)
+        batches += 1
+        if batch_id >= first_batch:
+            yield columns
+
+    os.makedirs(partial, exist_ok=True)
+    with open(os.path.join(partial, 'manifest.json'), 'w') as f:
+        json.dump({'schema_version': SCHEMA_VERSION, 'seed': seed, 'rows': num_employees,
+                   'batch_size': batch_size, 'batches': batches, 'generated_on': date.today().isoformat()}, f)
+    os.replace(partial, path)
+
+
+def cached_batches(num_employees, batch_size=COPY_BATCH_SIZE, seed=0, cache_dir=DATASET_CACHE_DIR, first_batch=0):
+    """cached_column_batches converted into the batch format EmployeeDatabase.load_batches takes"""
+    for columns in cached_column_batches(num_employees, batch_size, seed, cache_dir, first_batch):
+        yield columns_to_batch(columns)
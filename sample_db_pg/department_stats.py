@@ -0,0 +1,233 @@
+import argparse
+from decimal import Decimal
+
+from employee_db import DB_CONFIG, EmployeeDatabase
+
+# Precomputed get_department_statistics: one row per department holding the counts, sums and
+# bounds of the Active employment_info x employee_details join, kept current by row triggers.
+DEPARTMENT_STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS department_stats (
+    department VARCHAR(100) PRIMARY KEY,
+    employee_count BIGINT NOT NULL DEFAULT 0,
+    salary_count BIGINT NOT NULL DEFAULT 0,
+    salary_sum NUMERIC NOT NULL DEFAULT 0,
+    min_salary DECIMAL(12, 2),
+    max_salary DECIMAL(12, 2),
+    performance_count BIGINT NOT NULL DEFAULT 0,
+    performance_sum NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Adds (sign = 1) or removes (sign = -1) one joined row. The upsert takes the department's row
+# lock, so concurrent writers serialize per department. Counts and sums are pure deltas; min/max
+# only need a rescan of that department when the removed salary was the current bound.
+APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION department_stats_apply(p_department TEXT, p_salary NUMERIC, p_rating NUMERIC,
+                                                  p_sign INT) RETURNS void AS $$
+DECLARE
+    stats department_stats%ROWTYPE;
+BEGIN
+    INSERT INTO department_stats AS s (department, employee_count, salary_count, salary_sum, min_salary,
+                                       max_salary, performance_count, performance_sum)
+    VALUES (p_department, p_sign,
+            CASE WHEN p_salary IS NULL THEN 0 ELSE p_sign END, COALESCE(p_salary, 0) * p_sign,
+            CASE WHEN p_sign > 0 THEN p_salary END, CASE WHEN p_sign > 0 THEN p_salary END,
+            CASE WHEN p_rating IS NULL THEN 0 ELSE p_sign END, COALESCE(p_rating, 0) * p_sign)
+    ON CONFLICT (department) DO UPDATE SET
+        employee_count = s.employee_count + EXCLUDED.employee_count,
+        salary_count = s.salary_count + EXCLUDED.salary_count,
+        salary_sum = s.salary_sum + EXCLUDED.salary_sum,
+        min_salary = CASE WHEN p_sign > 0 THEN LEAST(s.min_salary, p_salary) ELSE s.min_salary END,
+        max_salary = CASE WHEN p_sign > 0 THEN GREATEST(s.max_salary, p_salary) ELSE s.max_salary END,
+        performance_count = s.performance_count + EXCLUDED.performance_count,
+        performance_sum = s.performance_sum + EXCLUDED.performance_sum,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING * INTO stats;
+
+    IF p_sign < 0 AND p_salary IS NOT NULL AND (p_salary <= stats.min_salary OR p_salary >= stats.max_salary) THEN
+        UPDATE department_stats SET (min_salary, max_salary) = (
+            SELECT MIN(e.salary), MAX(e.salary)
+            FROM employment_info e
+            JOIN employee_details d ON e.employee_id = d.employee_id
+            WHERE e.department = p_department AND e.employment_status = 'Active')
+        WHERE department = p_department;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+EMPLOYMENT_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION department_stats_employment_trigger() RETURNS trigger AS $$
+DECLARE
+    detail RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.employment_status = 'Active' THEN
+        FOR detail IN SELECT performance_rating FROM employee_details WHERE employee_id = OLD.employee_id LOOP
+            PERFORM department_stats_apply(OLD.department, OLD.salary, detail.performance_rating, -1);
+        END LOOP;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.employment_status = 'Active' THEN
+        FOR detail IN SELECT performance_rating FROM employee_details WHERE employee_id = NEW.employee_id LOOP
+            PERFORM department_stats_apply(NEW.department, NEW.salary, detail.performance_rating, 1);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DETAILS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION department_stats_details_trigger() RETURNS trigger AS $$
+DECLARE
+    employment RECORD;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        FOR employment IN SELECT department, salary FROM employment_info
+                          WHERE employee_id = OLD.employee_id AND employment_status = 'Active' LOOP
+            PERFORM department_stats_apply(employment.department, employment.salary, OLD.performance_rating, -1);
+        END LOOP;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        FOR employment IN SELECT department, salary FROM employment_info
+                          WHERE employee_id = NEW.employee_id AND employment_status = 'Active' LOOP
+            PERFORM department_stats_apply(employment.department, employment.salary, NEW.performance_rating, 1);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Updates only fire when a column feeding the statistics changes
+TRIGGERS = [
+    "DROP TRIGGER IF EXISTS department_stats_employment ON employment_info",
+    "CREATE TRIGGER department_stats_employment AFTER INSERT OR DELETE "
+    "OR UPDATE OF employee_id, department, salary, employment_status ON employment_info "
+    "FOR EACH ROW EXECUTE FUNCTION department_stats_employment_trigger()",
+    "DROP TRIGGER IF EXISTS department_stats_details ON employee_details",
+    "CREATE TRIGGER department_stats_details AFTER INSERT OR DELETE "
+    "OR UPDATE OF employee_id, performance_rating ON employee_details "
+    "FOR EACH ROW EXECUTE FUNCTION department_stats_details_trigger()",
+]
+
+LIVE_STATS_QUERY = """
+SELECT
+    e.department,
+    COUNT(*) AS employee_count,
+    COUNT(e.salary) AS salary_count,
+    COALESCE(SUM(e.salary), 0) AS salary_sum,
+    MIN(e.salary) AS min_salary,
+    MAX(e.salary) AS max_salary,
+    COUNT(d.performance_rating) AS performance_count,
+    COALESCE(SUM(d.performance_rating), 0) AS performance_sum
+FROM employment_info e
+JOIN employee_details d ON e.employee_id = d.employee_id
+WHERE e.employment_status = 'Active'
+GROUP BY e.department
+"""
+
+# Same columns and order as query.DEPARTMENT_STATS_QUERY, read in O(departments)
+CACHED_STATS_QUERY = """
+SELECT
+    department,
+    employee_count,
+    salary_sum / NULLIF(salary_count, 0) AS avg_salary,
+    min_salary,
+    max_salary,
+    performance_sum / NULLIF(performance_count, 0) AS avg_performance
+FROM department_stats
+WHERE employee_count > 0
+ORDER BY employee_count DESC;
+"""
+
+STATS_COLUMNS = ('employee_count', 'salary_count', 'salary_sum', 'min_salary', 'max_salary', 'performance_count',
+                 'performance_sum')
+
+
+def install(db):
+    """Create the department_stats table, functions and triggers, then rebuild the table"""
+    try:
+        db.cursor.execute(DEPARTMENT_STATS_TABLE)
+        db.cursor.execute(APPLY_FUNCTION)
+        db.cursor.execute(EMPLOYMENT_TRIGGER_FUNCTION)
+        db.cursor.execute(DETAILS_TRIGGER_FUNCTION)
+        for statement in TRIGGERS:
+            db.cursor.execute(statement)
+        db.conn.commit()
+        print("Department statistics triggers installed successfully!")
+    except Exception as e:
+        db.conn.rollback()
+        print(f"Error installing department statistics: {e}")
+        raise
+    rebuild(db)
+
+
+def rebuild(db):
+    """Recompute department_stats from scratch while blocking writes to the source tables"""
+    try:
+        db.cursor.execute("LOCK TABLE employment_info, employee_details IN SHARE MODE")
+        db.cursor.execute("DELETE FROM department_stats")
+        db.cursor.execute(f"INSERT INTO department_stats (department, {', '.join(STATS_COLUMNS)}) "
+                          f"{LIVE_STATS_QUERY}")
+        db.conn.commit()
+        print("Department statistics rebuilt successfully!")
+    except Exception as e:
+        db.conn.rollback()
+        print(f"Error rebuilding department statistics: {e}")
+        raise
+
+
+def uninstall(db):
+    """Drop the triggers, functions and table"""
+    try:
+        db.cursor.execute("DROP TRIGGER IF EXISTS department_stats_employment ON employment_info")
+        db.cursor.execute("DROP TRIGGER IF EXISTS department_stats_details ON employee_details")
+        db.cursor.execute("DROP FUNCTION IF EXISTS department_stats_employment_trigger(), "
+                          "department_stats_details_trigger(), department_stats_apply(TEXT, NUMERIC, NUMERIC, INT)")
+        db.cursor.execute("DROP TABLE IF EXISTS department_stats")
+        db.conn.commit()
+        print("Department statistics removed successfully!")
+    except Exception as e:
+        db.conn.rollback()
+        print(f"Error removing department statistics: {e}")
+        raise
+
+
+def verify(db):
+    """Compare department_stats with a live aggregate in one snapshot, returns the mismatching departments"""
+    db.conn.rollback()
+    db.cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    db.cursor.execute(LIVE_STATS_QUERY)
+    live = {row['department']: row for row in db.cursor.fetchall()}
+    db.cursor.execute("SELECT * FROM department_stats WHERE employee_count > 0")
+    cached = {row['department']: row for row in db.cursor.fetchall()}
+    db.conn.rollback()
+
+    mismatches = []
+    for department in sorted(set(live) | set(cached)):
+        expected, actual = live.get(department), cached.get(department)
+        if expected is None or actual is None or any(
+                Decimal(str(expected[column] or 0)) != Decimal(str(actual[column] or 0)) for column in STATS_COLUMNS):
+            mismatches.append(department)
+            print(f"Mismatch for {department}: live={expected and dict(expected)} cached={actual and dict(actual)}")
+    print(f"Verified {len(live)} departments, {len(mismatches)} mismatches")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the trigger-maintained department statistics table")
+    parser.add_argument('action', choices=['install', 'rebuild', 'verify', 'uninstall'])
+    args = parser.parse_args()
+
+    print(f"Connecting to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        {'install': install, 'rebuild': rebuild, 'verify': verify, 'uninstall': uninstall}[args.action](db)
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        db.disconnect()
@@ -0,0 +1,201 @@
+import os
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+from faker import Faker
+
+from employee_db import DEPARTMENTS, POSITIONS, JOB_LEVELS, EMPLOYMENT_TYPES, EDUCATION_LEVELS, SKILLS_POOL
+
+# Distinct values pre-generated per free-text field; rows draw from these pools by index.
+# The pools use their own fixed seed so every batch of a run shares them.
+TEXT_POOL_SIZE = int(os.getenv('TEXT_POOL_SIZE', '5000'))
+TEXT_POOL_SEED = 0
+
+GENDERS = np.array(['Male', 'Female', 'Other'], dtype=object)
+MARITAL_STATUSES = np.array(['Single', 'Married', 'Divorced', 'Widowed'], dtype=object)
+RELATIONS = np.array(['Spouse', 'Parent', 'Sibling', 'Friend', 'Child'], dtype=object)
+EMPLOYMENT_STATUSES = np.array(['Active', 'On Leave', 'Inactive'], dtype=object)
+EMPLOYMENT_STATUS_WEIGHTS = [4 / 6, 1 / 6, 1 / 6]  # Weighted toward Active, as in generate_employees
+DEGREE_FIELDS = ['Computer Science', 'Business', 'Engineering', 'Marketing', 'Finance', 'Psychology']
+CERTIFICATIONS = np.array([f"{vendor} {grade}" for vendor in ['AWS', 'Microsoft', 'Google', 'Salesforce']
+                           for grade in ['Certified', 'Professional', 'Expert']], dtype=object)
+EXTRA_LANGUAGES = ['Spanish', 'French', 'German', 'Chinese', 'Japanese']
+
+# Positions flattened so a (department, position) pair is one vectorized index lookup
+POSITION_NAMES = np.array([position[:100] for department in DEPARTMENTS for position in POSITIONS[department]],
+                          dtype=object)
+POSITION_COUNTS = np.array([len(POSITIONS[department]) for department in DEPARTMENTS])
+POSITION_OFFSETS = np.concatenate(([0], np.cumsum(POSITION_COUNTS)[:-1]))
+DEGREES = np.array([f"{level} in {field}"[:100] for level in EDUCATION_LEVELS for field in DEGREE_FIELDS],
+                   dtype=object)
+
+
+@lru_cache(maxsize=None)
+def text_pools(seed=TEXT_POOL_SEED, size=TEXT_POOL_SIZE):
+    """Pre-generate the Faker values the columnar generator samples from"""
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+
+    def pool(provider, limit, suffix=''):
+        return np.array([(provider() + suffix)[:limit] for _ in range(size)], dtype=object)
+
+    return {
+        'first_name': pool(faker.first_name, 50),
+        'last_name': pool(faker.last_name, 50),
+        'country': pool(faker.country, 50),
+        'phone': pool(faker.phone_number, 20),
+        'street_address': pool(faker.street_address, 200),
+        'secondary_address': pool(faker.secondary_address, 200),
+        'city': pool(faker.city, 100),
+        'state': pool(faker.state, 100),
+        'postcode': pool(faker.postcode, 20),
+        'name': pool(faker.name, 100),
+        'university': pool(faker.company, 100, " University"),
+    }
+
+
+@lru_cache(maxsize=None)
+def mask_items(mask, pool):
+    """Expand a bitmask over pool into the list of selected items"""
+    return [item for bit, item in enumerate(pool) if mask >> bit & 1]
+
+
+def sample_masks(rng, n, pool_size, low, high):
+    """Draw n subsets of low..high items without replacement from a pool, encoded as bitmasks"""
+    # argsort of random keys gives an independent random permutation per row
+    order = np.argsort(rng.random((n, pool_size)), axis=1)
+    counts = rng.integers(low, high + 1, n)
+    chosen = np.arange(pool_size) < counts[:, None]
+    bits = np.zeros((n, pool_size), dtype=np.int64)
+    np.put_along_axis(bits, order, chosen.astype(np.int64), axis=1)
+    return bits @ (1 << np.arange(pool_size, dtype=np.int64))
+
+
+def with_nulls(rng, values):
+    """Replace about half of the values with None, like the random.choice([True, False]) fields"""
+    values = values.astype(object)
+    values[rng.random(len(values)) < 0.5] = None
+    return values
+
+
+def generate_columns(num_employees, start=0, seed=None):
+    """Generate the employee dataset column by column with NumPy
+
+    Returns a dict of equal-length arrays. Categorical fields are drawn as index
+    arrays into the fixed pools, Faker fields are sampled from pre-generated
+    pools, and skills/languages are encoded as bitmasks over their pools.
+    """
+    rng = np.random.default_rng(seed)
+    pools = text_pools()
+    n = num_employees
+    index = np.arange(start, start + n, dtype=np.int64)
+    today = np.datetime64(date.today(), 'D')
+
+    def pick(pool):
+        return pool[rng.integers(0, len(pool), n)]
+
+    columns = {}
+
+    # Personal info
+    columns['first_name'] = pick(pools['first_name'])
+    columns['last_name'] = pick(pools['last_name'])
+    columns['middle_name'] = with_nulls(rng, pick(pools['first_name']))
+    columns['date_of_birth'] = today - rng.integers(22 * 365, 65 * 365 + 1, n).astype('timedelta64[D]')
+    columns['gender'] = pick(GENDERS)
+    columns['nationality'] = pick(pools['country'])
+    columns['marital_status'] = pick(MARITAL_STATUSES)
+    # Same permutation as employee_db.unique_ssn, applied to the whole index range at once
+    ssn = (index * 611953 + 104729) % 729000000
+    columns['social_security_number'] = np.char.add(np.char.add(
+        np.char.add((100 + ssn % 900).astype(str), '-'),
+        np.char.add((10 + ssn // 900 % 90).astype(str), '-')),
+        (1000 + ssn // 81000).astype(str)).astype(object)
+
+    # Contact info
+    number = (index + 1).astype(str)
+    columns['email'] = np.char.add(np.char.add(
+        np.char.add(np.char.lower(columns['first_name'].astype(str)), '.'),
+        np.char.add(np.char.lower(columns['last_name'].astype(str)), number)), '@company.com').astype(object)
+    columns['phone_primary'] = pick(pools['phone'])
+    columns['phone_secondary'] = with_nulls(rng, pick(pools['phone']))
+    columns['address_line1'] = pick(pools['street_address'])
+    columns['address_line2'] = with_nulls(rng, pick(pools['secondary_address']))
+    columns['city'] = pick(pools['city'])
+    columns['state'] = pick(pools['state'])
+    columns['postal_code'] = pick(pools['postcode'])
+    columns['country'] = pick(pools['country'])
+    columns['emergency_contact_name'] = pick(pools['name'])
+    columns['emergency_contact_phone'] = pick(pools['phone'])
+    columns['emergency_contact_relation'] = pick(RELATIONS)
+
+    # Employment info
+    columns['employee_number'] = np.char.add('EMP', np.char.zfill(number, 5)).astype(object)
+    department = rng.integers(0, len(DEPARTMENTS), n)
+    columns['department'] = np.array(DEPARTMENTS, dtype=object)[department]
+    position = POSITION_OFFSETS[department] + (rng.random(n) * POSITION_COUNTS[department]).astype(np.int64)
+    columns['position'] = POSITION_NAMES[position]
+    columns['job_level'] = pick(np.array(JOB_LEVELS, dtype=object))
+    columns['employment_type'] = pick(np.array(EMPLOYMENT_TYPES, dtype=object))
+    hire_offset = rng.integers(0, 3653, n)
+    columns['hire_date'] = today - hire_offset.astype('timedelta64[D]')
+    columns['employment_status'] = EMPLOYMENT_STATUSES[rng.choice(3, n, p=EMPLOYMENT_STATUS_WEIGHTS)]
+    columns['work_location'] = pick(pools['city'])
+    columns['salary'] = np.round(rng.uniform(40000, 200000, n), 2)
+
+    # Employee details
+    education = rng.integers(0, len(EDUCATION_LEVELS), n)
+    columns['education_level'] = np.array(EDUCATION_LEVELS, dtype=object)[education]
+    columns['university'] = pick(pools['university'])
+    columns['degree'] = DEGREES[education * len(DEGREE_FIELDS) + rng.integers(0, len(DEGREE_FIELDS), n)]
+    columns['graduation_year'] = rng.integers(1995, 2024, n)
+    columns['skills'] = sample_masks(rng, n, len(SKILLS_POOL), 3, 8)
+    columns['certification'] = np.where(rng.random(n) < 0.5, rng.integers(0, len(CERTIFICATIONS), n), -1)
+    columns['languages'] = sample_masks(rng, n, len(EXTRA_LANGUAGES), 0, 2)
+    columns['previous_experience_years'] = rng.integers(0, 21, n)
+    columns['performance_rating'] = np.round(rng.uniform(2.5, 5.0, n), 2)
+    promotion_offset = (rng.random(n) * (hire_offset + 1)).astype(np.int64)
+    columns['last_promotion_date'] = with_nulls(rng, today - promotion_offset.astype('timedelta64[D]'))
+    columns['next_review_date'] = today + rng.integers(0, 366, n).astype('timedelta64[D]')
+
+    return columns
+
+
+def columns_to_batch(columns):
+    """Convert a column dict into the per-employee batch format used by EmployeeDatabase"""
+
+    def values(name):
+        column = columns[name]
+        if column.dtype.kind == 'M':
+            return column.astype(object).tolist()
+        return column.tolist()
+
+    skills = [mask_items(mask, tuple(SKILLS_POOL)) for mask in columns['skills'].tolist()]
+    certifications = [[CERTIFICATIONS[i]] if i >= 0 else [] for i in columns['certification'].tolist()]
+    languages = [['English'] + mask_items(mask, tuple(EXTRA_LANGUAGES)) for mask in columns['languages'].tolist()]
+    n = len(columns['employee_number'])
+    none = [None] * n
+    usd = ['USD'] * n
+
+    personal = zip(*(values(name) for name in ('first_name', 'last_name', 'middle_name', 'date_of_birth',
+                                               'gender', 'nationality', 'marital_status',
+                                               'social_security_number')))
+    contact = zip(*(values(name) for name in ('email', 'phone_primary', 'phone_secondary', 'address_line1',
+                                              'address_line2', 'city', 'state', 'postal_code', 'country',
+                                              'emergency_contact_name', 'emergency_contact_phone',
+                                              'emergency_contact_relation')))
+    employment = zip(values('employee_number'), values('department'), values('position'), values('job_level'),
+                     values('employment_type'), values('hire_date'), none, values('employment_status'), none,
+                     values('work_location'), values('salary'), usd)
+    details = zip(values('education_level'), values('university'), values('degree'), values('graduation_year'),
+                  skills, certifications, languages, values('previous_experience_years'), none, none,
+                  values('performance_rating'), values('last_promotion_date'), values('next_review_date'))
+
+    return [{'personal': p, 'contact': c, 'employment': e, 'details': d}
+            for p, c, e, d in zip(personal, contact, employment, details)]
+
+
+def generate_employees_columnar(num_employees, start=0, seed=None):
+    """Drop-in replacement for employee_db.generate_employees backed by generate_columns"""
+    return columns_to_batch(generate_columns(num_employees, start, seed))
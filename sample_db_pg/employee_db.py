@@ -1,11 +1,21 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
+import argparse
+import contextlib
+import functools
+import io
 import random
 import os
 import time
 from datetime import datetime, timedelta
 from faker import Faker
+import threading
 import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+
+from metrics import METRICS, SIZE_BUCKETS, configure as configure_metrics
 
 # Database configuration from environment variables
 DB_CONFIG = {
@@ -16,11 +26,318 @@ DB_CONFIG = {
     'port': os.getenv('POSTGRES_PORT', '5432')
 }
 
+# Number of employees streamed through each COPY FROM STDIN in bulk mode
+COPY_BATCH_SIZE = int(os.getenv('COPY_BATCH_SIZE', '10000'))
+
+# Column order used by the bulk loader, primary and foreign keys first
+EMPLOYEE_COLUMNS = ('employee_id', 'first_name', 'last_name', 'middle_name', 'date_of_birth', 'gender',
+                    'nationality', 'marital_status', 'social_security_number')
+CONTACT_COLUMNS = ('contact_id', 'employee_id', 'email', 'phone_primary', 'phone_secondary', 'address_line1',
+                   'address_line2', 'city', 'state', 'postal_code', 'country', 'emergency_contact_name',
+                   'emergency_contact_phone', 'emergency_contact_relation')
+EMPLOYMENT_COLUMNS = ('employment_id', 'employee_id', 'employee_number', 'department', 'position', 'job_level',
+                      'employment_type', 'hire_date', 'termination_date', 'employment_status', 'manager_id',
+                      'work_location', 'salary', 'currency')
+DETAILS_COLUMNS = ('detail_id', 'employee_id', 'education_level', 'university', 'degree', 'graduation_year',
+                   'skills', 'certifications', 'languages', 'previous_experience_years', 'employee_photo_url',
+                   'notes', 'performance_rating', 'last_promotion_date', 'next_review_date')
+BULK_TABLES = (('employee', EMPLOYEE_COLUMNS), ('contact_info', CONTACT_COLUMNS),
+               ('employment_info', EMPLOYMENT_COLUMNS), ('employee_details', DETAILS_COLUMNS))
+
+# Indexes of the optional "tuned" schema profile, covering the joins, filters and sorts in query.py.
+# Name -> definition; built after the bulk load so COPY does not pay for index maintenance.
+TUNED_INDEXES = {
+    'idx_contact_info_employee_id': "CREATE INDEX IF NOT EXISTS idx_contact_info_employee_id "
+                                    "ON contact_info (employee_id)",
+    'idx_employment_info_employee_id': "CREATE INDEX IF NOT EXISTS idx_employment_info_employee_id "
+                                       "ON employment_info (employee_id)",
+    # Covering for get_department_statistics: the filter, group key and aggregated column in one index
+    'idx_employment_info_status_department': "CREATE INDEX IF NOT EXISTS idx_employment_info_status_department "
+                                             "ON employment_info (employment_status, department) "
+                                             "INCLUDE (employee_id, salary)",
+    'idx_employee_details_employee_id': "CREATE INDEX IF NOT EXISTS idx_employee_details_employee_id "
+                                        "ON employee_details (employee_id) INCLUDE (performance_rating)",
+    # ORDER BY / keyset order of query_employees and the roster export
+    'idx_employee_name': "CREATE INDEX IF NOT EXISTS idx_employee_name "
+                         "ON employee (last_name, first_name, employee_id)",
+    # Recursive org-chart walks (query.ORG_CHART_QUERY / TEAM_SIZE_QUERY) step from manager to reports
+    'idx_employment_info_manager_id': "CREATE INDEX IF NOT EXISTS idx_employment_info_manager_id "
+                                      "ON employment_info (manager_id) INCLUDE (employee_id)",
+}
+
+# Batches buffered between the generator thread and the loader in streaming mode
+QUEUE_DEPTH = int(os.getenv('QUEUE_DEPTH', '2'))
+
+# Last committed batch of each bulk load, written in the same transaction as the batch
+PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS seed_progress (
+    run_key VARCHAR(200) PRIMARY KEY,
+    last_batch INTEGER NOT NULL,
+    employees BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Namespace of the bulk loader's row keys; a rerun derives the same UUIDs from the employee numbers
+KEY_NAMESPACE = uuid.UUID('5d1f6f8e-2b0c-4a57-9a43-7f1e3c2d8b60')
+
 fake = Faker()
 
 
+def unique_ssn(index):
+    """Map an employee index to a distinct XXX-XX-XXXX number (unique for the first 729M indexes)"""
+    n = (index * 611953 + 104729) % 729000000
+    return f"{100 + n % 900}-{10 + n // 900 % 90}-{1000 + n // 81000}"
+
+
+def copy_text(value):
+    """Render a Python value as a field in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (list, tuple)):
+        items = ('"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"' for item in value)
+        value = '{' + ','.join(items) + '}'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def row_key(table, employee_number):
+    """Deterministic UUID of one employee's row in a table"""
+    return uuid.uuid5(KEY_NAMESPACE, f"{table}:{employee_number}")
+
+
+def run_key(num_employees, batch_size, seed, source):
+    """Identifies a bulk load in seed_progress; a resume must use the same settings"""
+    return f"{source}:{num_employees}:{batch_size}:{seed}"
+
+
+def copy_rows(cursor, table, columns, rows):
+    """Stream rows into a table with COPY FROM STDIN, returns the bytes of the payload sent"""
+    # Encoded up front so the size is what goes on the wire, not a character count
+    buffer = io.BytesIO()
+    for row in rows:
+        buffer.write(('\t'.join(map(copy_text, row)) + '\n').encode())
+    size = buffer.tell()
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return size
+
+
+# Value pools the generated employees are drawn from
+DEPARTMENTS = ['Engineering', 'Marketing', 'Sales', 'HR', 'Finance', 'Operations', 'IT', 'Legal',
+               'Customer Service']
+POSITIONS = {
+    'Engineering': ['Software Engineer', 'Senior Software Engineer', 'Lead Engineer', 'Engineering Manager',
+                    'DevOps Engineer'],
+    'Marketing': ['Marketing Specialist', 'Digital Marketing Manager', 'Content Manager', 'Brand Manager',
+                  'Marketing Director'],
+    'Sales': ['Sales Representative', 'Sales Manager', 'Account Executive', 'Sales Director',
+              'Business Development Manager'],
+    'HR': ['HR Specialist', 'HR Manager', 'Recruiter', 'HR Director', 'HR Business Partner'],
+    'Finance': ['Financial Analyst', 'Accountant', 'Finance Manager', 'CFO', 'Budget Analyst'],
+    'Operations': ['Operations Manager', 'Operations Analyst', 'Operations Director', 'Process Manager',
+                   'Quality Analyst'],
+    'IT': ['IT Support Specialist', 'System Administrator', 'IT Manager', 'Network Engineer', 'IT Director'],
+    'Legal': ['Legal Counsel', 'Legal Assistant', 'Compliance Officer', 'Legal Director', 'Contract Manager'],
+    'Customer Service': ['Customer Service Rep', 'Customer Success Manager', 'Support Manager',
+                         'Customer Service Director']
+}
+
+JOB_LEVELS = ['Entry', 'Mid', 'Senior', 'Lead', 'Manager', 'Director', 'VP', 'C-Level']
+EMPLOYMENT_TYPES = ['Full-time', 'Part-time', 'Contract', 'Temporary']
+EDUCATION_LEVELS = ['High School', 'Associate', 'Bachelor', 'Master', 'PhD']
+SKILLS_POOL = ['Python', 'JavaScript', 'SQL', 'Project Management', 'Data Analysis', 'Marketing', 'Sales',
+               'Communication', 'Leadership', 'Excel', 'PowerBI', 'Tableau', 'AWS', 'Azure', 'Docker',
+               'Kubernetes']
+
+
+def generate_employees(num_employees, start=0, seed=None, wrap=None):
+    """Generate sample data for employees start .. start + num_employees - 1
+
+    A seed makes the output reproducible; each call owns its Faker and random
+    instances so shards can be generated independently in worker processes.
+    wrap(instance, prefix), when given, proxies both instances (see profiling.FieldTimer).
+    """
+
+    rng = random.Random(seed)
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+    if wrap is not None:
+        faker, rng = wrap(faker, 'fake'), wrap(rng, 'rng')
+
+    employees_data = []
+
+    for i in range(start, start + num_employees):
+        # Generate personal info
+        first_name = faker.first_name()[:50]  # Limit to 50 chars
+        last_name = faker.last_name()[:50]  # Limit to 50 chars
+        middle_name = faker.first_name()[:50] if rng.choice([True, False]) else None
+        date_of_birth = faker.date_of_birth(minimum_age=22, maximum_age=65)
+        gender = rng.choice(['Male', 'Female', 'Other'])
+        nationality = faker.country()[:50]  # Limit to 50 chars
+        marital_status = rng.choice(['Single', 'Married', 'Divorced', 'Widowed'])
+        # SSN format: XXX-XX-XXXX (11 chars including dashes), derived from the index so it stays unique
+        ssn = unique_ssn(i)
+
+        # Generate contact info
+        email = f"{first_name.lower()}.{last_name.lower()}{i + 1}@company.com"
+        phone_primary = faker.phone_number()[:20]  # Limit to 20 chars
+        phone_secondary = faker.phone_number()[:20] if rng.choice([True, False]) else None
+        address_line1 = faker.street_address()[:200]  # Limit to 200 chars
+        address_line2 = faker.secondary_address()[:200] if rng.choice([True, False]) else None
+        city = faker.city()[:100]  # Limit to 100 chars
+        state = faker.state()[:100]  # Limit to 100 chars
+        postal_code = faker.postcode()[:20]  # Limit to 20 chars
+        country = faker.country()[:100]  # Limit to 100 chars
+        emergency_contact_name = faker.name()[:100]  # Limit to 100 chars
+        emergency_contact_phone = faker.phone_number()[:20]  # Limit to 20 chars
+        emergency_contact_relation = rng.choice(['Spouse', 'Parent', 'Sibling', 'Friend', 'Child'])
+
+        # Generate employment info
+        employee_number = f"EMP{str(i + 1).zfill(5)}"  # Format: EMP00001
+        department = rng.choice(DEPARTMENTS)
+        position = rng.choice(POSITIONS[department])[:100]  # Limit to 100 chars
+        job_level = rng.choice(JOB_LEVELS)
+        employment_type = rng.choice(EMPLOYMENT_TYPES)
+        hire_date = faker.date_between(start_date='-10y', end_date='today')
+        employment_status = rng.choice(
+            ['Active', 'Active', 'Active', 'Active', 'On Leave', 'Inactive'])  # Weighted toward Active
+        work_location = faker.city()[:100]  # Limit to 100 chars
+        salary = round(rng.uniform(40000, 200000), 2)
+
+        # Generate employee details
+        education_level = rng.choice(EDUCATION_LEVELS)
+        university = (faker.company() + " University")[:100]  # Limit to 100 chars
+        degree = f"{education_level} in {rng.choice(['Computer Science', 'Business', 'Engineering', 'Marketing', 'Finance', 'Psychology'])}"[
+                 :100]  # Limit to 100 chars
+        graduation_year = rng.randint(1995, 2023)
+        skills = rng.sample(SKILLS_POOL, rng.randint(3, 8))
+        certifications = [
+            f"{rng.choice(['AWS', 'Microsoft', 'Google', 'Salesforce'])} {rng.choice(['Certified', 'Professional', 'Expert'])}"] if rng.choice(
+            [True, False]) else []
+        languages = ['English'] + rng.sample(['Spanish', 'French', 'German', 'Chinese', 'Japanese'],
+                                             rng.randint(0, 2))
+        previous_experience_years = rng.randint(0, 20)
+        performance_rating = round(rng.uniform(2.5, 5.0), 2)
+        last_promotion_date = faker.date_between(start_date=hire_date, end_date='today') if rng.choice(
+            [True, False]) else None
+        next_review_date = faker.date_between(start_date='today', end_date='+1y')
+
+        employee_data = {
+            'personal': (first_name, last_name, middle_name, date_of_birth, gender, nationality, marital_status,
+                         ssn),
+            'contact': (email, phone_primary, phone_secondary, address_line1, address_line2, city, state,
+                        postal_code, country, emergency_contact_name, emergency_contact_phone,
+                        emergency_contact_relation),
+            'employment': (employee_number, department, position, job_level, employment_type, hire_date, None,
+                           employment_status, None, work_location, salary, 'USD'),
+            'details': (education_level, university, degree, graduation_year, skills, certifications, languages,
+                        previous_experience_years, None, None, performance_rating, last_promotion_date,
+                        next_review_date)
+        }
+
+        employees_data.append(employee_data)
+
+    return employees_data
+
+
+def get_generator(name):
+    """Resolve a --generator name to a function with the generate_employees signature"""
+    if name == 'numpy':
+        # Imported lazily so the default Faker path does not require NumPy
+        from employee_columns import generate_employees_columnar
+        return generate_employees_columnar
+    return generate_employees
+
+
+def iter_sample_batches(num_employees, batch_size=COPY_BATCH_SIZE, seed=None, generator='faker', wrap=None,
+                        first_batch=0):
+    """Lazily generate employees in fixed-size batches, seeded per batch like generate_shards
+
+    Batches before first_batch (already loaded by an interrupted run) are not generated.
+    """
+    generate = get_generator(generator)
+    if wrap is not None and generator == 'faker':
+        generate = functools.partial(generate_employees, wrap=wrap)
+    for batch_id, start in enumerate(range(0, num_employees, batch_size)):
+        if batch_id < first_batch:
+            continue
+        batch_seed = None if seed is None else shard_seed(seed, batch_id)
+        with METRICS.timer('stage', script='employee_db', stage='generate'):
+            batch = generate(min(batch_size, num_employees - start), start, batch_seed)
+        yield batch
+
+
+def prefetch(batches, depth=QUEUE_DEPTH):
+    """Run a batch generator on a background thread, buffering at most depth batches
+
+    The bounded queue provides backpressure: generation blocks while the loader
+    is behind, so memory stays flat whatever the total row count.
+    """
+    queue = Queue(maxsize=depth)
+    done = object()
+
+    def produce():
+        try:
+            for batch in batches:
+                queue.put(batch)
+            queue.put(done)
+        except Exception as e:
+            queue.put(e)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = queue.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def shard_seed(seed, shard_id):
+    """Derive the Faker/random seed of a shard from the run seed and the shard id"""
+    return seed * 1000003 + shard_id
+
+
+def _generate_shard(shard_id, start, num_employees, seed, generator):
+    """Process pool entry point, generates one shard of employees"""
+    return get_generator(generator)(num_employees, start, shard_seed(seed, shard_id))
+
+
+def generate_shards(num_employees, shard_size=COPY_BATCH_SIZE, workers=None, seed=0, generator='faker',
+                    first_shard=0):
+    """Generate employees on a process pool and yield the shards in order as they complete
+
+    At most two shards per worker are in flight, so the consumer (usually the
+    bulk loader) inserts one shard while the pool generates the next ones.
+    """
+    workers = workers or os.cpu_count()
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard_id, start in enumerate(range(0, num_employees, shard_size)):
+            if shard_id < first_shard:
+                continue
+            size = min(shard_size, num_employees - start)
+            pending.append(pool.submit(_generate_shard, shard_id, start, size, seed, generator))
+            if len(pending) >= 2 * workers:
+                yield wait_for_shard(pending.popleft())
+        while pending:
+            yield wait_for_shard(pending.popleft())
+
+
+def wait_for_shard(future):
+    """Result of a shard future; the time the loader waits on generation is recorded"""
+    with METRICS.timer('stage', script='employee_db', stage='generate_wait'):
+        return future.result()
+
+
 class EmployeeDatabase:
-    def __init__(self):
+    def __init__(self, schema=None):
+        # Optional PostgreSQL schema holding this copy of the tables (default: public)
+        self.schema = schema
         self.conn = None
         self.cursor = None
 
@@ -28,15 +345,19 @@ class EmployeeDatabase:
         """Connect to PostgreSQL database with retry logic"""
         max_retries = 30
         retry_count = 0
+        started = time.perf_counter()
 
         while retry_count < max_retries:
             try:
-                self.conn = psycopg2.connect(**DB_CONFIG)
+                options = {'options': f"-c search_path={self.schema},public"} if self.schema else {}
+                self.conn = psycopg2.connect(**DB_CONFIG, **options)
                 self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+                METRICS.observe('connect_wait_seconds', time.perf_counter() - started, script='employee_db')
                 print("Connected to PostgreSQL database successfully!")
                 return True
             except Exception as e:
                 retry_count += 1
+                METRICS.inc('connect_retries_total', script='employee_db')
                 print(f"Connection attempt {retry_count}/{max_retries} failed: {e}")
                 if retry_count < max_retries:
                     print("Retrying in 2 seconds...")
@@ -142,6 +463,8 @@ class EmployeeDatabase:
 
         try:
             # Execute table creation
+            if self.schema:
+                self.cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
             self.cursor.execute(employee_table)
             self.cursor.execute(contact_info_table)
             self.cursor.execute(employment_info_table)
@@ -155,114 +478,73 @@ class EmployeeDatabase:
             print(f"Error creating tables: {e}")
             raise
 
-    def generate_sample_data(self, num_employees=100):
-        """Generate sample data for 100 employees"""
+    def vacuum_analyze(self):
+        """VACUUM (ANALYZE) the sample tables: statistics plus the visibility map index-only scans need
 
-        departments = ['Engineering', 'Marketing', 'Sales', 'HR', 'Finance', 'Operations', 'IT', 'Legal',
-                       'Customer Service']
-        positions = {
-            'Engineering': ['Software Engineer', 'Senior Software Engineer', 'Lead Engineer', 'Engineering Manager',
-                            'DevOps Engineer'],
-            'Marketing': ['Marketing Specialist', 'Digital Marketing Manager', 'Content Manager', 'Brand Manager',
-                          'Marketing Director'],
-            'Sales': ['Sales Representative', 'Sales Manager', 'Account Executive', 'Sales Director',
-                      'Business Development Manager'],
-            'HR': ['HR Specialist', 'HR Manager', 'Recruiter', 'HR Director', 'HR Business Partner'],
-            'Finance': ['Financial Analyst', 'Accountant', 'Finance Manager', 'CFO', 'Budget Analyst'],
-            'Operations': ['Operations Manager', 'Operations Analyst', 'Operations Director', 'Process Manager',
-                           'Quality Analyst'],
-            'IT': ['IT Support Specialist', 'System Administrator', 'IT Manager', 'Network Engineer', 'IT Director'],
-            'Legal': ['Legal Counsel', 'Legal Assistant', 'Compliance Officer', 'Legal Director', 'Contract Manager'],
-            'Customer Service': ['Customer Service Rep', 'Customer Success Manager', 'Support Manager',
-                                 'Customer Service Director']
-        }
+        A fresh COPY load leaves the visibility map empty, so until a VACUUM every
+        index-only scan still fetches each heap row. VACUUM cannot run in a transaction.
+        """
+        self.conn.commit()
+        self.conn.autocommit = True
+        try:
+            self.cursor.execute("VACUUM (ANALYZE) employee, contact_info, employment_info, employee_details")
+        finally:
+            self.conn.autocommit = False
 
-        job_levels = ['Entry', 'Mid', 'Senior', 'Lead', 'Manager', 'Director', 'VP', 'C-Level']
-        employment_types = ['Full-time', 'Part-time', 'Contract', 'Temporary']
-        education_levels = ['High School', 'Associate', 'Bachelor', 'Master', 'PhD']
-        skills_pool = ['Python', 'JavaScript', 'SQL', 'Project Management', 'Data Analysis', 'Marketing', 'Sales',
-                       'Communication', 'Leadership', 'Excel', 'PowerBI', 'Tableau', 'AWS', 'Azure', 'Docker',
-                       'Kubernetes']
-
-        employees_data = []
-
-        for i in range(num_employees):
-            # Generate personal info
-            first_name = fake.first_name()[:50]  # Limit to 50 chars
-            last_name = fake.last_name()[:50]  # Limit to 50 chars
-            middle_name = fake.first_name()[:50] if random.choice([True, False]) else None
-            date_of_birth = fake.date_of_birth(minimum_age=22, maximum_age=65)
-            gender = random.choice(['Male', 'Female', 'Other'])
-            nationality = fake.country()[:50]  # Limit to 50 chars
-            marital_status = random.choice(['Single', 'Married', 'Divorced', 'Widowed'])
-            # Generate a simple SSN format: XXX-XX-XXXX (11 chars including dashes)
-            ssn = f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
-
-            # Generate contact info
-            email = f"{first_name.lower()}.{last_name.lower()}{i + 1}@company.com"
-            phone_primary = fake.phone_number()[:20]  # Limit to 20 chars
-            phone_secondary = fake.phone_number()[:20] if random.choice([True, False]) else None
-            address_line1 = fake.street_address()[:200]  # Limit to 200 chars
-            address_line2 = fake.secondary_address()[:200] if random.choice([True, False]) else None
-            city = fake.city()[:100]  # Limit to 100 chars
-            state = fake.state()[:100]  # Limit to 100 chars
-            postal_code = fake.postcode()[:20]  # Limit to 20 chars
-            country = fake.country()[:100]  # Limit to 100 chars
-            emergency_contact_name = fake.name()[:100]  # Limit to 100 chars
-            emergency_contact_phone = fake.phone_number()[:20]  # Limit to 20 chars
-            emergency_contact_relation = random.choice(['Spouse', 'Parent', 'Sibling', 'Friend', 'Child'])
-
-            # Generate employment info
-            employee_number = f"EMP{str(i + 1).zfill(5)}"  # Format: EMP00001
-            department = random.choice(departments)
-            position = random.choice(positions[department])[:100]  # Limit to 100 chars
-            job_level = random.choice(job_levels)
-            employment_type = random.choice(employment_types)
-            hire_date = fake.date_between(start_date='-10y', end_date='today')
-            employment_status = random.choice(
-                ['Active', 'Active', 'Active', 'Active', 'On Leave', 'Inactive'])  # Weighted toward Active
-            work_location = fake.city()[:100]  # Limit to 100 chars
-            salary = round(random.uniform(40000, 200000), 2)
-
-            # Generate employee details
-            education_level = random.choice(education_levels)
-            university = (fake.company() + " University")[:100]  # Limit to 100 chars
-            degree = f"{education_level} in {random.choice(['Computer Science', 'Business', 'Engineering', 'Marketing', 'Finance', 'Psychology'])}"[
-                     :100]  # Limit to 100 chars
-            graduation_year = random.randint(1995, 2023)
-            skills = random.sample(skills_pool, random.randint(3, 8))
-            certifications = [
-                f"{random.choice(['AWS', 'Microsoft', 'Google', 'Salesforce'])} {random.choice(['Certified', 'Professional', 'Expert'])}"] if random.choice(
-                [True, False]) else []
-            languages = ['English'] + random.sample(['Spanish', 'French', 'German', 'Chinese', 'Japanese'],
-                                                    random.randint(0, 2))
-            previous_experience_years = random.randint(0, 20)
-            performance_rating = round(random.uniform(2.5, 5.0), 2)
-            last_promotion_date = fake.date_between(start_date=hire_date, end_date='today') if random.choice(
-                [True, False]) else None
-            next_review_date = fake.date_between(start_date='today', end_date='+1y')
-
-            employee_data = {
-                'personal': (first_name, last_name, middle_name, date_of_birth, gender, nationality, marital_status,
-                             ssn),
-                'contact': (email, phone_primary, phone_secondary, address_line1, address_line2, city, state,
-                            postal_code, country, emergency_contact_name, emergency_contact_phone,
-                            emergency_contact_relation),
-                'employment': (employee_number, department, position, job_level, employment_type, hire_date, None,
-                               employment_status, None, work_location, salary, 'USD'),
-                'details': (education_level, university, degree, graduation_year, skills, certifications, languages,
-                            previous_experience_years, None, None, performance_rating, last_promotion_date,
-                            next_review_date)
-            }
-
-            employees_data.append(employee_data)
-
-        return employees_data
+    def create_indexes(self):
+        """Build the tuned schema profile indexes and refresh planner statistics"""
+        try:
+            for name, statement in TUNED_INDEXES.items():
+                started = time.perf_counter()
+                self.cursor.execute(statement)
+                print(f"  {name} built in {time.perf_counter() - started:.2f}s")
+            self.conn.commit()
+            self.vacuum_analyze()
+            print("Tuned indexes created successfully!")
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error creating indexes: {e}")
+            raise
+
+    def drop_indexes(self):
+        """Drop the tuned schema profile indexes"""
+        try:
+            for name in TUNED_INDEXES:
+                self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            self.conn.commit()
+            self.vacuum_analyze()
+            print("Tuned indexes dropped successfully!")
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error dropping indexes: {e}")
+            raise
+
+    def drop_tables(self):
+        """Drop the four sample tables and their data"""
+        try:
+            # Qualified, so a tenant schema that does not exist yet never falls through to public
+            prefix = f"{self.schema}." if self.schema else ""
+            if self.schema:
+                self.cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {self.schema}")
+            tables = ('employee_details', 'employment_info', 'contact_info', 'employee', 'seed_progress')
+            self.cursor.execute(f"DROP TABLE IF EXISTS {', '.join(prefix + table for table in tables)} CASCADE")
+            self.conn.commit()
+            print("All tables dropped successfully!")
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error dropping tables: {e}")
+            raise
+
+    def generate_sample_data(self, num_employees=100, start=0, seed=None, wrap=None):
+        """Generate sample data for 100 employees"""
+        with METRICS.timer('stage', script='employee_db', stage='generate'):
+            return generate_employees(num_employees, start, seed, wrap)
 
     def insert_sample_data(self, employees_data):
         """Insert generated sample data into tables"""
 
         try:
+            started = time.perf_counter()
             for employee_data in employees_data:
                 # Insert personal info
                 personal_query = """
@@ -293,8 +575,12 @@ class EmployeeDatabase:
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
                 """
                 self.cursor.execute(details_query, (employee_id,) + employee_data['details'])
+            METRICS.observe('stage_seconds', time.perf_counter() - started, script='employee_db', stage='insert')
 
-            self.conn.commit()
+            with METRICS.timer('stage', script='employee_db', stage='commit'):
+                self.conn.commit()
+            for table, _ in BULK_TABLES:
+                METRICS.inc('rows_total', len(employees_data), script='employee_db', table=table)
             print(f"Successfully inserted {len(employees_data)} employees into the database!")
 
         except Exception as e:
@@ -302,10 +588,176 @@ class EmployeeDatabase:
             print(f"Error inserting sample data: {e}")
             raise
 
+    def copy_batch(self, batch, elapsed, sent=None, upsert=False):
+        """COPY one batch of employees into the four tables, adding per-table seconds to elapsed
+        and, when given, per-table COPY payload bytes to sent
+
+        Keys are derived from the employee numbers, so with upsert a batch that is partly
+        loaded already goes through a staging table and INSERT ... ON CONFLICT DO NOTHING.
+        """
+
+        numbers = [employee_data['employment'][0] for employee_data in batch]
+        employee_ids = [row_key('employee', number) for number in numbers]
+        rows = {
+            'employee': [(employee_id,) + employee_data['personal']
+                         for employee_id, employee_data in zip(employee_ids, batch)],
+            'contact_info': [(row_key('contact_info', number), employee_id) + employee_data['contact']
+                             for number, employee_id, employee_data in zip(numbers, employee_ids, batch)],
+            'employment_info': [(row_key('employment_info', number), employee_id) + employee_data['employment']
+                                for number, employee_id, employee_data in zip(numbers, employee_ids, batch)],
+            'employee_details': [(row_key('employee_details', number), employee_id) + employee_data['details']
+                                 for number, employee_id, employee_data in zip(numbers, employee_ids, batch)],
+        }
+
+        # Parent table first so the foreign keys of the other three resolve
+        for table, columns in BULK_TABLES:
+            started = time.perf_counter()
+            if upsert:
+                size = self.upsert_rows(table, columns, rows[table])
+            else:
+                size = copy_rows(self.cursor, table, columns, rows[table])
+            seconds = time.perf_counter() - started
+            elapsed[table] += seconds
+            METRICS.observe('copy_seconds', seconds, script='employee_db', table=table)
+            METRICS.inc('copy_bytes_total', size, script='employee_db', table=table)
+            if sent is not None:
+                sent[table] += size
+
+    def upsert_rows(self, table, columns, rows):
+        """COPY rows into a session staging table and insert the ones not loaded yet"""
+        staging = f"staging_{table}"
+        self.cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) "
+                            f"ON COMMIT DELETE ROWS")
+        size = copy_rows(self.cursor, staging, columns, rows)
+        names = ', '.join(columns)
+        self.cursor.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM {staging} ON CONFLICT DO NOTHING")
+        return size
+
+    def load_progress(self, key):
+        """(next batch, employees committed) recorded for a bulk load, (0, 0) if it never committed a batch"""
+        try:
+            self.cursor.execute(PROGRESS_TABLE)
+            self.cursor.execute("SELECT last_batch, employees FROM seed_progress WHERE run_key = %s", (key,))
+            row = self.cursor.fetchone()
+            self.conn.commit()
+            return (row['last_batch'] + 1, row['employees']) if row else (0, 0)
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error reading seed progress: {e}")
+            raise
+
+    def reset_progress(self, key):
+        """Forget the recorded progress of a bulk load that is started from scratch"""
+        try:
+            self.cursor.execute(PROGRESS_TABLE)
+            self.cursor.execute("DELETE FROM seed_progress WHERE run_key = %s", (key,))
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"Error resetting seed progress: {e}")
+            raise
+
+    def save_progress(self, key, batch_id, employees):
+        """Record a batch as loaded; called inside the batch's transaction"""
+        self.cursor.execute("""
+            INSERT INTO seed_progress (run_key, last_batch, employees) VALUES (%s, %s, %s)
+            ON CONFLICT (run_key) DO UPDATE
+            SET last_batch = EXCLUDED.last_batch, employees = EXCLUDED.employees, updated_at = CURRENT_TIMESTAMP
+        """, (key, batch_id, employees))
+
+    def load_batches(self, batches, progress_key=None, first_batch=0, committed=0):
+        """Bulk load an iterable of employee batches, committing after each batch
+
+        With a progress_key each commit also records the batch in seed_progress, so a
+        rerun can pass first_batch/committed from load_progress and skip what is loaded.
+        Resumed loads upsert, in case the rows of a batch are present without its record.
+        """
+
+        elapsed = dict.fromkeys((table for table, _ in BULK_TABLES), 0.0)
+        sent = dict.fromkeys(elapsed, 0)
+        total = 0
+        upsert = first_batch > 0
+
+        for batch_id, batch in enumerate(batches, first_batch):
+            try:
+                with METRICS.timer('stage', script='employee_db', stage='insert'):
+                    self.copy_batch(batch, elapsed, sent, upsert)
+                    if progress_key:
+                        self.save_progress(progress_key, batch_id, committed + total + len(batch))
+                with METRICS.timer('stage', script='employee_db', stage='commit'):
+                    self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Error bulk inserting sample data ({committed + total} employees already committed): {e}")
+                raise
+            total += len(batch)
+            METRICS.observe('batch_rows', len(batch), SIZE_BUCKETS, script='employee_db')
+            for table in elapsed:
+                METRICS.inc('rows_total', len(batch), script='employee_db', table=table)
+            print(f"Committed batch {batch_id} of {len(batch)} employees ({committed + total} total)")
+
+        print(f"Successfully bulk inserted {total} employees into the database!")
+        for table, seconds in elapsed.items():
+            rate = total / seconds if seconds else 0.0
+            METRICS.set('rows_per_second', round(rate, 1), script='employee_db', table=table)
+            throughput = sent[table] / seconds / 2 ** 20 if seconds else 0.0
+            print(f"  {table}: {total} rows, {sent[table] / 2 ** 20:,.1f} MB in {seconds:.2f}s "
+                  f"({rate:,.0f} rows/sec, {throughput:,.1f} MB/sec)")
+        seconds = sum(elapsed.values())
+        if seconds:
+            print(f"  all tables: {sum(sent.values()) / 2 ** 20 / seconds:,.1f} MB/sec")
+        return total
+
+    def bulk_insert_sample_data(self, employees_data, batch_size=COPY_BATCH_SIZE):
+        """Insert generated sample data with COPY FROM STDIN, using client-side UUIDs"""
+        batches = (employees_data[start:start + batch_size] for start in range(0, len(employees_data), batch_size))
+        return self.load_batches(batches)
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Create and seed the employee_db sample database")
+    parser.add_argument('--employees', type=int, default=100, help="number of employees to generate")
+    parser.add_argument('--bulk', action='store_true',
+                        help="stream batches through COPY FROM STDIN instead of row inserts, committing per batch")
+    parser.add_argument('--batch-size', type=int, default=COPY_BATCH_SIZE,
+                        help="employees per generated batch/shard in bulk mode")
+    parser.add_argument('--queue-depth', type=int, default=QUEUE_DEPTH,
+                        help="generated batches buffered ahead of the loader in bulk mode")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="generate shards on this many processes and bulk load them as they arrive")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible data generation")
+    parser.add_argument('--generator', choices=['faker', 'numpy'], default='faker',
+                        help="per-row Faker generator or vectorized NumPy column generator (bulk modes)")
+    parser.add_argument('--schema-profile', choices=['default', 'tuned'], default='default',
+                        help="'tuned' adds the join/filter indexes used by query.py, built after the load")
+    parser.add_argument('--with-stats-cache', action='store_true',
+                        help="install the trigger-maintained department_stats table after the load")
+    parser.add_argument('--cache-dir', nargs='?', const=os.getenv('DATASET_CACHE_DIR', ''), default=None,
+                        help="load a seeded numpy snapshot from this cache directory, generating it on the first run")
+    parser.add_argument('--payload-profile', choices=['default', 'wide', 'heavy'], default='default',
+                        help="fill employee_details notes, photo url and arrays with large values "
+                             "(wide: 1-16KB notes, 20-100 items; heavy: 1KB-1MB notes, 100 items)")
+    parser.add_argument('--notes-bytes', help="override the notes size range as MIN:MAX bytes (log-uniform)")
+    parser.add_argument('--array-items', help="override the skills/certifications/languages length as MIN:MAX "
+                             "(MAX up to payload_profile.ITEM_POOL_SIZE)")
+    parser.add_argument('--with-hierarchy', action='store_true',
+                        help="generate a per-department manager hierarchy after the load (see org_hierarchy.py)")
+    parser.add_argument('--profile', choices=['cprofile', 'sample'],
+                        help="profile the generate/insert stages (cProfile stats or folded stacks for flamegraphs) "
+                             "and report the generator cost per Faker/random field")
+    parser.add_argument('--profile-dir', default='profile', help="directory for .prof, .folded and fields.json")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted bulk load with the same options after its last committed "
+                             "batch (implies --bulk without --workers/--cache-dir)")
+    return parser.parse_args()
+
 
 def main():
     """Main function to run the employee database system"""
 
+    args = parse_args()
+    configure_metrics()
     print("Starting Employee Database System...")
     print(f"Connecting to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
 
@@ -320,13 +772,91 @@ def main():
         print("Creating database tables...")
         db.create_tables()
 
-        # Generate sample data
-        print("Generating sample data for 100 employees...")
-        employees_data = db.generate_sample_data(100)
-
-        # Insert sample data
-        print("Inserting sample data...")
-        db.insert_sample_data(employees_data)
+        payload = None
+        if args.payload_profile != 'default' or args.notes_bytes or args.array_items:
+            from payload_profile import parse_range, resolve_profile, with_payload
+            payload = resolve_profile(args.payload_profile,
+                                      parse_range(args.notes_bytes) if args.notes_bytes else None,
+                                      parse_range(args.array_items) if args.array_items else None)
+
+        # Bulk loads record each committed batch; --resume starts after the last one
+        source = 'cache' if args.cache_dir is not None else args.generator
+        progress_key = run_key(args.employees, args.batch_size, args.seed, source)
+        first_batch, committed = 0, 0
+        if args.resume:
+            first_batch, committed = db.load_progress(progress_key)
+            print(f"Resuming at batch {first_batch} ({committed} employees already committed)")
+        elif args.cache_dir is not None or args.workers or args.bulk:
+            db.reset_progress(progress_key)
+
+        def heavy(batches):
+            # Applied on the generating side of the queue so the loader only waits on COPY
+            return batches if payload is None else with_payload(batches, payload, args.seed, first_batch)
+
+        def load(batches):
+            return db.load_batches(batches, progress_key, first_batch, committed)
+
+        profiler = None
+        if args.profile:
+            from profiling import Profiler
+            profiler = Profiler(args.profile, args.profile_dir)
+        wrap = profiler.fields.wrap if profiler else None
+
+        def stage(name):
+            return profiler.stage(name) if profiler else contextlib.nullcontext()
+
+        if args.cache_dir is not None:
+            # Seeded snapshot: repeat runs skip generation and stream the cached columns
+            from dataset_cache import DATASET_CACHE_DIR, cached_batches
+            print(f"Loading {args.employees} employees from the dataset cache...")
+            with stage('load'):
+                load(prefetch(heavy(cached_batches(args.employees, args.batch_size, args.seed or 0,
+                                                   args.cache_dir or DATASET_CACHE_DIR, first_batch)),
+                              args.queue_depth))
+        elif args.workers:
+            # Sharded generation overlapped with bulk insertion
+            print(f"Generating and loading {args.employees} employees on {args.workers} workers...")
+            shards = generate_shards(args.employees, args.batch_size, args.workers, args.seed or 0, args.generator,
+                                     first_batch)
+            with stage('load'):
+                load(shards if payload is None else prefetch(heavy(shards), args.queue_depth))
+        elif args.bulk or args.resume:
+            # Bounded-memory pipeline: a generator thread feeds the loader through a small queue
+            print(f"Streaming {args.employees} employees in batches of {args.batch_size}...")
+            batches = heavy(iter_sample_batches(args.employees, args.batch_size, args.seed, args.generator, wrap,
+                                                first_batch))
+            with stage('load'):
+                # Profiled runs generate inline so the profiler sees generation next to COPY
+                load(batches if profiler else prefetch(batches, args.queue_depth))
+        else:
+            # Generate sample data
+            print(f"Generating sample data for {args.employees} employees...")
+            with stage('generate'):
+                employees_data = db.generate_sample_data(args.employees, seed=args.seed, wrap=wrap)
+            if payload is not None:
+                employees_data = next(heavy([employees_data]))
+
+            # Insert sample data
+            print("Inserting sample data...")
+            with stage('insert'):
+                db.insert_sample_data(employees_data)
+
+        if profiler:
+            profiler.report()
+
+        if args.with_hierarchy:
+            # Resolved in one UPDATE once every employee has its UUID
+            from org_hierarchy import assign_managers
+            assign_managers(db, args.seed or 0)
+
+        if args.schema_profile == 'tuned':
+            print("Building tuned schema indexes...")
+            db.create_indexes()
+
+        if args.with_stats_cache:
+            # Installed after the load so COPY does not fire the per-row triggers
+            from department_stats import install
+            install(db)
         print("\nEmployee database setup completed successfully!")
 
     except Exception as e:
@@ -0,0 +1,95 @@
+import argparse
+import json
+from statistics import median
+
+from employee_db import DB_CONFIG, EmployeeDatabase
+from query import EMPLOYEES_QUERY, DEPARTMENT_STATS_QUERY, EXPORT_QUERY
+
+# The query.py workload measured with and without the tuned schema profile
+REPORT_QUERIES = {
+    'query_employees': (EMPLOYEES_QUERY, (10,)),
+    'department_statistics': (DEPARTMENT_STATS_QUERY, None),
+    'export_first_page': (EXPORT_QUERY.format(keyset=''), (10000,)),
+}
+
+
+def plan_nodes(plan):
+    """Flatten an EXPLAIN JSON plan into 'Node Type [on index]' strings, depth first"""
+    node = plan['Node Type']
+    if 'Index Name' in plan:
+        node += f" [{plan['Index Name']}]"
+    nodes = [node]
+    for child in plan.get('Plans', []):
+        nodes += plan_nodes(child)
+    return nodes
+
+
+def explain(cursor, query, params, runs):
+    """Run EXPLAIN ANALYZE runs times, returns the median execution time (ms) and the last plan"""
+    times = []
+    plan = None
+    for _ in range(runs):
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query.strip().rstrip(';'), params)
+        plan = cursor.fetchone()['QUERY PLAN'][0]
+        times.append(plan['Execution Time'])
+    return median(times), plan
+
+
+def measure(db, runs):
+    """Time every report query, returns {name: {'ms': ..., 'nodes': [...]}}"""
+    results = {}
+    for name, (query, params) in REPORT_QUERIES.items():
+        ms, plan = explain(db.cursor, query, params, runs)
+        db.conn.rollback()
+        results[name] = {'ms': ms, 'nodes': plan_nodes(plan['Plan'])}
+    return results
+
+
+def print_report(employees, before, after):
+    """Display the before/after timings and plan shapes side by side"""
+    print(f"\n--- EXPLAIN ANALYZE: default vs tuned schema ({employees:,} employees) ---")
+    print(f"{'query':<24}{'default ms':>14}{'tuned ms':>14}{'speedup':>10}")
+    for name in REPORT_QUERIES:
+        speedup = before[name]['ms'] / after[name]['ms'] if after[name]['ms'] else 0.0
+        print(f"{name:<24}{before[name]['ms']:>14.2f}{after[name]['ms']:>14.2f}{speedup:>9.1f}x")
+    for name in REPORT_QUERIES:
+        print(f"\n{name}")
+        print(f"  default: {' -> '.join(before[name]['nodes'])}")
+        print(f"  tuned:   {' -> '.join(after[name]['nodes'])}")
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Compare query.py plans and timings with and without tuned indexes")
+    parser.add_argument('--runs', type=int, default=5, help="EXPLAIN ANALYZE runs per query, median is reported")
+    parser.add_argument('--drop-after', action='store_true', help="leave the database without the tuned indexes")
+    parser.add_argument('--output', help="optional JSON file for the raw results")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"Connecting to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        db.cursor.execute("SELECT COUNT(*) AS employees FROM employee")
+        employees = db.cursor.fetchone()['employees']
+
+        db.drop_indexes()
+        before = measure(db, args.runs)
+        db.create_indexes()
+        after = measure(db, args.runs)
+        print_report(employees, before, after)
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'employees': employees, 'default': before, 'tuned': after}, f, indent=2)
+        if args.drop_after:
+            db.drop_indexes()
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        db.disconnect()
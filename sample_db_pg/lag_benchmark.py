@@ -0,0 +1,173 @@
+import argparse
+import csv
+import math
+import threading
+import time
+
+from employee_db import DB_CONFIG, EmployeeDatabase
+from redis_target import REDIS_CONFIG, connect_redis, rdi_key
+
+# Dedicated heartbeat table; add it to the RDI pipeline's table list before running
+HEARTBEAT_TABLE = """
+CREATE TABLE IF NOT EXISTS rdi_heartbeat (
+    id BIGSERIAL PRIMARY KEY,
+    written_at_ns BIGINT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def summarize(lags_ms):
+    """p50/p95/p99/max of a list of lag samples in milliseconds"""
+    lags_ms = sorted(lags_ms)
+    return {
+        'count': len(lags_ms),
+        'p50': percentile(lags_ms, 50),
+        'p95': percentile(lags_ms, 95),
+        'p99': percentile(lags_ms, 99),
+        'max': lags_ms[-1] if lags_ms else 0.0,
+    }
+
+
+def format_summary(stats):
+    """One-line rendering of a summarize() result"""
+    return (f"n={stats['count']} p50={stats['p50']:.1f}ms p95={stats['p95']:.1f}ms "
+            f"p99={stats['p99']:.1f}ms max={stats['max']:.1f}ms")
+
+
+class LagBenchmark:
+    """Stamp heartbeat rows in Postgres and time how long they take to appear in Redis"""
+
+    def __init__(self, db, redis_client, rate=10, poll_interval=0.01, timeout=60):
+        self.db = db
+        self.redis = redis_client
+        self.rate = rate
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.samples = []
+        self.lost = 0
+        self.writing = False
+
+    def setup(self):
+        """Create the heartbeat table"""
+        self.db.cursor.execute(HEARTBEAT_TABLE)
+        self.db.conn.commit()
+
+    def write(self, duration):
+        """Insert one stamped heartbeat row per 1/rate seconds for duration seconds"""
+        interval = 1.0 / self.rate
+        started = time.perf_counter()
+        next_write = started
+        self.writing = True
+        try:
+            while time.perf_counter() - started < duration:
+                written_at_ns = time.time_ns()
+                self.db.cursor.execute("INSERT INTO rdi_heartbeat (written_at_ns) VALUES (%s) RETURNING id",
+                                       (written_at_ns,))
+                heartbeat_id = self.db.cursor.fetchone()['id']
+                self.db.conn.commit()
+                with self.lock:
+                    self.pending[rdi_key('rdi_heartbeat', ('id', heartbeat_id))] = written_at_ns
+                next_write += interval
+                delay = next_write - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            self.writing = False
+
+    def watch(self, report_every):
+        """Poll Redis for pending heartbeat keys until the writer is done and nothing is pending"""
+        window = []
+        last_report = time.perf_counter()
+        while self.writing or self.pending:
+            with self.lock:
+                keys = list(self.pending.items())
+            if keys:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, _ in keys:
+                    pipe.exists(key)
+                found = pipe.execute()
+                seen_at_ns = time.time_ns()
+                with self.lock:
+                    for (key, written_at_ns), exists in zip(keys, found):
+                        if exists:
+                            lag_ms = (seen_at_ns - written_at_ns) / 1e6
+                            self.samples.append((written_at_ns, lag_ms))
+                            window.append(lag_ms)
+                            del self.pending[key]
+                        elif seen_at_ns - written_at_ns > self.timeout * 1e9:
+                            self.lost += 1
+                            del self.pending[key]
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                print(f"[{time.strftime('%H:%M:%S')}] lag {format_summary(summarize(window))}, "
+                      f"pending={len(self.pending)} lost={self.lost}")
+                window = []
+                last_report = now
+            time.sleep(self.poll_interval)
+
+    def run(self, duration, report_every=10):
+        """Write and watch concurrently, then print the overall lag distribution"""
+        self.writing = True
+        watcher = threading.Thread(target=self.watch, args=(report_every,), daemon=True)
+        watcher.start()
+        self.write(duration)
+        watcher.join()
+        print(f"\n--- Replication Lag ({duration:.0f}s at {self.rate}/s) ---")
+        print(f"{format_summary(summarize([lag for _, lag in self.samples]))}, lost={self.lost}")
+
+    def write_csv(self, path):
+        """Write every sample as written_at_ns,lag_ms"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['written_at_ns', 'lag_ms'])
+            writer.writerows(self.samples)
+        print(f"Wrote {len(self.samples)} samples to {path}")
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Measure Postgres -> Redis replication lag through RDI")
+    parser.add_argument('--rate', type=float, default=10, help="heartbeat rows written per second")
+    parser.add_argument('--duration', type=float, default=60, help="seconds to write heartbeats for")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds before a heartbeat counts as lost")
+    parser.add_argument('--poll-interval', type=float, default=0.01, help="seconds between Redis polls")
+    parser.add_argument('--report-every', type=float, default=10, help="seconds between windowed reports")
+    parser.add_argument('--redis-host', default=REDIS_CONFIG['host'], help="target Redis host")
+    parser.add_argument('--redis-port', type=int, default=REDIS_CONFIG['port'], help="target Redis port")
+    parser.add_argument('--output', help="optional CSV file for the raw samples")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"Source {DB_CONFIG['host']}:{DB_CONFIG['port']}, target Redis {args.redis_host}:{args.redis_port}")
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        benchmark = LagBenchmark(db, connect_redis(host=args.redis_host, port=args.redis_port), args.rate,
+                                 args.poll_interval, args.timeout)
+        benchmark.setup()
+        benchmark.run(args.duration, args.report_every)
+        if args.output:
+            benchmark.write_csv(args.output)
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        db.disconnect()
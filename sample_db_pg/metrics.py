@@ -0,0 +1,176 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram buckets: latencies in seconds and batch sizes in rows
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 10, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+# Where configure() exports by default; all optional
+METRICS_PORT = os.getenv('METRICS_PORT')
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE')
+METRICS_JSON = os.getenv('METRICS_JSON')
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (inf past the last bucket)"""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return 0.0
+
+
+def label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and histograms keyed by name and labels"""
+
+    def __init__(self, prefix='rdi_sample'):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.started = time.time()
+
+    def key(self, name, labels):
+        return f"{self.prefix}_{name}", tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[self.key(name, labels)] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = self.key(name, labels)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(buckets)
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the with-block into the <name>_seconds histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - started, **labels)
+
+    def prometheus_text(self):
+        """Render everything in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            for kind, values in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted({name for name, _ in values}):
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines += [f"{name}{label_text(labels)} {value}"
+                              for (metric, labels), value in sorted(values.items()) if metric == name]
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{label_text(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{label_text(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{label_text(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """JSON-friendly summary: counters, gauges and count/sum/mean/p50/p95/p99 per histogram"""
+        def name_of(key):
+            metric, labels = key
+            return metric + label_text(labels)
+
+        with self.lock:
+            return {
+                'started_at': self.started,
+                'elapsed_seconds': round(time.time() - self.started, 3),
+                'counters': {name_of(key): value for key, value in sorted(self.counters.items())},
+                'gauges': {name_of(key): value for key, value in sorted(self.gauges.items())},
+                'histograms': {name_of(key): {
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'mean': round(histogram.sum / histogram.count, 6) if histogram.count else 0.0,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                } for key, histogram in sorted(self.histograms.items())},
+            }
+
+    def write_textfile(self, path):
+        """Atomically write the Prometheus text (node_exporter textfile collector compatible)"""
+        with open(f"{path}.tmp", 'w') as f:
+            f.write(self.prometheus_text())
+        os.replace(f"{path}.tmp", path)
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def serve(self, port, host='0.0.0.0'):
+        """Serve /metrics on a daemon thread, returns the server"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, int(port)), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+        return server
+
+
+METRICS = Metrics()
+
+
+def configure(port=METRICS_PORT, textfile=METRICS_TEXTFILE, json_path=METRICS_JSON):
+    """Start the HTTP endpoint and/or register the exit-time file exports that are configured"""
+    if port:
+        METRICS.serve(port)
+    if textfile:
+        atexit.register(METRICS.write_textfile, textfile)
+    if json_path:
+        atexit.register(METRICS.write_json, json_path)
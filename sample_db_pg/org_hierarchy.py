@@ -0,0 +1,120 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from employee_db import DB_CONFIG, JOB_LEVELS, EmployeeDatabase, copy_rows
+
+# Direct reports per manager are Poisson(SPAN_MEAN) clipped to 1..SPAN_MAX
+SPAN_MEAN = float(os.getenv('SPAN_MEAN', '6'))
+SPAN_MAX = int(os.getenv('SPAN_MAX', '15'))
+
+ORG_EDGES_TABLE = """
+CREATE TEMP TABLE org_edges (
+    employee_number VARCHAR(20) PRIMARY KEY,
+    manager_number VARCHAR(20) NOT NULL
+) ON COMMIT DROP
+"""
+
+# One set-based statement instead of a round trip per employee
+RESOLVE_MANAGERS = """
+UPDATE employment_info e
+SET manager_id = m.employee_id
+FROM org_edges o
+JOIN employment_info m ON m.employee_number = o.manager_number
+WHERE e.employee_number = o.employee_number
+"""
+
+
+# Seniority of each job level, higher manages lower
+LEVEL_RANK = {level: rank for rank, level in enumerate(JOB_LEVELS)}
+
+
+def manager_positions(n, rng, span_mean=SPAN_MEAN, span_max=SPAN_MAX):
+    """Parent position of every member 1..n-1 of a breadth-first org tree (position 0 is the head)
+
+    Member j manages positions starts[j] .. starts[j] + spans[j] - 1, which is exactly
+    what filling a queue of managers with their reports in order would produce.
+    """
+    if n < 2:
+        return np.zeros(0, dtype=np.int64)
+    spans = np.clip(rng.poisson(span_mean, n), 1, span_max)
+    starts = 1 + np.concatenate(([0], np.cumsum(spans)[:-1]))
+    return np.searchsorted(starts, np.arange(1, n), side='right') - 1
+
+
+def department_edges(numbers, levels, rng, span_mean=SPAN_MEAN, span_max=SPAN_MAX):
+    """(employee_number, manager_number) pairs for one department's members
+
+    Members are shuffled and then stably sorted by job level, most senior first. Managers
+    sit at earlier breadth-first positions than their reports, so nobody reports to a
+    more junior level; ties within a level are broken at random.
+    """
+    order = rng.permutation(len(numbers))
+    rank = np.array([LEVEL_RANK.get(level, -1) for level in levels])[order]
+    members = np.array(numbers, dtype=object)[order[np.argsort(-rank, kind='stable')]]
+    parents = manager_positions(len(members), rng, span_mean, span_max)
+    return zip(members[1:].tolist(), members[parents].tolist())
+
+
+def assign_managers(db, seed=0, span_mean=SPAN_MEAN, span_max=SPAN_MAX):
+    """Build a per-department org tree over the loaded employees and write every manager_id at once
+
+    Members are read in employee_number order so a seed gives the same tree for the
+    same data, and ordered by job_level within a department so seniors manage juniors.
+    The edges are COPYed into a temporary table and resolved to UUIDs by a single
+    UPDATE ... FROM join; department heads keep manager_id NULL.
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    try:
+        departments = {}
+        with db.conn.cursor(name='org_members') as cursor:
+            cursor.itersize = 50000
+            cursor.execute("SELECT employee_number, department, job_level FROM employment_info "
+                           "ORDER BY employee_number")
+            for employee_number, department, job_level in cursor:
+                numbers, levels = departments.setdefault(department, ([], []))
+                numbers.append(employee_number)
+                levels.append(job_level)
+
+        db.cursor.execute("UPDATE employment_info SET manager_id = NULL WHERE manager_id IS NOT NULL")
+        db.cursor.execute(ORG_EDGES_TABLE)
+        edges = 0
+        for department in sorted(departments):
+            numbers, levels = departments[department]
+            pairs = list(department_edges(numbers, levels, rng, span_mean, span_max))
+            copy_rows(db.cursor, 'org_edges', ('employee_number', 'manager_number'), pairs)
+            edges += len(pairs)
+        db.cursor.execute("ANALYZE org_edges")
+        db.cursor.execute(RESOLVE_MANAGERS)
+        resolved = db.cursor.rowcount
+        db.conn.commit()
+        print(f"Assigned managers to {resolved}/{edges} employees in {len(departments)} departments "
+              f"in {time.perf_counter() - started:.1f}s")
+        return resolved
+    except Exception as e:
+        db.conn.rollback()
+        print(f"Error assigning managers: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the manager hierarchy of the loaded employees")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the org tree shape")
+    parser.add_argument('--span-mean', type=float, default=SPAN_MEAN, help="mean direct reports per manager")
+    parser.add_argument('--span-max', type=int, default=SPAN_MAX, help="maximum direct reports per manager")
+    args = parser.parse_args()
+
+    print(f"Connecting to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        assign_managers(db, args.seed, args.span_mean, args.span_max)
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        db.disconnect()
@@ -0,0 +1,109 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from faker import Faker
+
+# Size distributions for the heavy employee_details columns. notes_bytes is a (min, max) range
+# drawn log-uniformly, array_items a (min, max) length range for skills/certifications/languages,
+# and notes/photo the fraction of rows that get a value at all.
+PAYLOAD_PROFILES = {
+    'default': None,
+    'wide': {'notes_bytes': (1024, 16 * 1024), 'notes': 1.0, 'array_items': (20, 100), 'photo': 1.0},
+    'heavy': {'notes_bytes': (1024, 1024 * 1024), 'notes': 1.0, 'array_items': (100, 100), 'photo': 1.0},
+}
+
+# Details tuple positions (DETAILS_COLUMNS without detail_id and employee_id)
+SKILLS, CERTIFICATIONS, LANGUAGES, PHOTO_URL, NOTES = 4, 5, 6, 8, 9
+
+VOCABULARY_SIZE = 5000
+ITEM_POOL_SIZE = 2000
+PAYLOAD_POOL_SEED = 0
+PHOTO_URL_BASE = os.getenv('PHOTO_URL_BASE', 'https://cdn.example.com/employees/photos')
+
+
+@lru_cache(maxsize=None)
+def text_block(size):
+    """At least size characters of single-line word salad to slice notes out of
+
+    Built from a fixed Faker vocabulary in random order, so TOAST compression sees
+    text-like rather than repetitive data. Generated once per process.
+    """
+    faker = Faker()
+    faker.seed_instance(PAYLOAD_POOL_SEED)
+    vocabulary = np.array(faker.words(VOCABULARY_SIZE), dtype=object)
+    rng = np.random.default_rng(PAYLOAD_POOL_SEED)
+    words = vocabulary[rng.integers(0, len(vocabulary), size // 4 + 1)]
+    block = ' '.join(words.tolist())
+    while len(block) < size:
+        block += ' ' + block
+    return block
+
+
+@lru_cache(maxsize=None)
+def item_pool():
+    """Array element pool, doubled so any window of up to ITEM_POOL_SIZE items is one slice"""
+    faker = Faker()
+    faker.seed_instance(PAYLOAD_POOL_SEED)
+    items = [faker.catch_phrase()[:100] for _ in range(ITEM_POOL_SIZE)]
+    return items + items
+
+
+def parse_range(value):
+    """'1024:1048576' or '100' -> (min, max)"""
+    low, _, high = value.partition(':')
+    return int(low), int(high or low)
+
+
+def resolve_profile(name, notes_bytes=None, array_items=None):
+    """Profile dict for a name, with optional (min, max) overrides, or None for the default payload"""
+    profile = PAYLOAD_PROFILES[name]
+    if notes_bytes is None and array_items is None:
+        return profile
+    profile = dict(profile or {'notes_bytes': (0, 0), 'notes': 0.0, 'array_items': None, 'photo': 0.0})
+    if notes_bytes is not None:
+        profile.update(notes_bytes=notes_bytes, notes=1.0)
+    if array_items is not None:
+        if not 0 <= array_items[0] <= array_items[1] <= ITEM_POOL_SIZE:
+            raise ValueError(f"array items {array_items[0]}:{array_items[1]} must be a range within "
+                             f"0:{ITEM_POOL_SIZE}, the size of the item pool")
+        profile['array_items'] = array_items
+    return profile
+
+
+def apply_payload(batch, profile, rng):
+    """Rewrite the details of one batch with payloads drawn from profile, returns a new batch"""
+    n = len(batch)
+    low, high = profile['notes_bytes']
+    block = text_block(2 * high)
+    sizes = np.exp(rng.uniform(np.log(max(low, 1)), np.log(max(high, 1)), n)).astype(np.int64)
+    offsets = rng.integers(0, len(block) - high, n) if high else np.zeros(n, dtype=np.int64)
+    has_notes = rng.random(n) < profile['notes']
+    has_photo = rng.random(n) < profile['photo']
+
+    array_items = profile['array_items']
+    if array_items:
+        items = item_pool()
+        lengths = rng.integers(array_items[0], array_items[1] + 1, (n, 3))
+        starts = rng.integers(0, ITEM_POOL_SIZE, (n, 3))
+
+    heavy = []
+    for i, employee_data in enumerate(batch):
+        details = list(employee_data['details'])
+        if has_notes[i]:
+            details[NOTES] = block[offsets[i]:offsets[i] + sizes[i]]
+        if has_photo[i]:
+            details[PHOTO_URL] = f"{PHOTO_URL_BASE}/{employee_data['employment'][0]}.jpg"
+        if array_items:
+            # Fresh slices, the default lists may be shared (employee_columns.mask_items is cached)
+            for column, start, length in zip((SKILLS, CERTIFICATIONS, LANGUAGES), starts[i], lengths[i]):
+                details[column] = items[start:start + length]
+        heavy.append(dict(employee_data, details=tuple(details)))
+    return heavy
+
+
+def with_payload(batches, profile, seed=None, first_batch=0):
+    """Apply a payload profile to every batch of an iterable, seeded per batch"""
+    for batch_id, batch in enumerate(batches, first_batch):
+        rng = np.random.default_rng(None if seed is None else [seed, batch_id])
+        yield apply_payload(batch, profile, rng)
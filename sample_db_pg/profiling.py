@@ -0,0 +1,164 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Sampling interval of the flamegraph profiler
+SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
+
+class FieldTimer:
+    """Accumulates calls and seconds per wrapped method, e.g. fake.street_address or rng.sample"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = Counter()
+
+    def wrap(self, target, prefix):
+        """Proxy for target (a Faker or random.Random instance) that times every method call"""
+        return TimingProxy(target, prefix, self)
+
+    def report(self, total_seconds=None):
+        """Print the per-field breakdown, slowest first, with the unattributed remainder"""
+        attributed = sum(self.seconds.values())
+        total = total_seconds or attributed
+        print(f"\n--- Generator cost by field ({total:.2f}s total) ---")
+        print(f"{'field':<36}{'calls':>10}{'seconds':>10}{'us/call':>10}{'share':>8}")
+        for field, seconds in self.seconds.most_common():
+            print(f"{field:<36}{self.calls[field]:>10}{seconds:>10.3f}{seconds / self.calls[field] * 1e6:>10.1f}"
+                  f"{seconds / total:>8.1%}")
+        if total_seconds:
+            other = total_seconds - attributed
+            print(f"{'other (formatting, tuples, loop)':<36}{'':>10}{other:>10.3f}{'':>10}{other / total:>8.1%}")
+
+    def write_json(self, path):
+        """Per-field calls/seconds/us_per_call, for comparing generator changes between runs"""
+        with open(path, 'w') as f:
+            json.dump({field: {'calls': self.calls[field], 'seconds': round(seconds, 6),
+                               'us_per_call': round(seconds / self.calls[field] * 1e6, 3)}
+                       for field, seconds in self.seconds.most_common()}, f, indent=2)
+
+
+class TimingProxy:
+    def __init__(self, target, prefix, timer):
+        self._target = target
+        self._prefix = prefix
+        self._timer = timer
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+        field = f"{self._prefix}.{name}"
+        timer = self._timer
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                timer.seconds[field] += time.perf_counter() - started
+                timer.calls[field] += 1
+        return timed
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and counts folded stacks
+
+    The output is the folded format (frame;frame;frame count) read by flamegraph.pl,
+    speedscope and inferno.
+    """
+
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.running = False
+        self.thread = None
+
+    def sample(self):
+        while self.running:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"Wrote {sum(self.stacks.values())} stack samples to {path}")
+
+
+class Profiler:
+    """Opt-in profiling of named stages with cProfile or the stack sampler, plus the field breakdown"""
+
+    def __init__(self, mode='cprofile', output_dir='profile', top=20):
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top = top
+        self.fields = FieldTimer()
+        self.durations = {}
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name):
+        """Profile the with-block, writing <name>.prof (cprofile) or <name>.folded (sample)"""
+        started = time.perf_counter()
+        try:
+            with self.profiled(name, started):
+                yield
+        finally:
+            self.durations[name] = time.perf_counter() - started
+
+    @contextmanager
+    def profiled(self, name, started):
+        if self.mode == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                path = os.path.join(self.output_dir, f"{name}.prof")
+                profile.dump_stats(path)
+                out = io.StringIO()
+                pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(self.top)
+                print(f"\n--- cProfile: {name} ({time.perf_counter() - started:.2f}s), written to {path} ---")
+                print(out.getvalue())
+        else:
+            sampler = StackSampler()
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                print(f"\n--- Sampled {name} ({time.perf_counter() - started:.2f}s) ---")
+                sampler.write_folded(os.path.join(self.output_dir, f"{name}.folded"))
+
+    def report(self):
+        """Print and save the per-field breakdown; the remainder is only shown for a pure generate stage"""
+        if not self.fields.calls:
+            return
+        self.fields.report(self.durations.get('generate'))
+        self.fields.write_json(os.path.join(self.output_dir, 'fields.json'))
@@ -1,12 +1,24 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+import argparse
+import csv
+import json
 import random
 import os
+import sys
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from faker import Faker
 import uuid
 
+from department_stats import CACHED_STATS_QUERY
+from metrics import METRICS, configure as configure_metrics
+
 
 # Database configuration from environment variables
 DB_CONFIG = {
@@ -17,25 +29,232 @@ DB_CONFIG = {
     'port': os.getenv('POSTGRES_PORT', '5432')
 }
 
+# Pooled mode: connections kept open per database and shared by every Query using it
+POOL_MIN_CONN = int(os.getenv('POOL_MIN_CONN', '1'))
+POOL_MAX_CONN = int(os.getenv('POOL_MAX_CONN', '4'))
+
+EMPLOYEES_QUERY = """
+SELECT 
+    p.first_name,
+    p.last_name,
+    p.date_of_birth,
+    c.email,
+    c.phone_primary,
+    c.city,
+    c.state,
+    e.employee_number,
+    e.department,
+    e.position,
+    e.salary,
+    e.employment_status,
+    d.education_level,
+    d.performance_rating
+FROM employee p
+JOIN contact_info c ON p.employee_id = c.employee_id
+JOIN employment_info e ON p.employee_id = e.employee_id
+JOIN employee_details d ON p.employee_id = d.employee_id
+WHERE e.employment_status = 'Active'
+ORDER BY p.last_name, p.first_name
+LIMIT %s;
+"""
+
+DEPARTMENT_STATS_QUERY = """
+SELECT 
+    e.department,
+    COUNT(*) as employee_count,
+    AVG(e.salary) as avg_salary,
+    MIN(e.salary) as min_salary,
+    MAX(e.salary) as max_salary,
+    AVG(d.performance_rating) as avg_performance
+FROM employment_info e
+JOIN employee_details d ON e.employee_id = d.employee_id
+WHERE e.employment_status = 'Active'
+GROUP BY e.department
+ORDER BY employee_count DESC;
+"""
+
+# Depth of every employee below their department head, aggregated per department
+ORG_CHART_QUERY = """
+WITH RECURSIVE org AS (
+    SELECT employee_id, department, 1 AS depth
+    FROM employment_info
+    WHERE manager_id IS NULL
+  UNION ALL
+    SELECT e.employee_id, o.department, o.depth + 1
+    FROM employment_info e
+    JOIN org o ON e.manager_id = o.employee_id
+)
+SELECT
+    department,
+    COUNT(*) AS employee_count,
+    COUNT(*) FILTER (WHERE depth = 1) AS heads,
+    MAX(depth) AS max_depth,
+    AVG(depth) AS avg_depth
+FROM org
+GROUP BY department
+ORDER BY department;
+"""
+
+# Managers with the largest total (direct and indirect) teams: each employee is paired with every ancestor
+TEAM_SIZE_QUERY = """
+WITH RECURSIVE chain AS (
+    SELECT employee_id, manager_id AS ancestor_id
+    FROM employment_info
+    WHERE manager_id IS NOT NULL
+  UNION ALL
+    SELECT c.employee_id, e.manager_id
+    FROM chain c
+    JOIN employment_info e ON e.employee_id = c.ancestor_id
+    WHERE e.manager_id IS NOT NULL
+)
+SELECT
+    p.first_name,
+    p.last_name,
+    e.employee_number,
+    e.department,
+    e.position,
+    (SELECT COUNT(*) FROM employment_info r WHERE r.manager_id = t.ancestor_id) AS direct_reports,
+    t.team_size
+FROM (SELECT ancestor_id, COUNT(*) AS team_size FROM chain GROUP BY ancestor_id ORDER BY team_size DESC LIMIT %s) t
+JOIN employee p ON p.employee_id = t.ancestor_id
+JOIN employment_info e ON e.employee_id = t.ancestor_id
+ORDER BY t.team_size DESC;
+"""
+
+# Streaming export of the active roster: keyset pages over (last_name, first_name, employee_id),
+# each read through a named server-side cursor
+EXPORT_COLUMNS = ('employee_id', 'first_name', 'last_name', 'date_of_birth', 'email', 'phone_primary', 'city',
+                  'state', 'employee_number', 'department', 'position', 'salary', 'employment_status',
+                  'education_level', 'performance_rating')
+EmployeeRow = namedtuple('EmployeeRow', EXPORT_COLUMNS)
+
+EXPORT_QUERY = """
+SELECT 
+    p.employee_id,
+    p.first_name,
+    p.last_name,
+    p.date_of_birth,
+    c.email,
+    c.phone_primary,
+    c.city,
+    c.state,
+    e.employee_number,
+    e.department,
+    e.position,
+    e.salary,
+    e.employment_status,
+    d.education_level,
+    d.performance_rating
+FROM employee p
+JOIN contact_info c ON p.employee_id = c.employee_id
+JOIN employment_info e ON p.employee_id = e.employee_id
+JOIN employee_details d ON p.employee_id = d.employee_id
+WHERE e.employment_status = 'Active' {keyset}
+ORDER BY p.last_name, p.first_name, p.employee_id
+LIMIT %s;
+"""
+EXPORT_KEYSET = "AND (p.last_name, p.first_name, p.employee_id) > (%s, %s, %s)"
+EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', '100000'))
+EXPORT_ITERSIZE = int(os.getenv('EXPORT_ITERSIZE', '5000'))
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """ThreadedConnectionPool whose getconn waits for a free connection instead of raising PoolError
+
+    Every Query on the same database shares one pool, so concurrent users can ask for
+    more than maxconn connections between them.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        self._slots.acquire()
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+def connect_with_backoff(connect, max_retries=10, base_delay=0.5, max_delay=30.0):
+    """Call connect() until it succeeds, doubling the delay (with jitter) after each failure"""
+    started = time.perf_counter()
+    for attempt in range(1, max_retries + 1):
+        try:
+            connection = connect()
+            METRICS.observe('connect_wait_seconds', time.perf_counter() - started, script='query')
+            return connection
+        except psycopg2.OperationalError as e:
+            METRICS.inc('connect_retries_total', script='query')
+            if attempt == max_retries:
+                print("Max retries reached. Could not connect to database.")
+                raise
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            print(f"Connection attempt {attempt}/{max_retries} failed: {e}")
+            print(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+
+
+def get_pool(db_config=None, minconn=POOL_MIN_CONN, maxconn=POOL_MAX_CONN):
+    """Return the shared connection pool for a database config, creating it on first use"""
+    db_config = db_config or DB_CONFIG
+    key = tuple(sorted(db_config.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = connect_with_backoff(lambda: BlockingConnectionPool(minconn, maxconn, **db_config))
+            print(f"Connection pool ({minconn}-{maxconn}) created for {db_config['database']}@{db_config['host']}")
+        return _pools[key]
+
+
+def close_pools():
+    """Close every shared connection pool"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
 
 class Query:
-    def __init__(self):
+    def __init__(self, db_config=None, pooled=False, minconn=POOL_MIN_CONN, maxconn=POOL_MAX_CONN):
         self.conn = None
         self.cursor = None
+        self.db_config = db_config or DB_CONFIG
+        self.pooled = pooled
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.pool = None
 
     def connect(self):
         """Connect to PostgreSQL database with retry logic"""
+        if self.pooled:
+            self.pool = get_pool(self.db_config, self.minconn, self.maxconn)
+            return True
+
         max_retries = 30
         retry_count = 0
+        started = time.perf_counter()
 
         while retry_count < max_retries:
             try:
-                self.conn = psycopg2.connect(**DB_CONFIG)
+                self.conn = psycopg2.connect(**self.db_config)
                 self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+                METRICS.observe('connect_wait_seconds', time.perf_counter() - started, script='query')
                 print("Connected to PostgreSQL database successfully!")
                 return True
             except Exception as e:
                 retry_count += 1
+                METRICS.inc('connect_retries_total', script='query')
                 print(f"Connection attempt {retry_count}/{max_retries} failed: {e}")
                 if retry_count < max_retries:
                     print("Retrying in 2 seconds...")
@@ -47,110 +266,259 @@ class Query:
 
     def disconnect(self):
         """Close database connection"""
+        if self.pooled:
+            # Pooled connections stay open for the next Query on the same database
+            self.pool = None
+            return
         if self.cursor:
             self.cursor.close()
         if self.conn:
             self.conn.close()
         print("Database connection closed.")
 
-    def query_employees(self, limit=10):
-        """Query and display employee information"""
+    @contextmanager
+    def connection(self):
+        """Yield a connection: the instance's own, or one borrowed from the pool in pooled mode"""
+        if not self.pooled:
+            yield self.conn
+            return
+        with METRICS.timer('pool_wait', script='query'):
+            conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    @contextmanager
+    def dict_cursor(self):
+        """Yield a RealDictCursor, borrowing a pooled connection when in pooled mode"""
+        if not self.pooled:
+            yield self.cursor
+            return
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                yield cursor
+            conn.rollback()  # Read-only: end the transaction before returning the connection
 
-        query = """
-        SELECT 
-            p.first_name,
-            p.last_name,
-            p.date_of_birth,
-            c.email,
-            c.phone_primary,
-            c.city,
-            c.state,
-            e.employee_number,
-            e.department,
-            e.position,
-            e.salary,
-            e.employment_status,
-            d.education_level,
-            d.performance_rating
-        FROM employee p
-        JOIN contact_info c ON p.employee_id = c.employee_id
-        JOIN employment_info e ON p.employee_id = e.employee_id
-        JOIN employee_details d ON p.employee_id = d.employee_id
-        WHERE e.employment_status = 'Active'
-        ORDER BY p.last_name, p.first_name
-        LIMIT %s;
+    def iter_active_employees(self, page_size=EXPORT_PAGE_SIZE, itersize=EXPORT_ITERSIZE):
+        """Stream the active roster in name order as EmployeeRow tuples, in constant memory"""
+        last = None
+        page = 0
+        with self.connection() as conn:
+            while True:
+                page += 1
+                if last is None:
+                    query, params = EXPORT_QUERY.format(keyset=''), (page_size,)
+                else:
+                    query = EXPORT_QUERY.format(keyset=EXPORT_KEYSET)
+                    params = (last.last_name, last.first_name, last.employee_id, page_size)
+
+                # Named cursor: rows stay on the server and arrive itersize at a time
+                rows = 0
+                with conn.cursor(name=f"employee_export_{page}") as cursor:
+                    cursor.itersize = itersize
+                    with METRICS.timer('query', script='query', query='export_page'):
+                        cursor.execute(query, params)
+                    for row in cursor:
+                        last = EmployeeRow(*row)
+                        rows += 1
+                        yield last
+                conn.rollback()
+                METRICS.inc('rows_total', rows, script='query', query='export')
+                if rows < page_size:
+                    return
+
+    def export_active_employees(self, out, fmt='ndjson', page_size=EXPORT_PAGE_SIZE, itersize=EXPORT_ITERSIZE):
+        """Write the active roster to a file object as NDJSON or CSV, returns the row count"""
+        started = time.perf_counter()
+        rows = 0
+        if fmt == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_COLUMNS)
+            for row in self.iter_active_employees(page_size, itersize):
+                writer.writerow(row)
+                rows += 1
+        else:
+            for row in self.iter_active_employees(page_size, itersize):
+                out.write(json.dumps(row._asdict(), default=str))
+                out.write('\n')
+                rows += 1
+        elapsed = time.perf_counter() - started
+        print(f"Exported {rows} active employees in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/sec)",
+              file=sys.stderr)
+        return rows
+
+    def fetch_employees(self, limit=10):
+        """Return the first active employees ordered by name"""
+        with self.dict_cursor() as cursor, METRICS.timer('query', script='query', query='employees'):
+            cursor.execute(EMPLOYEES_QUERY, (limit,))
+            return cursor.fetchall()
+
+    def fetch_department_statistics(self, cached=False):
+        """Return per-department statistics for active employees
+
+        cached=True reads the trigger-maintained department_stats table
+        (see department_stats.py) instead of aggregating the join.
         """
+        name = 'department_statistics_cached' if cached else 'department_statistics'
+        with self.dict_cursor() as cursor, METRICS.timer('query', script='query', query=name):
+            cursor.execute(CACHED_STATS_QUERY if cached else DEPARTMENT_STATS_QUERY)
+            return cursor.fetchall()
+
+    def fetch_org_chart(self):
+        """Return per-department org depth statistics from the manager hierarchy"""
+        with self.dict_cursor() as cursor, METRICS.timer('query', script='query', query='org_chart'):
+            cursor.execute(ORG_CHART_QUERY)
+            return cursor.fetchall()
+
+    def fetch_largest_teams(self, limit=10):
+        """Return the managers with the largest total teams"""
+        with self.dict_cursor() as cursor, METRICS.timer('query', script='query', query='team_size'):
+            cursor.execute(TEAM_SIZE_QUERY, (limit,))
+            return cursor.fetchall()
+
+    def run_concurrently(self, *calls):
+        """Run independent zero-argument callables on pooled connections, returning their results in order"""
+        with ThreadPoolExecutor(max_workers=min(len(calls), self.maxconn)) as executor:
+            return [future.result() for future in [executor.submit(call) for call in calls]]
+
+    def print_employees(self, employees, limit):
+        """Display employee rows"""
+        print(f"\n--- Employee Information (First {limit} Active Employees) ---")
+        for emp in employees:
+            print(f"Name: {emp['first_name']} {emp['last_name']}")
+            print(f"Employee Number: {emp['employee_number']}")
+            print(f"Department: {emp['department']}")
+            print(f"Position: {emp['position']}")
+            print(f"Email: {emp['email']}")
+            print(f"Location: {emp['city']}, {emp['state']}")
+            print(f"Salary: ${emp['salary']:,.2f}")
+            print(f"Performance Rating: {emp['performance_rating']}/5.0")
+            print("-" * 50)
+
+    def print_department_statistics(self, departments):
+        """Display department statistics rows"""
+        print(f"\n--- Department Statistics ---")
+        for dept in departments:
+            print(f"Department: {dept['department']}")
+            print(f"  Employee Count: {dept['employee_count']}")
+            print(f"  Average Salary: ${dept['avg_salary']:,.2f}")
+            print(f"  Salary Range: ${dept['min_salary']:,.2f} - ${dept['max_salary']:,.2f}")
+            print(f"  Average Performance: {dept['avg_performance']:.2f}/5.0")
+            print("-" * 40)
+
+    def print_org_chart(self, departments, teams):
+        """Display org depth per department and the largest teams"""
+        print(f"\n--- Org Chart ---")
+        for dept in departments:
+            print(f"Department: {dept['department']}")
+            print(f"  Employees: {dept['employee_count']} ({dept['heads']} without a manager)")
+            print(f"  Depth: max {dept['max_depth']}, average {dept['avg_depth']:.2f}")
+            print("-" * 40)
+        print(f"\n--- Largest Teams ---")
+        for team in teams:
+            print(f"{team['first_name']} {team['last_name']} ({team['employee_number']}, {team['department']}, "
+                  f"{team['position']}): {team['direct_reports']} direct, {team['team_size']} total")
+
+    def get_org_chart(self, limit=10):
+        """Query and display the manager hierarchy reports"""
 
         try:
-            self.cursor.execute(query, (limit,))
-            employees = self.cursor.fetchall()
-
-            print(f"\n--- Employee Information (First {limit} Active Employees) ---")
-            for emp in employees:
-                print(f"Name: {emp['first_name']} {emp['last_name']}")
-                print(f"Employee Number: {emp['employee_number']}")
-                print(f"Department: {emp['department']}")
-                print(f"Position: {emp['position']}")
-                print(f"Email: {emp['email']}")
-                print(f"Location: {emp['city']}, {emp['state']}")
-                print(f"Salary: ${emp['salary']:,.2f}")
-                print(f"Performance Rating: {emp['performance_rating']}/5.0")
-                print("-" * 50)
+            self.print_org_chart(self.fetch_org_chart(), self.fetch_largest_teams(limit))
+
+        except Exception as e:
+            print(f"Error querying the org chart: {e}")
+
+    def query_employees(self, limit=10):
+        """Query and display employee information"""
+
+        try:
+            self.print_employees(self.fetch_employees(limit), limit)
 
         except Exception as e:
             print(f"Error querying employees: {e}")
 
 
-    def get_department_statistics(self):
+    def get_department_statistics(self, cached=False):
         """Get statistics by department"""
 
-        query = """
-        SELECT 
-            e.department,
-            COUNT(*) as employee_count,
-            AVG(e.salary) as avg_salary,
-            MIN(e.salary) as min_salary,
-            MAX(e.salary) as max_salary,
-            AVG(d.performance_rating) as avg_performance
-        FROM employment_info e
-        JOIN employee_details d ON e.employee_id = d.employee_id
-        WHERE e.employment_status = 'Active'
-        GROUP BY e.department
-        ORDER BY employee_count DESC;
-        """
-
         try:
-            self.cursor.execute(query)
-            departments = self.cursor.fetchall()
-
-            print(f"\n--- Department Statistics ---")
-            for dept in departments:
-                print(f"Department: {dept['department']}")
-                print(f"  Employee Count: {dept['employee_count']}")
-                print(f"  Average Salary: ${dept['avg_salary']:,.2f}")
-                print(f"  Salary Range: ${dept['min_salary']:,.2f} - ${dept['max_salary']:,.2f}")
-                print(f"  Average Performance: {dept['avg_performance']:.2f}/5.0")
-                print("-" * 40)
+            self.print_department_statistics(self.fetch_department_statistics(cached))
 
         except Exception as e:
             print(f"Error getting department statistics: {e}")
 
+    def run_checks(self, limit=10, cached=False):
+        """Run the employee and department queries concurrently and display both"""
+
+        try:
+            employees, departments = self.run_concurrently(lambda: self.fetch_employees(limit),
+                                                           lambda: self.fetch_department_statistics(cached))
+            self.print_employees(employees, limit)
+            self.print_department_statistics(departments)
+
+        except Exception as e:
+            print(f"Error running checks: {e}")
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Report on the employee_db sample database")
+    parser.add_argument('--limit', type=int, default=10, help="number of employees to display")
+    parser.add_argument('--pooled', action='store_true',
+                        help="use shared connection pools and run independent queries concurrently")
+    parser.add_argument('--min-conn', type=int, default=POOL_MIN_CONN, help="pool minimum connections")
+    parser.add_argument('--max-conn', type=int, default=POOL_MAX_CONN, help="pool maximum connections")
+    parser.add_argument('--databases', default=DB_CONFIG['database'],
+                        help="comma separated databases to sweep (pooled mode reuses connections across sweeps)")
+    parser.add_argument('--sweeps', type=int, default=1, help="number of verification sweeps over the databases")
+    parser.add_argument('--cached-stats', action='store_true',
+                        help="read department statistics from the trigger-maintained department_stats table")
+    parser.add_argument('--org-chart', action='store_true',
+                        help="also report org depth per department and the largest teams (recursive CTEs)")
+    parser.add_argument('--export', metavar='PATH',
+                        help="stream the full active roster to PATH ('-' for stdout) instead of the reports")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', help="export format")
+    parser.add_argument('--page-size', type=int, default=EXPORT_PAGE_SIZE, help="rows per keyset page in exports")
+    parser.add_argument('--itersize', type=int, default=EXPORT_ITERSIZE,
+                        help="rows per server-side cursor fetch in exports")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    db = Query()
+    args = parse_args()
+    configure_metrics()
     try:
-        # Connect to database
-        db.connect()
+        for sweep in range(args.sweeps):
+            for database in args.databases.split(','):
+                db = Query(dict(DB_CONFIG, database=database), args.pooled, args.min_conn, args.max_conn)
+                try:
+                    # Connect to database
+                    db.connect()
+
+                    if args.export:
+                        if args.export == '-':
+                            db.export_active_employees(sys.stdout, args.format, args.page_size, args.itersize)
+                        else:
+                            with open(args.export, 'w', newline='') as out:
+                                db.export_active_employees(out, args.format, args.page_size, args.itersize)
+                    elif args.pooled:
+                        db.run_checks(args.limit, args.cached_stats)
+                    else:
+                        # Query and display some employees
+                        db.query_employees(args.limit)
 
-        # Query and display some employees
-        db.query_employees(10)
+                        # Show department statistics
+                        db.get_department_statistics(args.cached_stats)
 
-        # Show department statistics
-        db.get_department_statistics()
+                    if args.org_chart and not args.export:
+                        db.get_org_chart(args.limit)
 
-    except Exception as e:
-        print(f"An error occurred: {e}")
+                except Exception as e:
+                    print(f"An error occurred: {e}")
 
+                finally:
+                    # Close database connection
+                    db.disconnect()
     finally:
-        # Close database connection
-        db.disconnect()
+        close_pools()
@@ -0,0 +1,331 @@
+import argparse
+import json
+import random
+import threading
+import time
+
+import psycopg2
+import redis
+
+from employee_db import DB_CONFIG, DEPARTMENTS
+from lag_benchmark import format_summary, summarize
+from redis_target import REDIS_CONFIG, connect_redis, key_pattern, rdi_key
+
+# RediSearch indexes over the hashes (or JSON documents) RDI writes for employee and employment_info.
+# Field name -> schema type; names and sort orders mirror the columns Query reads.
+INDEXES = {
+    'employee': ('idx:employee', {
+        'employee_id': 'TAG',
+        'first_name': 'TEXT SORTABLE',
+        'last_name': 'TEXT SORTABLE',
+    }),
+    'employment_info': ('idx:employment_info', {
+        'employee_id': 'TAG',
+        'employee_number': 'TAG',
+        'department': 'TAG',
+        'position': 'TEXT',
+        'employment_status': 'TAG',
+        'salary': 'NUMERIC SORTABLE',
+    }),
+}
+
+# Postgres statements doing the same work as each Redis workload (not the wider joins of query.py)
+LOOKUP_QUERY = """
+SELECT p.employee_id, p.first_name, p.last_name, e.employee_number, e.department, e.position, e.salary
+FROM employment_info e
+JOIN employee p ON p.employee_id = e.employee_id
+WHERE e.employee_number = ANY(%s)
+"""
+
+DEPARTMENT_QUERY = """
+SELECT employee_number, position, salary
+FROM employment_info
+WHERE department = %s AND employment_status = 'Active'
+ORDER BY salary DESC
+LIMIT %s
+"""
+
+NAMES_QUERY = """
+SELECT employee_id, first_name, last_name
+FROM employee
+ORDER BY last_name
+LIMIT %s
+"""
+
+STATS_QUERY = """
+SELECT department, COUNT(*) AS employee_count, AVG(salary) AS avg_salary,
+       MIN(salary) AS min_salary, MAX(salary) AS max_salary
+FROM employment_info
+WHERE employment_status = 'Active'
+GROUP BY department
+ORDER BY employee_count DESC
+"""
+
+WORKLOADS = ('lookup', 'department', 'names', 'stats')
+
+# RediSearch TAG values need their punctuation escaped (uuids, EMP numbers, 'Customer Service')
+TAG_SPECIAL = set(',.<>{}[]"\':;!@#$%^&*()-+=~| ')
+
+
+def tag(value):
+    return ''.join(f"\\{char}" if char in TAG_SPECIAL else char for char in str(value))
+
+
+def create_indexes(redis_client, data_type='hash', recreate=False):
+    """Create the RediSearch indexes if missing and wait until the existing keys are indexed"""
+    for table, (name, fields) in INDEXES.items():
+        if recreate:
+            try:
+                redis_client.execute_command('FT.DROPINDEX', name)
+            except redis.ResponseError:
+                pass
+        schema = []
+        for field, field_type in fields.items():
+            schema += [f"$.{field}", 'AS', field] if data_type == 'json' else [field]
+            schema += field_type.split()
+        try:
+            redis_client.execute_command('FT.CREATE', name, 'ON', data_type.upper(), 'PREFIX', 1,
+                                         key_pattern(table).rstrip('*'), 'SCHEMA', *schema)
+            print(f"Created {name} over {key_pattern(table)}")
+        except redis.ResponseError as e:
+            if 'already exists' not in str(e).lower():
+                raise
+        while True:
+            info = redis_client.execute_command('FT.INFO', name)
+            info = dict(zip(info[::2], info[1::2]))
+            if str(info.get('indexing', '0')) == '0':
+                print(f"{name}: {info.get('num_docs')} documents indexed")
+                break
+            time.sleep(0.5)
+
+
+def search_fields(reply):
+    """Documents of an FT.SEARCH reply as dicts (the first element is the total count)"""
+    return [dict(zip(fields[::2], fields[1::2])) for fields in reply[2::2]]
+
+
+class RedisReads:
+    """One client's workloads against the RDI keys, each batch sent as one pipeline"""
+
+    def __init__(self, data_type='hash', limit=10, **redis_config):
+        self.redis = connect_redis(**redis_config)
+        self.data_type = data_type
+        self.limit = limit
+
+    def lookup(self, numbers):
+        # employee_number -> employment document -> employee key, two pipelined round trips
+        pipe = self.redis.pipeline(transaction=False)
+        for number in numbers:
+            pipe.execute_command('FT.SEARCH', INDEXES['employment_info'][0], f"@employee_number:{{{tag(number)}}}",
+                                 'RETURN', 1, 'employee_id', 'LIMIT', 0, 1)
+        employee_ids = [fields['employee_id'] for reply in pipe.execute() for fields in search_fields(reply)]
+        pipe = self.redis.pipeline(transaction=False)
+        for employee_id in employee_ids:
+            key = rdi_key('employee', ('employee_id', employee_id))
+            if self.data_type == 'json':
+                pipe.execute_command('JSON.GET', key)
+            else:
+                pipe.hgetall(key)
+        return pipe.execute()
+
+    def department(self, departments):
+        pipe = self.redis.pipeline(transaction=False)
+        for department in departments:
+            pipe.execute_command('FT.SEARCH', INDEXES['employment_info'][0],
+                                 f"@department:{{{tag(department)}}} @employment_status:{{Active}}",
+                                 'RETURN', 3, 'employee_number', 'position', 'salary',
+                                 'SORTBY', 'salary', 'DESC', 'LIMIT', 0, self.limit)
+        return pipe.execute()
+
+    def names(self, count):
+        # SORTBY takes one field, so ties on last_name are not ordered by first_name as in Postgres
+        pipe = self.redis.pipeline(transaction=False)
+        for _ in range(count):
+            pipe.execute_command('FT.SEARCH', INDEXES['employee'][0], '*',
+                                 'RETURN', 3, 'employee_id', 'first_name', 'last_name',
+                                 'SORTBY', 'last_name', 'ASC', 'LIMIT', 0, self.limit)
+        return pipe.execute()
+
+    def stats(self, count):
+        # avg_performance lives in employee_details, which has no index here
+        pipe = self.redis.pipeline(transaction=False)
+        for _ in range(count):
+            pipe.execute_command('FT.AGGREGATE', INDEXES['employment_info'][0], '@employment_status:{Active}',
+                                 'GROUPBY', 1, '@department',
+                                 'REDUCE', 'COUNT', 0, 'AS', 'employee_count',
+                                 'REDUCE', 'AVG', 1, '@salary', 'AS', 'avg_salary',
+                                 'REDUCE', 'MIN', 1, '@salary', 'AS', 'min_salary',
+                                 'REDUCE', 'MAX', 1, '@salary', 'AS', 'max_salary',
+                                 'SORTBY', 2, '@employee_count', 'DESC')
+        return pipe.execute()
+
+    def close(self):
+        self.redis.close()
+
+
+class PostgresReads:
+    """The same workloads as Postgres queries; lookups batch with ANY, the rest run one by one"""
+
+    def __init__(self, limit=10):
+        self.conn = psycopg2.connect(**DB_CONFIG)
+        self.conn.autocommit = True
+        self.cursor = self.conn.cursor()
+        self.limit = limit
+
+    def lookup(self, numbers):
+        self.cursor.execute(LOOKUP_QUERY, (list(numbers),))
+        return self.cursor.fetchall()
+
+    def department(self, departments):
+        results = []
+        for department in departments:
+            self.cursor.execute(DEPARTMENT_QUERY, (department, self.limit))
+            results.append(self.cursor.fetchall())
+        return results
+
+    def names(self, count):
+        results = []
+        for _ in range(count):
+            self.cursor.execute(NAMES_QUERY, (self.limit,))
+            results.append(self.cursor.fetchall())
+        return results
+
+    def stats(self, count):
+        results = []
+        for _ in range(count):
+            self.cursor.execute(STATS_QUERY)
+            results.append(self.cursor.fetchall())
+        return results
+
+    def close(self):
+        self.conn.close()
+
+
+def sample_employee_numbers(size):
+    """Random employee numbers from the source, the keys of the lookup workload"""
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT employee_number FROM employment_info ORDER BY random() LIMIT %s", (size,))
+            return [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def run_workload(make_client, workload, clients, duration, pipeline, numbers, seed=0):
+    """Drive one workload from concurrent clients for duration seconds
+
+    Returns (requests, wall seconds, batch latencies in ms); a batch is pipeline requests.
+    """
+    latencies = []
+    requests = [0]
+    lock = threading.Lock()
+    errors = []
+    barrier = threading.Barrier(clients)
+
+    def client(client_id):
+        rng = random.Random(seed * 1000 + client_id)
+        reads, samples, sent = None, [], 0
+        try:
+            # Connect inside the try so a failed client aborts the barrier instead of leaving the rest waiting
+            reads = make_client()
+            barrier.wait()
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                if workload == 'lookup':
+                    batch = rng.sample(numbers, min(pipeline, len(numbers)))
+                elif workload == 'department':
+                    batch = rng.choices(DEPARTMENTS, k=pipeline)
+                else:
+                    batch = pipeline
+                started = time.perf_counter()
+                getattr(reads, workload)(batch)
+                samples.append((time.perf_counter() - started) * 1000)
+                # A lookup batch is capped by the sample size, so count what was actually sent
+                sent += pipeline if isinstance(batch, int) else len(batch)
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+        finally:
+            if reads is not None:
+                reads.close()
+            with lock:
+                latencies.extend(samples)
+                requests[0] += sent
+
+    threads = [threading.Thread(target=client, args=(client_id,)) for client_id in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return requests[0], time.perf_counter() - started, latencies
+
+
+def report_row(backend, workload, requests, seconds, latencies):
+    stats = summarize(latencies)
+    qps = requests / seconds if seconds else 0.0
+    print(f"  {backend:<9}{workload:<11}{qps:>12,.0f} req/s  batch {format_summary(stats)}")
+    return dict(stats, backend=backend, workload=workload, requests=requests, seconds=round(seconds, 3),
+                qps=round(qps, 1))
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark reads of the RDI-written employee data in Redis "
+                                                 "against the same queries in Postgres")
+    parser.add_argument('--workloads', default=','.join(WORKLOADS),
+                        help=f"comma separated subset of {', '.join(WORKLOADS)}")
+    parser.add_argument('--clients', type=int, default=8, help="concurrent clients per backend")
+    parser.add_argument('--pipeline', type=int, default=10, help="requests per pipelined batch")
+    parser.add_argument('--duration', type=float, default=10, help="seconds per workload and backend")
+    parser.add_argument('--limit', type=int, default=10, help="rows returned by listings and department filters")
+    parser.add_argument('--sample-size', type=int, default=10000, help="employee numbers sampled for lookups")
+    parser.add_argument('--data-type', choices=['hash', 'json'], default='hash', help="how RDI stores rows")
+    parser.add_argument('--recreate-indexes', action='store_true', help="drop and rebuild the RediSearch indexes")
+    parser.add_argument('--skip-postgres', action='store_true', help="only benchmark Redis")
+    parser.add_argument('--redis-host', default=REDIS_CONFIG['host'], help="target Redis host")
+    parser.add_argument('--redis-port', type=int, default=REDIS_CONFIG['port'], help="target Redis port")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the requests each client sends")
+    parser.add_argument('--output', help="optional JSON file for the results")
+    args = parser.parse_args()
+    if args.clients < 1:
+        parser.error("--clients must be at least 1")
+    if args.pipeline < 1:
+        parser.error("--pipeline must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    workloads = [workload.strip() for workload in args.workloads.split(',') if workload.strip()]
+    unknown = set(workloads) - set(WORKLOADS)
+    if unknown:
+        raise SystemExit(f"Unknown workloads: {', '.join(sorted(unknown))}")
+    print(f"Source {DB_CONFIG['host']}:{DB_CONFIG['port']}, target Redis {args.redis_host}:{args.redis_port}")
+    try:
+        redis_config = {'host': args.redis_host, 'port': args.redis_port}
+        create_indexes(connect_redis(**redis_config), args.data_type, args.recreate_indexes)
+        numbers = sample_employee_numbers(args.sample_size) if 'lookup' in workloads else []
+
+        backends = [('redis', lambda: RedisReads(args.data_type, args.limit, **redis_config))]
+        if not args.skip_postgres:
+            backends.append(('postgres', lambda: PostgresReads(args.limit)))
+
+        print(f"\n--- Reads: {args.clients} clients, {args.pipeline} requests per batch, {args.duration:.0f}s each ---")
+        results = []
+        for workload in workloads:
+            for backend, make_client in backends:
+                requests, seconds, latencies = run_workload(make_client, workload, args.clients, args.duration,
+                                                            args.pipeline, numbers, args.seed)
+                results.append(report_row(backend, workload, requests, seconds, latencies))
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"Wrote {len(results)} results to {args.output}")
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
@@ -0,0 +1,47 @@
+import os
+
+import redis
+
+# Target Redis (the database RDI writes into) from environment variables.
+# A local redis-server works as a stand-in for CI runs.
+REDIS_CONFIG = {
+    'host': os.getenv('REDIS_HOST', 'localhost'),
+    'port': int(os.getenv('REDIS_PORT', '6379')),
+    'username': os.getenv('REDIS_USER') or None,
+    'password': os.getenv('REDIS_PASSWORD') or None,
+    'db': int(os.getenv('REDIS_DB', '0')),
+}
+
+# RDI's default key layout is <table>:<pk column>:<pk value>[:<pk column>:<pk value>...]
+KEY_TEMPLATE = os.getenv('RDI_KEY_TEMPLATE', '{table}:{pk}')
+
+
+def connect_redis(**overrides):
+    """Open a client to the target Redis, decoding replies to str"""
+    config = dict(REDIS_CONFIG, **overrides)
+    return redis.Redis(decode_responses=True, **config)
+
+
+def rdi_key(table, *pk):
+    """Build the key RDI writes for a row, pk given as column, value pairs"""
+    pk_part = ':'.join(f"{column}:{value}" for column, value in pk)
+    return KEY_TEMPLATE.format(table=table, pk=pk_part)
+
+
+def key_pattern(table):
+    """SCAN MATCH pattern covering every key RDI writes for a table"""
+    return KEY_TEMPLATE.format(table=table, pk='*')
+
+
+def delete_table_keys(redis_client, tables, batch_size=1000):
+    """UNLINK every key RDI wrote for the tables, returns the number removed"""
+    removed = 0
+    for table in tables:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in redis_client.scan_iter(match=key_pattern(table), count=10000):
+            pipe.unlink(key)
+            removed += 1
+            if len(pipe) >= batch_size:
+                pipe.execute()
+        pipe.execute()
+    return removed
@@ -0,0 +1,194 @@
+import argparse
+import random
+import time
+import uuid
+
+import numpy as np
+
+from employee_db import (DB_CONFIG, EmployeeDatabase, EMPLOYEE_COLUMNS, CONTACT_COLUMNS, EMPLOYMENT_COLUMNS,
+                         DETAILS_COLUMNS, generate_employees)
+
+DEFAULT_MIX = 'insert=20,update=70,delete=10'
+
+# New employees are generated ahead in chunks of this size, not one Faker run per insert
+INSERT_CHUNK = 200
+
+# Column updates applied by the UPDATE operation, one is picked per operation
+UPDATES = {
+    'employee': ("UPDATE employee SET marital_status = %s, updated_at = CURRENT_TIMESTAMP WHERE employee_id = %s",
+                 lambda rng: rng.choice(['Single', 'Married', 'Divorced', 'Widowed'])),
+    'contact_info': ("UPDATE contact_info SET phone_primary = %s, updated_at = CURRENT_TIMESTAMP "
+                     "WHERE employee_id = %s",
+                     lambda rng: f"+1-{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"),
+    'employment_info': ("UPDATE employment_info SET salary = %s, updated_at = CURRENT_TIMESTAMP "
+                        "WHERE employee_id = %s",
+                        lambda rng: round(rng.uniform(40000, 200000), 2)),
+    'employee_details': ("UPDATE employee_details SET performance_rating = %s, updated_at = CURRENT_TIMESTAMP "
+                         "WHERE employee_id = %s",
+                         lambda rng: round(rng.uniform(2.5, 5.0), 2)),
+}
+
+
+def insert_query(table, columns):
+    """Build a single-row INSERT for the given column order"""
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+
+def parse_mix(mix):
+    """Parse 'insert=20,update=70,delete=10' into operation weights"""
+    weights = {}
+    for part in mix.split(','):
+        operation, _, weight = part.partition('=')
+        if operation.strip() not in ('insert', 'update', 'delete'):
+            raise ValueError(f"Unknown operation in mix: {operation}")
+        weights[operation.strip()] = float(weight)
+    return weights
+
+
+class CdcWorkload:
+    """Sustained INSERT/UPDATE/DELETE load against the employee_db tables for change capture tests"""
+
+    def __init__(self, db, ops_per_sec=100, txn_size=10, mix=DEFAULT_MIX, zipf=1.1, seed=None):
+        self.db = db
+        self.ops_per_sec = ops_per_sec
+        self.txn_size = txn_size
+        self.weights = parse_mix(mix)
+        self.zipf = zipf
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.employee_ids = []
+        self.next_index = 0
+        self.pending_inserts = []
+        self.counts = dict.fromkeys(('insert', 'update', 'delete'), 0)
+
+    def load_keys(self):
+        """Read the current employee ids and the next free employee index"""
+        self.db.cursor.execute("SELECT employee_id FROM employee")
+        self.employee_ids = [row['employee_id'] for row in self.db.cursor.fetchall()]
+        self.db.cursor.execute(
+            "SELECT COALESCE(MAX(substring(employee_number FROM 4)::bigint), 0) AS last FROM employment_info")
+        self.next_index = self.db.cursor.fetchone()['last']
+        self.pending_inserts = []
+        print(f"Loaded {len(self.employee_ids)} employee ids, next employee index {self.next_index}")
+
+    def pick_position(self):
+        """Pick an index into employee_ids, Zipf-skewed toward the front when zipf > 1"""
+        if self.zipf <= 1.0:
+            return self.rng.randrange(len(self.employee_ids))
+        return (int(self.np_rng.zipf(self.zipf)) - 1) % len(self.employee_ids)
+
+    def insert(self):
+        """Insert one new employee across all four tables"""
+        if not self.pending_inserts:
+            self.pending_inserts = generate_employees(INSERT_CHUNK, self.next_index, self.rng.getrandbits(32))
+            self.pending_inserts.reverse()
+        employee_data = self.pending_inserts.pop()
+        self.next_index += 1
+        employee_id = str(uuid.uuid4())
+        cursor = self.db.cursor
+        cursor.execute(insert_query('employee', EMPLOYEE_COLUMNS), (employee_id,) + employee_data['personal'])
+        cursor.execute(insert_query('contact_info', CONTACT_COLUMNS),
+                       (str(uuid.uuid4()), employee_id) + employee_data['contact'])
+        cursor.execute(insert_query('employment_info', EMPLOYMENT_COLUMNS),
+                       (str(uuid.uuid4()), employee_id) + employee_data['employment'])
+        cursor.execute(insert_query('employee_details', DETAILS_COLUMNS),
+                       (str(uuid.uuid4()), employee_id) + employee_data['details'])
+        self.employee_ids.append(employee_id)
+
+    def update(self):
+        """Update one column of a skew-picked employee in one of the four tables"""
+        query, value = UPDATES[self.rng.choice(list(UPDATES))]
+        self.db.cursor.execute(query, (value(self.rng), self.employee_ids[self.pick_position()]))
+
+    def delete(self):
+        """Delete a skew-picked employee, cascading to the other three tables"""
+        position = self.pick_position()
+        employee_id = self.employee_ids[position]
+        # Swap-remove keeps the id list O(1) to maintain
+        self.employee_ids[position] = self.employee_ids[-1]
+        self.employee_ids.pop()
+        self.db.cursor.execute("UPDATE employment_info SET manager_id = NULL WHERE manager_id = %s", (employee_id,))
+        self.db.cursor.execute("DELETE FROM employee WHERE employee_id = %s", (employee_id,))
+
+    def run_transaction(self):
+        """Apply txn_size operations drawn from the mix and commit them together"""
+        operations = self.rng.choices(list(self.weights), weights=list(self.weights.values()), k=self.txn_size)
+        applied = []
+        try:
+            for operation in operations:
+                if operation != 'insert' and not self.employee_ids:
+                    operation = 'insert'
+                getattr(self, operation)()
+                applied.append(operation)
+            self.db.conn.commit()
+            for operation in applied:
+                self.counts[operation] += 1
+        except Exception as e:
+            self.db.conn.rollback()
+            print(f"Workload transaction rolled back: {e}")
+            # Keys may have diverged from the database after the rollback
+            self.load_keys()
+
+    def run(self, duration=0, report_every=10):
+        """Run transactions paced to ops_per_sec (0 runs unpaced), for duration seconds or until interrupted"""
+        interval = self.txn_size / self.ops_per_sec if self.ops_per_sec else 0
+        started = time.perf_counter()
+        next_txn = started
+        last_report, last_ops = started, 0
+
+        try:
+            while not duration or time.perf_counter() - started < duration:
+                self.run_transaction()
+                next_txn += interval
+                now = time.perf_counter()
+                if next_txn > now:
+                    time.sleep(next_txn - now)
+                elif now - next_txn > 1.0:
+                    # Falling behind: do not try to catch up with a burst
+                    next_txn = now
+
+                if now - last_report >= report_every:
+                    ops = sum(self.counts.values())
+                    print(f"{ops - last_ops} ops in {now - last_report:.1f}s "
+                          f"({(ops - last_ops) / (now - last_report):,.0f} ops/sec), totals {self.counts}")
+                    last_report, last_ops = now, ops
+        except KeyboardInterrupt:
+            print("Workload interrupted")
+
+        elapsed = time.perf_counter() - started
+        ops = sum(self.counts.values())
+        print(f"Applied {ops} operations in {elapsed:.1f}s ({ops / elapsed:,.0f} ops/sec): {self.counts}")
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Continuous CDC workload against employee_db")
+    parser.add_argument('--ops-per-sec', type=float, default=100,
+                        help="target operations per second, 0 runs as fast as the database allows")
+    parser.add_argument('--txn-size', type=int, default=10, help="operations per transaction")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="operation weights, e.g. insert=20,update=70,delete=10")
+    parser.add_argument('--zipf', type=float, default=1.1,
+                        help="Zipf exponent for hot-key skew over employee ids (<= 1 for uniform)")
+    parser.add_argument('--duration', type=float, default=0, help="seconds to run, 0 runs until interrupted")
+    parser.add_argument('--seed', type=int, default=None, help="seed for reproducible operation sequences")
+    args = parser.parse_args()
+    if args.ops_per_sec < 0:
+        parser.error("--ops-per-sec must be 0 (unpaced) or positive")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"Connecting to database at {DB_CONFIG['host']}:{DB_CONFIG['port']}")
+    db = EmployeeDatabase()
+    try:
+        db.connect()
+        workload = CdcWorkload(db, args.ops_per_sec, args.txn_size, args.mix, args.zipf, args.seed)
+        workload.load_keys()
+        workload.run(args.duration)
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    finally:
+        db.disconnect()